@@ -0,0 +1,321 @@
+# -------------------------------------------------------------------------------
+# Name:        Benchmarks
+# Purpose:     Micro and macro benchmarks of the processing with synthetic data (see SyntheticData) in a sandbox (see
+#              Harness), written as JSON to compare commits and catch the regressions before deploying to the collector
+#
+# Author:      Gesuri
+#
+# Created:     October 17, 2026
+# Copyright:   (c) Gesuri 2026
+# Licence:     Apache 2.0
+# -------------------------------------------------------------------------------
+
+# Each benchmark prepares its input (not measured) and measures one call, repeated -r times, each time on a new copy
+#   of the input. The result has the seconds of each repetition, the minimum, median and mean, and the rows and bytes
+#   processed.
+#
+# 1. Micro benchmarks:
+#   InfoFile.TOA5, InfoFile.TOB1: InfoFile of a 10 Hz L0 file (read, clean and the L1 paths).
+#   fuseDataFrame: fuse the data of a L0 file with the data of its L1 file, grouped by day.
+#   writeDF2csv: write a day of 10 Hz data as a L1 file.
+#   resampleDataFrame: resample a day of 10 Hz data to 1 minute, like the ts_data_2 table.
+#
+# 2. Macro benchmarks (ECS_Process_L0.run() with the files of all the tables, SharePoint is a local folder):
+#   run: the first run, the L1 files are created.
+#   run.append: a run with the files of the next collection, the L1 files are downloaded, fused and written again.
+#
+# 3. Transfer benchmarks (SPTransfer.TransferPool with the clients of a local stand-in of SharePoint, see SPStandIn,
+#   answering after TRANSFER['latency'] seconds and throttling a fraction of the requests):
+#   transfer.upload.w<N>, transfer.download.w<N>: upload and download TRANSFER['files'] files with 1 and
+#   consts.SP_WORKERS threads. The results have the requests, throttled and failed of the stand-in.
+#
+# 4. Output: a JSON file with the commit, the versions, the parameters and the results. With -c old.json the medians
+#   are compared and the script ends with code 1 if a benchmark is slower than the threshold.
+#
+# Usage:
+#   python Benchmark/Benchmarks.py -o results.json
+#   python Benchmark/Benchmarks.py -b InfoFile,run -c results.json
+#   python Benchmark/Benchmarks.py -b transfer
+
+import contextlib
+import getopt
+import itertools
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # the modules of the processing
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import numpy as np
+import pandas as pd
+
+import consts
+import InfoFile
+import LibDataTransfer
+import SPStandIn
+import SPTransfer
+import config
+import Harness
+import SyntheticData
+
+DEFAULTS = {'hours': 1., 'days': 2, 'repeat': 3, 'threshold': 0.1}
+# conditions of the stand-in of SharePoint of the transfer benchmarks and the files transferred
+TRANSFER = {'files': 32, 'size': 1024 * 1024, 'latency': 0.05, 'throttle': 0.02, 'retryAfter': 0.5, 'backoff': 0.1}
+
+
+def _info_(pathFile):
+    """ Return the InfoFile of a L0 file, not renamed so it can be read again """
+    return InfoFile.InfoFile(pathFile, rename=False)
+
+
+def _measure_(name, setup, func, repeat, rows=None, bytes=None):
+    """ Return the result of the benchmark: func(setup()) measured repeat times, setup is not measured """
+    seconds = []
+    for _ in range(repeat):
+        args = setup()
+        start = time.perf_counter()
+        func(args)
+        seconds.append(time.perf_counter() - start)
+    return {'benchmark': name, 'seconds': seconds, 'min': min(seconds), 'median': statistics.median(seconds),
+            'mean': statistics.mean(seconds), 'rows': rows, 'bytes': bytes}
+
+
+def microBenchmarks(hours, repeat):
+    """ Return the results of the micro benchmarks, with 10 Hz files of hours """
+    results = []
+    table = 'ts_data'
+    metaTable = config.getTable(table)
+    with Harness.Sandbox(flags=Harness.FEATURES) as sandbox:
+        pathInput = sandbox.folder.joinpath('Input')
+        # the L0 files, one in each format
+        for fmt in [SyntheticData.TOA5, SyntheticData.TOB1]:
+            pathFile = SyntheticData.makeFiles(pathInput.joinpath(fmt), tables=[table], hours=hours, fmt=fmt)[0]
+            counter = itertools.count()
+
+            def setup(pathFile=pathFile, fmt=fmt, counter=counter):
+                pathCopy = consts.PATH_HARVESTED_DATA.joinpath(f'{fmt}_{next(counter)}', pathFile.name)
+                pathCopy.parent.mkdir(parents=True)
+                shutil.copyfile(pathFile, pathCopy)
+                return pathCopy
+
+            l0 = _info_(setup())
+            results.append(_measure_(f'InfoFile.{fmt}', setup, _info_, repeat, rows=len(l0.df),
+                                     bytes=pathFile.stat().st_size))
+
+        # the data of the L0 file and of the previous collection of the same day (its L1 file)
+        df = l0.df
+        dfL1 = SyntheticData.makeData(table, df.index[0] - pd.Timedelta(hours=hours), len(df), seed=1)
+        dfL1 = dfL1[~dfL1.index.duplicated()].replace(consts.FLAG, np.nan).asfreq(l0.frequency)
+        results.append(_measure_('fuseDataFrame', lambda: None,
+                                 lambda _: LibDataTransfer.fuseDataFrame(df, dfL1, freq=l0.frequency, group=l0.st_fq),
+                                 repeat, rows=len(df) + len(dfL1)))
+        dfDay = next(iter(LibDataTransfer.fuseDataFrame(df, dfL1, freq=l0.frequency, group=l0.st_fq).values()))
+        counter = itertools.count()
+
+        def write(pathFile):
+            LibDataTransfer.writeDF2csv(pathFile=pathFile, dataframe=dfDay.copy(), header=l0.cs_headers,
+                                        indexMapFunc=metaTable['indexMapFunc'])
+
+        results.append(_measure_('writeDF2csv', lambda: sandbox.folder.joinpath('Output', f'L1_{next(counter)}.csv'),
+                                 write, repeat, rows=len(dfDay)))
+        results[-1]['bytes'] = sandbox.folder.joinpath('Output', 'L1_0.csv').stat().st_size
+        results.append(_measure_('resampleDataFrame', lambda: None,
+                                 lambda _: LibDataTransfer.resampleDataFrame(df=dfDay, freq='1min', method='last'),
+                                 repeat, rows=len(dfDay)))
+    return results
+
+
+def _runBenchmark_(name, hours, days, repeat, append):
+    """ Return the result of ECS_Process_L0.run() on the files of all the tables. If append, the measured run is the
+     second one, with the files of the next collection """
+    seconds = []
+    rows = size = 0
+    for _ in range(repeat):
+        with Harness.Sandbox(flags=Harness.FEATURES) as sandbox, sandbox.process() as process:
+            files = SyntheticData.makeFiles(consts.PATH_HARVESTED_DATA, days=days, hours=hours,
+                                            headerChange=not append)
+            if append:
+                process.run()
+                start = pd.Timestamp(SyntheticData.START) + pd.Timedelta(days=days)
+                files = SyntheticData.makeFiles(consts.PATH_HARVESTED_DATA, days=1, hours=hours, start=start,
+                                                seed=days)
+            size = sum(item.stat().st_size for item in files)
+            with contextlib.ExitStack() as stack:  # the lines of the TOA5 files without the 4 lines of header
+                rows = sum(sum(1 for _ in stack.enter_context(open(item, 'rb'))) - 4 for item in files)
+            start = time.perf_counter()
+            process.run()
+            seconds.append(time.perf_counter() - start)
+    return {'benchmark': name, 'seconds': seconds, 'min': min(seconds), 'median': statistics.median(seconds),
+            'mean': statistics.mean(seconds), 'rows': rows, 'bytes': size}
+
+
+def macroBenchmarks(hours, days, repeat):
+    """ Return the results of the macro benchmarks, empty if ECS_Process_L0 can not be imported """
+    try:
+        import ECS_Process_L0
+    except ImportError as e:
+        print(f'The benchmarks of ECS_Process_L0.run() are skipped, it can not be imported: {e}')
+        return []
+    return [_runBenchmark_('run', hours, days, repeat, append=False),
+            _runBenchmark_('run.append', hours, days, repeat, append=True)]
+
+
+def _transferBenchmark_(name, server, workers, repeat, job, files):
+    """ Return the result of running job(pool, pathFile) for each file in a TransferPool of workers threads with the
+     clients of the stand-in server """
+    seconds = []
+    before = server.stats()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with SPTransfer.TransferPool(lambda: SPStandIn.StandInClient(server.url), workers=workers,
+                                     backoff=TRANSFER['backoff']) as pool:
+            results = pool.map(lambda pathFile: job(pool, pathFile), files)
+        seconds.append(time.perf_counter() - start)
+        if not all(results.values()):
+            print(f'The benchmark {name} did not transfer all the files')
+    stats = {key: value - before[key] for key, value in server.stats().items()}
+    return {'benchmark': name, 'seconds': seconds, 'min': min(seconds), 'median': statistics.median(seconds),
+            'mean': statistics.mean(seconds), 'rows': None, 'bytes': TRANSFER['size'] * len(files),
+            'requests': stats['requests'], 'throttled': stats['throttled'], 'failed': stats['failed']}
+
+
+def transferBenchmarks(repeat):
+    """ Return the results of the transfer benchmarks, with 1 and consts.SP_WORKERS threads """
+    results = []
+    with Harness.Sandbox(flags=Harness.FEATURES) as sandbox, \
+            SPStandIn.StandInServer(sandbox.pathSharePoint, port=0, latency=TRANSFER['latency'],
+                                    throttle=TRANSFER['throttle'], retryAfter=TRANSFER['retryAfter'], seed=0) as server:
+        rng = np.random.default_rng(0)
+        files = []
+        for i in range(TRANSFER['files']):
+            pathFile = consts.PATH_CLOUD.joinpath('Transfer', f'file_{i:03d}.dat')
+            pathFile.parent.mkdir(parents=True, exist_ok=True)
+            pathFile.write_bytes(rng.bytes(TRANSFER['size']))
+            files.append(pathFile)
+
+        def upload(pool, pathFile):
+            target = pathFile.relative_to(consts.PATH_CLOUD)
+            return pool.call(lambda sp: SPTransfer.uploadResumable(sp, pathFile, target), name=pathFile.name)
+
+        def download(pool, pathFile):
+            target = pathFile.relative_to(consts.PATH_CLOUD)
+            pathDownload = sandbox.folder.joinpath('Download', target)
+            return pool.call(lambda sp: sp.download_large_file(target.name, target.parent, pathDownload),
+                             name=pathFile.name)
+
+        for workers in sorted({1, consts.SP_WORKERS}):
+            results.append(_transferBenchmark_(f'transfer.upload.w{workers}', server, workers, repeat, upload,
+                                               files))
+            results.append(_transferBenchmark_(f'transfer.download.w{workers}', server, workers, repeat,
+                                               download, files))
+    return results
+
+
+def getCommit():
+    """ Return the commit of the repository, with '+' if it has changes, or None """
+    folder = Path(__file__).resolve().parent.parent
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=folder, capture_output=True, text=True,
+                                check=True).stdout.strip()
+        changes = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=folder,
+                                 capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f'{commit}+' if changes else commit
+
+
+def compare(old, new, threshold=DEFAULTS['threshold']):
+    """ Print the median of each benchmark of new against old (results of runBenchmarks). Return the names of the
+     benchmarks slower than old by more than threshold (a fraction) """
+    before = {item['benchmark']: item for item in old['results']}
+    slower = []
+    print(f'{"benchmark":<20} {old.get("commit")!s:>10} {new.get("commit")!s:>10}  ratio')
+    for item in new['results']:
+        if item['benchmark'] not in before:
+            continue
+        ratio = item['median'] / before[item['benchmark']]['median']
+        flag = ' <-- slower' if ratio > 1 + threshold else ''
+        print(f'{item["benchmark"]:<20} {before[item["benchmark"]]["median"]:>10.3f} {item["median"]:>10.3f}  '
+              f'{ratio:.2f}{flag}')
+        if flag:
+            slower.append(item['benchmark'])
+    return slower
+
+
+def runBenchmarks(names=None, hours=DEFAULTS['hours'], days=DEFAULTS['days'], repeat=DEFAULTS['repeat']):
+    """ Run the benchmarks (the ones starting with one of names, all if None) and return the dict of the JSON file """
+    results = []
+    if names is None or any(name.split('.')[0] not in ('run', 'transfer') for name in names):
+        results += microBenchmarks(hours, repeat)
+    if names is None or any(name.startswith('run') for name in names):
+        results += macroBenchmarks(hours, days, repeat)
+    if names is None or any(name.startswith('transfer') for name in names):
+        results += transferBenchmarks(repeat)
+    if names is not None:
+        results = [item for item in results if any(item['benchmark'].startswith(name) for name in names)]
+    return {'commit': getCommit(), 'date': datetime.now().isoformat(), 'python': platform.python_version(),
+            'pandas': pd.__version__, 'numpy': np.__version__, 'platform': platform.platform(),
+            'parameters': {'hours': hours, 'days': days, 'repeat': repeat}, 'results': results}
+
+
+def cmd_help():
+    """ Display the help of the script """
+    print('Help:')
+    print('   Benchmarks.py')
+    print('   Runs the benchmarks of the processing with synthetic data in a temporal folder.')
+    print('   -o, --output=     JSON file of the results. Default: benchmark_<commit>_<timestamp>.json')
+    print('   -c, --compare=    JSON file of previous results, the script ends with code 1 if something is slower')
+    print(f'   -t, --threshold=  Fraction slower to be a regression. Default: {DEFAULTS["threshold"]}')
+    print('   -b, --bench=      Benchmarks to run separated by commas, e.g.: InfoFile,run,transfer. Default: all')
+    print(f'   -s, --hours=      Hours of 10 Hz data of each file. Default: {DEFAULTS["hours"]}')
+    print(f'   -d, --days=       Days of files of the macro benchmarks. Default: {DEFAULTS["days"]}')
+    print(f'   -r, --repeat=     Repetitions of each benchmark. Default: {DEFAULTS["repeat"]}')
+
+
+def main(argv):
+    """ Run the benchmarks with the command line arguments, return the exit code """
+    try:
+        opts, args = getopt.getopt(argv, 'ho:c:t:b:s:d:r:', ['help', 'output=', 'compare=', 'threshold=', 'bench=',
+                                                             'hours=', 'days=', 'repeat='])
+    except getopt.GetoptError:
+        cmd_help()
+        return 2
+    params = dict(DEFAULTS)
+    output = pathCompare = names = None
+    for opt, arg in opts:
+        if opt in ('-h', '--help'):
+            cmd_help()
+            return 0
+        elif opt in ('-o', '--output'):
+            output = Path(arg)
+        elif opt in ('-c', '--compare'):
+            pathCompare = Path(arg)
+        elif opt in ('-b', '--bench'):
+            names = arg.split(',')
+        elif opt in ('-s', '--hours', '-t', '--threshold'):
+            params['hours' if opt in ('-s', '--hours') else 'threshold'] = float(arg)
+        elif opt in ('-d', '--days', '-r', '--repeat'):
+            params['days' if opt in ('-d', '--days') else 'repeat'] = int(arg)
+    report = runBenchmarks(names, hours=params['hours'], days=params['days'], repeat=params['repeat'])
+    if output is None:
+        output = Path(f'benchmark_{report["commit"]}_{datetime.now().strftime(consts.TIMESTAMP_FORMAT_FILES)}.json')
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=1)
+    for item in report['results']:
+        print(f'{item["benchmark"]:<20} median {item["median"]:.3f} s, min {item["min"]:.3f} s')
+    print(f'Results written to {output}')
+    if pathCompare is not None:
+        with open(pathCompare, 'r') as f:
+            if compare(json.load(f), report, params['threshold']):
+                return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
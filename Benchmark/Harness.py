@@ -0,0 +1,172 @@
+# -------------------------------------------------------------------------------
+# Name:        Harness
+# Purpose:     Run the processing in a temporal folder: the consts.PATH_* of the data point to it and SharePoint is a
+#              local folder, so the benchmarks do not touch the real data and give the same results on any computer
+#
+# Author:      Gesuri
+#
+# Created:     October 17, 2026
+# Copyright:   (c) Gesuri 2026
+# Licence:     Apache 2.0
+# -------------------------------------------------------------------------------
+
+# consts.py has the paths of the collector PC (and of the development PC with consts.dev). The Sandbox changes them
+#   while it is open and restores them at the end:
+#
+# 1. Paths: PATH_HARVESTED_DATA, PATH_TEMP_BACKUP, PATH_CLOUD and PATH_TEMPSHARE are folders in the sandbox, and all the
+#   consts.PATH_* inside them (logs, catalog, journal, ...) are moved with them.
+#
+# 2. SharePoint: 'LocalSharePoint' has the methods of office365_api.SharePoint used by ECS_Process_L0, on a folder of
+#   the sandbox. 'Sandbox.process()' also points ECS_Process_L0 (its log, the folder to process and newSPClient) to the
+#   sandbox while it is open.
+#
+# 3. Console: with quiet, the lines printed by the logs are discarded, so the console does not take the time.
+#
+# 4. Flags: the consts flags given (e.g. FEATURES, the optimizations that are off by default) are set while the sandbox
+#   is open, LOG_ASYNC also turns on or off the writer thread of Log.
+#
+# The process pool of ECS_Process_L0 only sees the sandbox when the workers are forked (Linux), the spawned workers
+#   (Windows) import consts again. The benchmarks run it with one worker.
+#
+# Example:
+#   with Harness.Sandbox() as sandbox:
+#       SyntheticData.makeFiles(consts.PATH_HARVESTED_DATA, days=1)
+#       with sandbox.process() as ECS_Process_L0:
+#           ECS_Process_L0.run()
+
+import contextlib
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import Catalog
+import Log
+import consts
+
+ROOTS = ['PATH_HARVESTED_DATA', 'PATH_TEMP_BACKUP', 'PATH_CLOUD', 'PATH_TEMPSHARE']  # the folders of the sandbox
+# the flags of consts of the optimizations that are off by default, on for the benchmarks
+FEATURES = {'LOG_ASYNC': True, 'NATIVE_TOB_READER': True, 'L1_INCREMENTAL_WRITE': True, 'L1_SIDECAR': True,
+            'CATALOG': True, 'UPLOAD_JOURNAL': True, 'TIMING': True, 'QC_SIDECAR': True, 'L1_NORMALIZED': True}
+
+
+class LocalSharePoint:
+    """ Client with the methods of office365_api.SharePoint used by ECS_Process_L0, the files are in pathRoot """
+
+    def __init__(self, pathRoot, log=None):
+        self.pathRoot = Path(pathRoot)
+        self.log = log
+
+    def _path_(self, pathFile):
+        """ Return the path in the folder of a path relative to SharePoint """
+        return self.pathRoot.joinpath(Path(str(pathFile)))
+
+    def get_file_properties(self, file_name, folder_name):
+        """ Return the size and the modification time of the file, None if it does not exist """
+        pathFile = self._path_(Path(str(folder_name)).joinpath(file_name))
+        if not pathFile.is_file():
+            return None
+        stat = pathFile.stat()
+        return {'file_size': stat.st_size, 'time_last_modified': datetime.fromtimestamp(stat.st_mtime)}
+
+    def download_large_file(self, file_name, folder_name, local_file_path):
+        """ Copy the file to local_file_path """
+        pathFile = self._path_(Path(str(folder_name)).joinpath(file_name))
+        if not pathFile.is_file():
+            return False
+        Path(local_file_path).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(pathFile, local_file_path)
+        return True
+
+    def upload_large_file(self, local_file_path, target_file_url):
+        """ Copy the local file to target_file_url """
+        pathFile = self._path_(target_file_url)
+        pathFile.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(local_file_path, pathFile)
+        return True
+
+    def rename_file(self, src, dst):
+        """ Rename the file src to dst, both relative to SharePoint """
+        self._path_(src).replace(self._path_(dst))
+        return True
+
+
+class Sandbox:
+    """ Points the consts.PATH_* to a temporal folder while it is open.
+        folder: the folder of the sandbox, a new temporal folder if None. It is removed at the end unless keep
+        keep: do not remove the folder at the end, e.g. to look at the files written
+        quiet: discard the lines printed to the console
+        flags: dict of consts flags (name -> value) set while the sandbox is open, e.g. FEATURES
+    """
+
+    def __init__(self, folder=None, keep=False, quiet=True, flags=None):
+        self.folder = None if folder is None else Path(folder)
+        self.keep = keep
+        self.quiet = quiet
+        self.flags = flags or {}
+        self.pathSharePoint = None
+        self._saved_ = {}
+        self._stack_ = None
+
+    def __enter__(self):
+        if self.folder is None:
+            self.folder = Path(tempfile.mkdtemp(prefix='ECS_benchmark_'))
+        self.pathSharePoint = self.folder.joinpath('SharePoint')
+        # the folders of the sandbox, the longest first so the nested roots are moved with their own root
+        roots = sorted([(getattr(consts, name), self.folder.joinpath(name)) for name in ROOTS],
+                       key=lambda item: len(item[0].parts), reverse=True)
+        for name in dir(consts):
+            value = getattr(consts, name)
+            if not name.startswith('PATH_') or not isinstance(value, Path):
+                continue
+            for original, new in roots:
+                if value == original or original in value.parents:
+                    self._saved_[name] = value
+                    setattr(consts, name, new.joinpath(value.relative_to(original)))
+                    break
+        for name in ROOTS + ['PATH_GENERAL_LOGS']:
+            getattr(consts, name).mkdir(parents=True, exist_ok=True)
+        for name, value in self.flags.items():
+            self._saved_[name] = getattr(consts, name)
+            setattr(consts, name, value)
+        Log.setAsync(consts.LOG_ASYNC)
+        Catalog.disconnect()
+        self._stack_ = contextlib.ExitStack()
+        if self.quiet:
+            devnull = self._stack_.enter_context(open(os.devnull, 'w'))
+            self._stack_.enter_context(contextlib.redirect_stdout(devnull))
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        Log.flush(close=True)  # the log files of the sandbox are closed before removing them
+        self._stack_.close()
+        Catalog.disconnect()
+        for name, value in self._saved_.items():
+            setattr(consts, name, value)
+        self._saved_ = {}
+        Log.setAsync(consts.LOG_ASYNC)
+        if not self.keep:
+            shutil.rmtree(self.folder, ignore_errors=True)
+
+    def client(self, log=None):
+        """ Return a new client of the SharePoint of the sandbox """
+        return LocalSharePoint(self.pathSharePoint, log=log)
+
+    @contextlib.contextmanager
+    def process(self):
+        """ Point ECS_Process_L0 to the sandbox (its log, the folder to process and the SharePoint client) while the
+         block runs, and yield the module """
+        import ECS_Process_L0
+        saved = {name: getattr(ECS_Process_L0, name) for name in ['log', '_PATH_DATA_2_PROCESS_', 'newSPClient',
+                                                                 '_WORKERS_']}
+        ECS_Process_L0.log = Log.Log(path=consts.PATH_GENERAL_LOGS.joinpath('ECS_Process_L0.log'))
+        ECS_Process_L0._PATH_DATA_2_PROCESS_ = consts.PATH_HARVESTED_DATA
+        ECS_Process_L0.newSPClient = lambda: self.client(log=ECS_Process_L0.log)
+        ECS_Process_L0._WORKERS_ = 1
+        ECS_Process_L0.check_folders()
+        try:
+            yield ECS_Process_L0
+        finally:
+            for name, value in saved.items():
+                setattr(ECS_Process_L0, name, value)
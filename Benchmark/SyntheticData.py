@@ -0,0 +1,198 @@
+# -------------------------------------------------------------------------------
+# Name:        SyntheticData
+# Purpose:     Generate realistic Campbell Scientific files (TOA5 and TOB1) of the tables in config.TABLES, with gaps,
+#              duplicated records, flagged values and header changes, to benchmark the processing reproducibly
+#
+# Author:      Gesuri
+#
+# Created:     October 17, 2026
+# Copyright:   (c) Gesuri 2026
+# Licence:     Apache 2.0
+# -------------------------------------------------------------------------------
+
+# The files are like the ones collected by LoggerNet: the name is <site>_<datalogger>_<table>_<YYYYmmdd_HHMMSS>.dat
+#   and the headers are the ones of the tables flux, met_data, ts_data, ts_data_2 and Soil_CS650. The data is made
+#   with a seed, so the same call gives the same files.
+#
+# 1. Anomalies (fractions of the records):
+#   gaps: blocks of records that are missing, e.g. a datalogger restart.
+#   duplicates: records written twice. Consecutive files also overlap some records, like the collections after an
+#       outage.
+#   flags: values that are -9999 (consts.FLAG) or NAN.
+#   headerChange: the last file of each table has another program signature and one more column, so its L1 file is
+#       renamed and a new one is created.
+#
+# 2. Functions:
+#   'makeData(table, start, periods, seed=0, ...)': Return the DataFrame of the table with the anomalies.
+#   'writeTOA5(pathFile, df, table, site, logger, signature)': Write the data as a TOA5 file.
+#   'writeTOB1(pathFile, df, table, site, logger, signature)': Write the data as a TOB1 file.
+#   'makeFiles(folder, tables=TABLES, days=1, ...)': Write the files of the tables for some days in folder.
+#
+# Example:
+#   files = SyntheticData.makeFiles(Path('/tmp/collected'), tables=['ts_data', 'met_data'], days=2, fmt='TOB1')
+
+import csv
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+import consts
+
+TOA5 = 'TOA5'
+TOB1 = 'TOB1'
+CS_EPOCH = np.datetime64('1990-01-01T00:00:00', 'ns')  # origin of the seconds of the TOB1 files
+START = '2026-03-01'  # first day of the files
+
+# columns of each table after the TIMESTAMP and RECORD: (name, units, processing, mean, amplitude of the daily cycle,
+# noise). The frequency is the one of config.TABLES (Soil_CS650 has the default, 30 minutes)
+TABLES = {
+    'flux': {'frequency': consts.FREQ_30MIN, 'columns': [
+        ('Fc_wpl', 'mg/(m^2 s)', 'Avg', 0., -0.4, 0.1), ('LE_wpl', 'W/m^2', 'Avg', 60., 120., 15.),
+        ('Hs', 'W/m^2', 'Avg', 50., 200., 20.), ('tau', 'kg/(m s^2)', 'Avg', 0.1, 0.05, 0.02),
+        ('u_star', 'm/s', 'Avg', 0.3, 0.1, 0.05), ('panel_temp_Avg', 'C', 'Avg', 25., 10., 0.5),
+        ('batt_volt_Avg', 'V', 'Avg', 13., 0.4, 0.05)]},
+    'met_data': {'frequency': consts.FREQ_1MIN, 'columns': [
+        ('t_hmp', 'C', 'Avg', 20., 10., 0.3), ('rh_hmp', '%', 'Avg', 40., -20., 2.),
+        ('CO2_raw', 'mg/m^3', 'Avg', 700., -20., 5.), ('H2O_raw', 'g/m^3', 'Avg', 6., 2., 0.3),
+        ('press', 'kPa', 'Avg', 88., 0.3, 0.05)]},
+    'ts_data': {'frequency': consts.FREQ_10HZ, 'columns': [
+        ('Ux', 'm/s', 'Smp', 1., 1., 0.8), ('Uy', 'm/s', 'Smp', 0.5, 0.5, 0.8), ('Uz', 'm/s', 'Smp', 0., 0., 0.3),
+        ('Ts', 'C', 'Smp', 20., 10., 0.2), ('CO2', 'mg/m^3', 'Smp', 700., -20., 3.),
+        ('H2O', 'g/m^3', 'Smp', 6., 2., 0.2), ('diag_csat', '', 'Smp', 0., 0., 0.), ('t_hmp', 'C', 'Smp', 20., 10., 0.1)]},
+    'Soil_CS650': {'frequency': consts.DEFAULT_FREQUENCY, 'columns': [
+        ('VWC_1', 'm^3/m^3', 'Avg', 0.12, 0.01, 0.002), ('VWC_2', 'm^3/m^3', 'Avg', 0.15, 0.01, 0.002),
+        ('EC_1', 'dS/m', 'Avg', 0.1, 0.01, 0.002), ('EC_2', 'dS/m', 'Avg', 0.1, 0.01, 0.002),
+        ('T_1', 'C', 'Avg', 22., 5., 0.1), ('T_2', 'C', 'Avg', 21., 3., 0.1)]},
+}
+TABLES['ts_data_2'] = TABLES['ts_data']
+EXTRA_COLUMN = ('extra', '', 'Smp', 1., 0., 0.1)  # column added by the header change
+
+
+def _columns_(table, headerChange=False):
+    """ Return the columns of the table, with the extra one if headerChange """
+    columns = TABLES[table]['columns']
+    return columns + [EXTRA_COLUMN] if headerChange else columns
+
+
+def makeData(table, start, periods, seed=0, gaps=0.01, duplicates=0.001, flags=0.01, headerChange=False,
+             firstRecord=0):
+    """ Return the DataFrame of periods records of the table from start (index TIMESTAMP, columns RECORD and the ones
+     of the table), with the fractions of gaps, duplicated records and flagged values """
+    rng = np.random.default_rng(seed)
+    freq = TABLES[table]['frequency']
+    index = pd.date_range(start, periods=periods, freq=freq, name='TIMESTAMP')
+    hours = (index - index.normalize()) / pd.Timedelta(hours=1)
+    cycle = np.sin((hours.values - 9.) / 24. * 2 * np.pi)  # the maximum at 15:00
+    data = {'RECORD': np.arange(firstRecord, firstRecord + periods)}
+    for name, units, proc, mean, amplitude, noise in _columns_(table, headerChange):
+        if name.startswith('diag'):
+            data[name] = rng.choice([0, 0, 0, 0, 1, 2], size=periods).astype(float)
+        else:
+            data[name] = np.round(mean + amplitude * cycle + rng.normal(0., noise, periods), 4)
+    df = pd.DataFrame(data, index=index)
+    values = [name for name in df.columns if name != 'RECORD']
+    # flagged values, half -9999 and half NAN
+    for value in [consts.FLAG, np.nan]:
+        mask = rng.random((periods, len(values))) < flags / 2
+        df[values] = df[values].mask(mask, value)
+    # gaps, in blocks of 1 to 1% of the records
+    numberGaps = int(periods * gaps / max(1, periods // 200)) if gaps else 0
+    keep = np.ones(periods, dtype=bool)
+    for position in rng.integers(0, periods, numberGaps):
+        keep[position:position + rng.integers(1, max(2, periods // 100))] = False
+    df = df[keep]
+    # duplicated records, written again right after the original
+    if duplicates and len(df) > 0:
+        df = pd.concat([df, df.iloc[rng.integers(0, len(df), int(len(df) * duplicates))]]).sort_index(kind='stable')
+    return df
+
+
+def _signatureLine_(fileType, table, site, logger, signature):
+    """ Return the first line of the header """
+    return (f'"{fileType}","{site}","{logger}","12345","{logger}.Std.32","CPU:{site}_ECS.CR{logger[-4:]}",'
+            f'"{signature}","{table}"')
+
+
+def _timestamps_(index):
+    """ Return the timestamps like LoggerNet writes them, the fractional seconds only when they are not 0 """
+    text = index.strftime('%Y-%m-%d %H:%M:%S.%f').str[:-5]
+    return text.str.replace(r'\.0$', '', regex=True)
+
+
+def writeTOA5(pathFile, df, table, site='Bahada', logger='CR3000', signature='4242'):
+    """ Write the data (see makeData) as a TOA5 file """
+    columns = list(df.columns)
+    units = {'RECORD': 'RN', **{name: units for name, units, *_ in _columns_(table, True)}}
+    procs = {'RECORD': '', **{name: proc for name, units, proc, *_ in _columns_(table, True)}}
+    lines = [_signatureLine_(TOA5, table, site, logger, signature),
+             ','.join(f'"{name}"' for name in ['TIMESTAMP'] + columns),
+             ','.join(f'"{units[name]}"' for name in columns).join(['"TS",', '']),
+             ','.join(f'"{procs[name]}"' for name in columns).join(['"",', ''])]
+    text = df.to_csv(header=False, index=False, lineterminator='\r\n', na_rep='"NAN"', quoting=csv.QUOTE_NONE,
+                     quotechar="'")
+    pathFile = Path(pathFile)
+    pathFile.parent.mkdir(parents=True, exist_ok=True)
+    with open(pathFile, 'w', newline='') as f:
+        f.write('\r\n'.join(lines) + '\r\n')
+        timestamps = _timestamps_(df.index)
+        f.writelines(f'"{ts}",{line}\r\n' for ts, line in zip(timestamps, text.splitlines()))
+    return pathFile
+
+
+def writeTOB1(pathFile, df, table, site='Bahada', logger='CR3000', signature='4242'):
+    """ Write the data (see makeData) as a TOB1 file: SECONDS, NANOSECONDS and RECORD as ULONG and the values as
+     IEEE4 """
+    values = [name for name in df.columns if name != 'RECORD']
+    units = {name: units for name, units, *_ in _columns_(table, True)}
+    procs = {name: proc for name, units, proc, *_ in _columns_(table, True)}
+    names = ['SECONDS', 'NANOSECONDS', 'RECORD'] + values
+    quote = lambda items: ','.join(f'"{item}"' for item in items)
+    lines = [_signatureLine_(TOB1, table, site, logger, signature), quote(names),
+             quote(['SECONDS', 'NANOSECONDS', 'RN'] + [units[name] for name in values]),
+             quote(['', '', ''] + [procs[name] for name in values]),
+             quote(['ULONG', 'ULONG', 'ULONG'] + ['IEEE4'] * len(values))]
+    dtype = np.dtype([('SECONDS', '<u4'), ('NANOSECONDS', '<u4'), ('RECORD', '<u4')] +
+                     [(name, '<f4') for name in values])
+    records = np.zeros(len(df), dtype=dtype)
+    ns = (df.index.values - CS_EPOCH).astype(np.int64)
+    records['SECONDS'] = ns // 10 ** 9
+    records['NANOSECONDS'] = ns % 10 ** 9
+    records['RECORD'] = df['RECORD'].values
+    for name in values:
+        records[name] = df[name].values
+    pathFile = Path(pathFile)
+    pathFile.parent.mkdir(parents=True, exist_ok=True)
+    with open(pathFile, 'wb') as f:
+        f.write(('\r\n'.join(lines) + '\r\n').encode())
+        f.write(records.tobytes())
+    return pathFile
+
+
+def makeFiles(folder, tables=None, days=1, filesPerDay=1, start=START, fmt=TOA5, site='Bahada',
+              logger='CR3000', seed=0, gaps=0.01, duplicates=0.001, flags=0.01, overlap=10, headerChange=False,
+              hours=24):
+    """ Write in folder the files of the tables (all of TABLES if None) for the days, filesPerDay files a day, as the
+     collections of LoggerNet. Consecutive files overlap records. Only the first hours of each day are written for the
+     10 Hz tables, to bound the size. Return the list of paths """
+    folder = Path(folder)
+    write = writeTOB1 if fmt == TOB1 else writeTOA5
+    files = []
+    for t, table in enumerate(TABLES if tables is None else tables):
+        freq = TABLES[table]['frequency']
+        perDay = int(pd.Timedelta(hours=hours if freq < consts.FREQ_1MIN else 24) / freq)
+        perFile = max(1, perDay // filesPerDay)
+        numberFiles = days * filesPerDay
+        record = 0
+        for i in range(numberFiles):
+            day, part = divmod(i, filesPerDay)
+            fileStart = pd.Timestamp(start) + pd.Timedelta(days=day) + part * perFile * freq
+            periods = perFile + (overlap if i > 0 else 0)
+            fileStart -= (overlap if i > 0 else 0) * freq
+            change = headerChange and i == numberFiles - 1
+            df = makeData(table, fileStart, periods, seed=seed + 1000 * t + i, gaps=gaps, duplicates=duplicates,
+                          flags=flags, headerChange=change, firstRecord=record)
+            record += periods
+            collected = fileStart + periods * freq
+            name = f'{site}_{logger}_{table}_{collected.strftime(consts.TIMESTAMP_FORMAT_FILES)}.dat'
+            files.append(write(folder.joinpath(name), df, table, site, logger, '5151' if change else '4242'))
+    return files
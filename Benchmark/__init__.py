@@ -0,0 +1,11 @@
+# -------------------------------------------------------------------------------
+# Name:        Benchmark
+# Purpose:     Synthetic data (SyntheticData), a sandbox for the consts.PATH_* (Harness) and the benchmarks of the
+#              processing (Benchmarks). Run it with: python Benchmark/Benchmarks.py
+#
+# Author:      Gesuri
+#
+# Created:     October 17, 2026
+# Copyright:   (c) Gesuri 2026
+# Licence:     Apache 2.0
+# -------------------------------------------------------------------------------
@@ -0,0 +1,367 @@
+# -------------------------------------------------------------------------------
+# Name:        Catalog
+# Purpose:     Local SQLite catalog of the L0 and L1 files: header, time range, number of rows, size and the size and
+#              modification time of the copy in SharePoint
+#
+# Author:      Gesuri
+#
+# Created:     October 17, 2026
+# Copyright:   (c) Gesuri 2026
+# Licence:     Apache 2.0
+# -------------------------------------------------------------------------------
+
+# To know the header or the time range of a L1 file, the file has to be downloaded from SharePoint and read, and to
+#   know if a file changed since it was uploaded, SharePoint has to be asked. The catalog keeps that information for
+#   each file read by InfoFile or written by LibDataTransfer.writeDF2csv/appendDF2csv, so those questions are indexed
+#   lookups in consts.PATH_CATALOG.
+#
+# 1. Table 'files', one row per path:
+#   path, level (0 or 1), site, project, tableName: the file and its table.
+#   headers, headerHash: the CS header lines (JSON) and their md5. program, signature, serialNumber, os: from the first
+#       header line (consts.CS_FILE_METADATA).
+#   firstDT, lastDT, numberRows: the time range (text, consts.CATALOG_TIMESTAMP_FORMAT, so it can be compared) and rows.
+#   size, mtime: of the local file when it was recorded. A row is only current if the file has the same size and mtime.
+#   remoteSize, remoteMtime, remoteHash: of the local file when it was uploaded to SharePoint, the hash is
+#       LibDataTransfer.hashFile of its content. A file with other mtime but the same content is not uploaded again.
+#   normalized: the frequency (text of a pd.Timedelta) of the data of a L1 file written by the pipeline already clean:
+#       sorted, without duplicated timestamps, on that frequency and with the flags as missing values. NULL otherwise.
+#   contentHash: LibDataTransfer.hashFile of the file when it was written by writeDF2csv, so the sidecars, the QC and
+#       the uploads of a current file do not read it again to hash it. NULL after an append.
+#
+# 2. Functions:
+#   'connect()': Return the connection of the current process and thread, the database is created if needed.
+#   'disconnect()': Close the connection of the current thread, e.g. after changing consts.PATH_CATALOG.
+#   'getHeaderHash(headers)': Return the md5 of the header lines.
+#   'recordFile(pathFile, headers, firstDT, lastDT, numberRows, level=1, site=None, project=None, normalized=None,
+#       contentHash=None, log=None)'
+#   'recordAppend(pathFile, lastDT, numberRows, sizeBefore, normalized=None, log=None)': Update the row after appending
+#       rows. The file keeps its normalized frequency only if the rows appended have the same one.
+#   'recordUpload(pathFile, contentHash=None, log=None)': Record that the local file is the same as the file in
+#       SharePoint.
+#   'recordDownload(pathFile, contentHash=None, log=None)': The downloaded file has the content recorded, refresh its
+#       mtime. Otherwise its row is removed.
+#   'recordMove(src, dst, log=None)': The file was moved, move its row.
+#   'getFile(pathFile, current=True)': Return the row of the file as a dict.
+#   'isUploaded(pathFile, contentHash=None)': True if the local file did not change since it was uploaded.
+#   'getNormalized(pathFile)': The frequency of the L1 file if it did not change since it was written normalized.
+#   'getContentHash(pathFile)': The hash of the file if it did not change since it was written.
+#   'findFiles(site, project, tableName, start=None, end=None, level=1)': The files of a table covering a time window.
+
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+import pandas as pd
+
+import Log
+import consts
+
+# connection of the current thread (e.g. the threads of SPTransfer.TransferPool) and its process, the connections can
+# not be shared with other threads or with the processes of a pool
+_local_ = threading.local()
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    level INTEGER,
+    site TEXT,
+    project TEXT,
+    tableName TEXT,
+    headers TEXT,
+    headerHash TEXT,
+    program TEXT,
+    signature TEXT,
+    serialNumber TEXT,
+    os TEXT,
+    firstDT TEXT,
+    lastDT TEXT,
+    numberRows INTEGER,
+    size INTEGER,
+    mtime REAL,
+    remoteSize INTEGER,
+    remoteMtime REAL,
+    remoteHash TEXT,
+    normalized TEXT,
+    contentHash TEXT
+);
+CREATE INDEX IF NOT EXISTS files_table ON files (site, project, tableName, level, firstDT, lastDT);
+CREATE INDEX IF NOT EXISTS files_header ON files (headerHash);
+'''
+
+
+def connect():
+    """ Return the connection to the catalog of the current process and thread, the database is created if needed """
+    connection = getattr(_local_, 'connection', None)
+    if connection is None or _local_.pid != os.getpid():
+        consts.PATH_CATALOG.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(consts.PATH_CATALOG, timeout=30)
+        connection.row_factory = sqlite3.Row
+        connection.execute('PRAGMA journal_mode=WAL')  # the workers of ECS_Process_L0 write at the same time
+        connection.executescript(SCHEMA)
+        # the columns added after the database was created
+        columns = [row['name'] for row in connection.execute('PRAGMA table_info(files)')]
+        if 'remoteHash' not in columns:
+            connection.execute('ALTER TABLE files ADD COLUMN remoteHash TEXT')
+        if 'normalized' not in columns:
+            connection.execute('ALTER TABLE files ADD COLUMN normalized TEXT')
+        if 'contentHash' not in columns:
+            connection.execute('ALTER TABLE files ADD COLUMN contentHash TEXT')
+        _local_.connection = connection
+        _local_.pid = os.getpid()
+    return connection
+
+
+def disconnect():
+    """ Close the connection of the current thread, the next connect() opens consts.PATH_CATALOG again """
+    connection = getattr(_local_, 'connection', None)
+    if connection is not None and _local_.pid == os.getpid():
+        connection.close()
+    _local_.connection = None
+
+
+def _key_(pathFile):
+    """ Return the key of the file in the catalog, its absolute path """
+    return str(Path(pathFile).resolve())
+
+
+def _dt_(dt):
+    """ Return the datetime as text that can be compared, or None """
+    try:
+        if dt is None or pd.isna(dt):
+            return None
+        return pd.Timestamp(dt).strftime(consts.CATALOG_TIMESTAMP_FORMAT)
+    except (ValueError, TypeError):  # e.g. the index of a static table
+        return None
+
+
+def _freq_(freq):
+    """ Return the frequency as the text of a pd.Timedelta, or None if it is not a fixed frequency """
+    try:
+        if freq is None or freq == -1:
+            return None
+        return str(pd.Timedelta(freq))
+    except (ValueError, TypeError):
+        return None
+
+
+def getHeaderHash(headers):
+    """ Return the md5 of the header lines """
+    return hashlib.md5('\n'.join(headers).encode()).hexdigest()
+
+
+def recordFile(pathFile, headers, firstDT, lastDT, numberRows, level=1, site=None, project=None, normalized=None,
+               contentHash=None, log=None):
+    """ Record a file in the catalog with its current size and mtime, replacing the previous row but keeping the remote
+     size and mtime. If site or project are None, they are taken from the name of the file (consts.CS_FILE_NAME_*).
+     normalized is the frequency of the data if it was written already clean (see getNormalized), contentHash the
+     LibDataTransfer.hashFile of the file if it is known (see getContentHash).
+     Return True if it was recorded """
+    if not consts.CATALOG:
+        return False
+    pathFile = Path(pathFile)
+    nameSplit = pathFile.stem.split('_')
+    site = nameSplit[consts.CS_FILE_NAME_SITE] if site is None else site
+    if project is None and len(nameSplit) > consts.CS_FILE_NAME_DATALOGGER:
+        project = nameSplit[consts.CS_FILE_NAME_DATALOGGER]
+    meta = {item: None for item in consts.CS_FILE_METADATA}
+    if headers:
+        nl = next(csv.reader([headers[consts.CS_FILE_HEADER_LINE['HARDWARE']]]))
+        meta.update({item: nl[idx] for item, idx in consts.CS_FILE_METADATA.items() if idx < len(nl)})
+    try:
+        stat = pathFile.stat()
+        with connect() as con:
+            con.execute('''INSERT INTO files (path, level, site, project, tableName, headers, headerHash, program,
+                            signature, serialNumber, os, firstDT, lastDT, numberRows, size, mtime, normalized,
+                            contentHash)
+                           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                           ON CONFLICT(path) DO UPDATE SET level=excluded.level, site=excluded.site,
+                            project=excluded.project, tableName=excluded.tableName, headers=excluded.headers,
+                            headerHash=excluded.headerHash, program=excluded.program, signature=excluded.signature,
+                            serialNumber=excluded.serialNumber, os=excluded.os, firstDT=excluded.firstDT,
+                            lastDT=excluded.lastDT, numberRows=excluded.numberRows, size=excluded.size,
+                            mtime=excluded.mtime, normalized=excluded.normalized, contentHash=excluded.contentHash''',
+                        (_key_(pathFile), level, site, project, meta['tableName'], json.dumps(list(headers or [])),
+                         getHeaderHash(headers or []), meta['program'], meta['signature'], meta['serialNumber'],
+                         meta['os'], _dt_(firstDT), _dt_(lastDT), numberRows, stat.st_size, stat.st_mtime,
+                         _freq_(normalized), contentHash))
+    except (OSError, sqlite3.Error) as e:
+        Log.logMsg(f'<Catalog> Error recording {pathFile.name}: {e}', log, 'warn')
+        return False
+    return True
+
+
+def recordAppend(pathFile, lastDT, numberRows, sizeBefore, normalized=None, log=None):
+    """ Update the row of a file after appending numberRows rows, if the row was current before the append (the file
+     had sizeBefore bytes). Otherwise the row is removed, it is not valid anymore. The file is still normalized only if
+     the rows appended are normalized with the same frequency """
+    if not consts.CATALOG:
+        return False
+    pathFile = Path(pathFile)
+    try:
+        with connect() as con:
+            row = con.execute('SELECT size FROM files WHERE path = ?', (_key_(pathFile),)).fetchone()
+            if row is None:
+                return False
+            if row['size'] != sizeBefore:
+                con.execute('DELETE FROM files WHERE path = ?', (_key_(pathFile),))
+                return False
+            stat = pathFile.stat()
+            con.execute('''UPDATE files SET lastDT = ?, numberRows = numberRows + ?, size = ?, mtime = ?,
+                            normalized = CASE WHEN normalized = ? THEN normalized ELSE NULL END, contentHash = NULL
+                           WHERE path = ?''', (_dt_(lastDT), numberRows, stat.st_size, stat.st_mtime,
+                                               _freq_(normalized), _key_(pathFile)))
+    except (OSError, sqlite3.Error) as e:
+        Log.logMsg(f'<Catalog> Error recording the append to {pathFile.name}: {e}', log, 'warn')
+        return False
+    return True
+
+
+def recordUpload(pathFile, contentHash=None, log=None):
+    """ Record that the local file, as it is now, was uploaded to SharePoint. contentHash is its
+     LibDataTransfer.hashFile, if it is known """
+    if not consts.CATALOG:
+        return False
+    pathFile = Path(pathFile)
+    try:
+        stat = pathFile.stat()
+        with connect() as con:
+            con.execute('''INSERT INTO files (path, size, mtime, remoteSize, remoteMtime, remoteHash)
+                           VALUES (?, ?, ?, ?, ?, ?)
+                           ON CONFLICT(path) DO UPDATE SET remoteSize = excluded.remoteSize,
+                            remoteMtime = excluded.remoteMtime, remoteHash = excluded.remoteHash''',
+                        (_key_(pathFile), stat.st_size, stat.st_mtime, stat.st_size, stat.st_mtime, contentHash))
+    except (OSError, sqlite3.Error) as e:
+        Log.logMsg(f'<Catalog> Error recording the upload of {pathFile.name}: {e}', log, 'warn')
+        return False
+    return True
+
+
+def recordDownload(pathFile, contentHash=None, log=None):
+    """ After downloading a file from SharePoint: if it has the size and the content (contentHash, its
+     LibDataTransfer.hashFile) of the file recorded, written or uploaded by this script, the row is current again with
+     the new mtime. Otherwise (e.g. the file was changed in SharePoint with the same size, or without contentHash) the
+     row is removed, so its header, hash and normalized frequency are not trusted """
+    if not consts.CATALOG:
+        return False
+    pathFile = Path(pathFile)
+    try:
+        stat = pathFile.stat()
+        with connect() as con:
+            row = con.execute('SELECT size, remoteSize, contentHash, remoteHash FROM files WHERE path = ?',
+                              (_key_(pathFile),)).fetchone()
+            if row is None:
+                return False
+            if row['size'] != stat.st_size or row['remoteSize'] != stat.st_size or contentHash is None or \
+                    contentHash not in (row['contentHash'], row['remoteHash']):
+                con.execute('DELETE FROM files WHERE path = ?', (_key_(pathFile),))
+                return False
+            con.execute('UPDATE files SET mtime = ?, remoteMtime = ?, contentHash = ? WHERE path = ?',
+                        (stat.st_mtime, stat.st_mtime, contentHash, _key_(pathFile)))
+    except (OSError, sqlite3.Error) as e:
+        Log.logMsg(f'<Catalog> Error recording the download of {pathFile.name}: {e}', log, 'warn')
+        return False
+    return True
+
+
+def recordMove(src, dst, log=None):
+    """ The file src was moved to dst (e.g. the L0 files to their L0 folder), move its row too """
+    if not consts.CATALOG:
+        return False
+    try:
+        with connect() as con:
+            con.execute('DELETE FROM files WHERE path = ?', (_key_(dst),))
+            con.execute('UPDATE files SET path = ? WHERE path = ?', (_key_(dst), _key_(src)))
+    except (OSError, sqlite3.Error) as e:
+        Log.logMsg(f'<Catalog> Error recording the move of {Path(src).name}: {e}', log, 'warn')
+        return False
+    return True
+
+
+def getFile(pathFile, current=True):
+    """ Return the row of the file as a dict, with the headers as a list and the timestamps as pd.Timestamp, or None.
+     If current, None is returned if the local file does not exist or does not have the size and mtime recorded """
+    if not consts.CATALOG:
+        return None
+    pathFile = Path(pathFile)
+    try:
+        row = connect().execute('SELECT * FROM files WHERE path = ?', (_key_(pathFile),)).fetchone()
+        if row is None:
+            return None
+        if current:
+            if not pathFile.is_file():
+                return None
+            stat = pathFile.stat()
+            if stat.st_size != row['size'] or stat.st_mtime != row['mtime']:
+                return None
+    except (OSError, sqlite3.Error):
+        return None
+    entry = dict(row)
+    entry['headers'] = json.loads(entry['headers']) if entry['headers'] else None
+    for item in ['firstDT', 'lastDT']:
+        entry[item] = pd.Timestamp(entry[item]) if entry[item] else None
+    return entry
+
+
+def isUploaded(pathFile, contentHash=None):
+    """ True if the local file was uploaded to SharePoint and it did not change after that: the same size and mtime,
+     or with contentHash (its LibDataTransfer.hashFile) the same size and content, e.g. a file written again with the
+     same data. In that case the new mtime is recorded """
+    if not consts.CATALOG:
+        return False
+    pathFile = Path(pathFile)
+    try:
+        row = connect().execute('SELECT remoteSize, remoteMtime, remoteHash FROM files WHERE path = ?',
+                                (_key_(pathFile),)).fetchone()
+        stat = pathFile.stat()
+        if row is None or row['remoteSize'] != stat.st_size:
+            return False
+        if row['remoteMtime'] == stat.st_mtime:
+            return True
+        if contentHash is None or row['remoteHash'] != contentHash:
+            return False
+        with connect() as con:
+            con.execute('UPDATE files SET remoteMtime = ? WHERE path = ?', (stat.st_mtime, _key_(pathFile)))
+    except (OSError, sqlite3.Error):
+        return False
+    return True
+
+
+def getNormalized(pathFile):
+    """ Return the frequency (pd.Timedelta) of the data of the L1 file if it was written already clean by the pipeline
+     and it did not change after that, so it does not need to be cleaned again when it is read. Otherwise None """
+    entry = getFile(pathFile)
+    if entry is None or not entry.get('normalized'):
+        return None
+    return pd.Timedelta(entry['normalized'])
+
+
+def getContentHash(pathFile):
+    """ Return the LibDataTransfer.hashFile of the file recorded when it was written, if it did not change after that
+     (or it was downloaded again, see recordDownload). Otherwise None """
+    entry = getFile(pathFile)
+    if entry is None:
+        return None
+    return entry.get('contentHash')
+
+
+def findFiles(site, project, tableName, start=None, end=None, level=1):
+    """ Return the paths of the files of the table (the CS table name) with data between start and end, sorted by
+     their first timestamp """
+    if not consts.CATALOG:
+        return []
+    query = 'SELECT path FROM files WHERE site = ? AND project = ? AND tableName = ? AND level = ?'
+    args = [site, project, tableName, level]
+    if start is not None:
+        query += ' AND lastDT >= ?'
+        args.append(_dt_(start))
+    if end is not None:
+        query += ' AND firstDT <= ?'
+        args.append(_dt_(end))
+    try:
+        rows = connect().execute(query + ' ORDER BY firstDT', args).fetchall()
+    except sqlite3.Error:
+        return []
+    return [Path(row['path']) for row in rows]
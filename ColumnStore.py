@@ -0,0 +1,122 @@
+# -------------------------------------------------------------------------------
+# Name:        ColumnStore
+# Purpose:     Store the L1 data of a day as a folder of numpy arrays, one per column, that can be opened as memory
+#              maps to read any time window without parsing the csv files
+#
+# Author:      Gesuri
+#
+# Created:     October 17, 2026
+# Copyright:   (c) Gesuri 2026
+# Licence:     Apache 2.0
+# -------------------------------------------------------------------------------
+
+# The 10 Hz tables (ts_data, ts_data_2) are the biggest L1 files, one csv file per day of 864000 rows. To use them, the
+#   whole csv file of each day has to be parsed. For the tables with config.COLUMN_STORE, the L1 data of each day is
+#   also written as a column store, the paths are set by InfoFile._setL1paths_ like the other L1 paths. The stores are
+#   in consts.PATH_L1_STORE, with the same folders than the L1 files in consts.PATH_CLOUD: they are only local, the
+#   files in consts.PATH_CLOUD are uploaded to SharePoint and moved to consts.PATH_TEMP_BACKUP.
+#
+# 1. Layout of the store of a day (a folder):
+#   'TIMESTAMP.npy': the timestamps as int64 nanoseconds since 1970, sorted.
+#   '000.npy', '001.npy', ...: the values of each column with the dtype of config.COLUMN_STORE (e.g. float32), the
+#       flags (consts.FLAG) as NaN.
+#   'header.json': the CS header lines of the L1 file, the names of the columns (in the order of the files), the dtype,
+#       the number of rows and the first and last timestamps. It is written at the end, a store without it is not
+#       complete and it is not read.
+#   The arrays are opened with np.load(mmap_mode='r'), so only the rows and columns of the requested window are read
+#   from the disk.
+#
+# 2. Functions:
+#   'writeDay(pathStore, df, header, dtype=np.float32, log=None)': Write the data of a day to the store.
+#   'openDay(pathStore)': Return the header, the timestamps and the columns of the store as memory maps.
+#   'readDay(pathStore, start=None, end=None, columns=None)': Return a time window of a store as a DataFrame.
+#   'readWindow(pathsStore, start=None, end=None, columns=None, log=None)': Return a time window of several days.
+
+import json
+import shutil
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+import Log
+import consts
+
+HEADER_FILE = 'header.json'  # file with the metadata of the store, written at the end
+TIMESTAMP_FILE = 'TIMESTAMP.npy'  # file with the timestamps as int64 nanoseconds
+
+
+def writeDay(pathStore, df, header, dtype=np.float32, log=None):
+    """ Write the data of a day to the store in the folder pathStore, replacing it if it exists.
+        df: data of the day as InfoFile.df, indexed by the timestamps. The columns that are not numbers are not stored
+        header: CS header lines of the L1 file
+        dtype: dtype of the values in the store
+     Return True if the store was written """
+    pathStore = Path(pathStore)
+    df = df.sort_index(kind='stable')
+    columns = [col for col in df.columns if df[col].dtype.kind in 'biuf']
+    skipped = [col for col in df.columns if col not in columns]
+    if skipped:
+        Log.logMsg(f'<ColumnStore> The columns {skipped} are not numbers, they are not in the store {pathStore.name}',
+                   log, 'warn')
+    try:
+        if pathStore.exists():  # the header goes first, so an incomplete store is never read
+            pathStore.joinpath(HEADER_FILE).unlink(missing_ok=True)
+            shutil.rmtree(pathStore)
+        pathStore.mkdir(parents=True)
+        np.save(pathStore.joinpath(TIMESTAMP_FILE), df.index.values.astype('datetime64[ns]').view(np.int64))
+        for i, col in enumerate(columns):
+            values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            values[values == consts.FLAG] = np.nan
+            np.save(pathStore.joinpath(f'{i:03d}.npy'), values.astype(dtype))
+        meta = {'headers': list(header), 'columns': columns, 'dtype': np.dtype(dtype).name, 'rows': len(df),
+                'first': str(df.index[0]) if len(df) else None, 'last': str(df.index[-1]) if len(df) else None}
+        with open(pathStore.joinpath(HEADER_FILE), 'w') as f:
+            json.dump(meta, f, indent=1)
+    except OSError as e:
+        Log.logMsg(f'<ColumnStore> Error writing the store {pathStore}: {e}', log, 'error')
+        return False
+    return True
+
+
+def openDay(pathStore):
+    """ Return (meta, timestamps, columns) of the store in the folder pathStore: the dict of header.json, the int64
+     timestamps and a dict with the values of each column, all of them as read-only memory maps.
+     Return None if the store does not exist or it is not complete """
+    pathStore = Path(pathStore)
+    pathHeader = pathStore.joinpath(HEADER_FILE)
+    if not pathHeader.is_file():
+        return None
+    with open(pathHeader, 'r') as f:
+        meta = json.load(f)
+    timestamps = np.load(pathStore.joinpath(TIMESTAMP_FILE), mmap_mode='r')
+    columns = {col: np.load(pathStore.joinpath(f'{i:03d}.npy'), mmap_mode='r') for i, col in enumerate(meta['columns'])}
+    return meta, timestamps, columns
+
+
+def readDay(pathStore, start=None, end=None, columns=None):
+    """ Return the data of the store between start and end (both included) as a DataFrame, only with the columns given
+     (all of them if None). Only that part of the arrays is read from the disk. Return None if there is no store """
+    store = openDay(pathStore)
+    if store is None:
+        return None
+    meta, timestamps, values = store
+    first = 0 if start is None else np.searchsorted(timestamps, pd.Timestamp(start).value, side='left')
+    last = len(timestamps) if end is None else np.searchsorted(timestamps, pd.Timestamp(end).value, side='right')
+    columns = meta['columns'] if columns is None else [col for col in columns if col in values]
+    index = pd.DatetimeIndex(np.array(timestamps[first:last]).view('datetime64[ns]'), name='TIMESTAMP')
+    return pd.DataFrame({col: np.array(values[col][first:last]) for col in columns}, index=index)
+
+
+def readWindow(pathsStore, start=None, end=None, columns=None, log=None):
+    """ Return the data of several stores (e.g. the days of InfoFile.pathL1Store) between start and end as a DataFrame.
+     The stores that do not exist are skipped """
+    frames = []
+    for pathStore in pathsStore:
+        df = readDay(pathStore, start, end, columns)
+        if df is None:
+            Log.logMsg(f'<ColumnStore> There is no store {pathStore}', log, 'debug')
+        elif len(df) > 0:
+            frames.append(df)
+    if not frames:
+        return None
+    return pd.concat(frames).sort_index(kind='stable')
@@ -0,0 +1,182 @@
+# -------------------------------------------------------------------------------
+# Name:        Completeness
+# Purpose:     Daily completeness of the data of a file (missing percentage by day and column and the longest gap of each
+#              column) computed with one pass over the data, and saved as a QC sidecar of the file
+#
+# Author:      Gesuri
+#
+# Created:     October 17, 2026
+# Copyright:   (c) Gesuri 2026
+# Licence:     Apache 2.0
+# -------------------------------------------------------------------------------
+
+# InfoFile.checkData grouped the data by day and counted the missing values of each group in a loop, logging one line
+#   per day, on every L0 file and every L1 file read (365 groups for a yearly L1 file). The report is computed at once:
+#   one isna() of the data, the missing values of each day and column added with np.add.reduceat on the first row of
+#   each day, and the runs of missing values of each column from the differences of the mask.
+#
+# 1. Report (a DataFrame), one row per column of the data plus two rows:
+#   'records': the rows of each day, its 'missing' is the rows of the data.
+#   'ALL': all the columns, its longest gap is the longest run of rows with all the values missing.
+#   The columns are 'missing' (% of the values missing in all the data), 'longestGap' (rows), 'longestGapStart' (the
+#   timestamp of its first row) and one column per day ('YYYY-MM-DD') with the % of the values missing that day. The
+#   percentages are of the rows of the day in the data: the data is cleaned with its frequency, so the missing
+#   timestamps are rows with all the values missing.
+#
+# 2. QC sidecar: 'writeQC(pathFile, report, contentHash=None)' saves the report in consts.PATH_QC, with the same folders
+#   than in consts.PATH_CLOUD and the name of the file with '.qc.csv'. The first line has the size, mtime and hash
+#   (LibDataTransfer.hashFile) of the file. The QC of the L1 files is written by LibDataTransfer.writeDF2csv from the
+#   data written, with the hash it records in the catalog. 'readQC(pathFile)' returns the report if the file has the
+#   same size and the same mtime, or the same hash in the catalog (Catalog.getContentHash), e.g. a L1 file downloaded
+#   again without changes, so its report is not computed again and the file is not read to hash it.
+#
+# 3. 'combine(reports)': the report of several parts of the data (e.g. the days of the streaming mode of InfoFile). The
+#   gaps between the parts are not joined.
+
+import json
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+import Catalog
+import Log
+import consts
+
+RECORDS = 'records'  # row with the rows of each day
+ALL = 'ALL'  # row of all the columns
+INFO_COLUMNS = ['missing', 'longestGap', 'longestGapStart']  # columns of the report before the days
+QC_EXTENSION = '.qc.csv'
+
+
+def _longestRuns_(mask):
+    """ Return the length and the first row of the longest run of True of each column of the mask (rows, columns), 0 and
+     -1 if the column has no True """
+    rows, columns = mask.shape
+    padded = np.zeros((columns, rows + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask.T
+    edges = np.diff(padded, axis=1)
+    colStart, rowStart = np.nonzero(edges == 1)  # sorted by column and row, the ends are in the same order
+    rowEnd = np.nonzero(edges == -1)[1]
+    lengths = rowEnd - rowStart
+    longest = np.zeros(columns, dtype=np.int64)
+    first = np.full(columns, -1, dtype=np.int64)
+    if len(lengths):
+        order = np.lexsort((-lengths, colStart))  # the longest run of each column first
+        best = order[np.r_[True, colStart[order][1:] != colStart[order][:-1]]]
+        longest[colStart[best]] = lengths[best]
+        first[colStart[best]] = rowStart[best]
+    return longest, first
+
+
+def dailyCompleteness(df):
+    """ Return the report of completeness of the data (see above), None if there is no data """
+    if df is None or len(df) == 0 or len(df.columns) == 0:
+        return None
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+    mask = df.isna().to_numpy()
+    days = df.index.normalize().asi8
+    starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+    records = np.diff(np.r_[starts, len(df)])
+    missing = np.add.reduceat(mask, starts, axis=0, dtype=np.int64)  # missing values of each day and column
+    longest, first = _longestRuns_(np.column_stack([mask, mask.all(axis=1)]))
+    index = df.index
+    report = pd.DataFrame(index=[RECORDS, *df.columns, ALL])
+    report['missing'] = np.r_[len(df), missing.sum(axis=0) / len(df) * 100, missing.sum() / mask.size * 100]
+    report['longestGap'] = np.r_[np.nan, longest]
+    report['longestGapStart'] = [pd.NaT] + [index[i] if i >= 0 else pd.NaT for i in first]
+    dayNames = pd.to_datetime(days[starts]).strftime('%Y-%m-%d')
+    daily = np.vstack([records, (missing / records[:, None] * 100).T,
+                       missing.sum(axis=1) / (records * mask.shape[1]) * 100])
+    return pd.concat([report, pd.DataFrame(daily, index=report.index, columns=dayNames)], axis=1)
+
+
+def combine(reports):
+    """ Return the report of the data of all the reports (of parts of the same data), None if there are none """
+    reports = [report for report in reports if report is not None]
+    if not reports:
+        return None
+    if len(reports) == 1:
+        return reports[0]
+    daily = pd.concat([report.drop(columns=INFO_COLUMNS) for report in reports], axis=1)
+    daily = daily.T.groupby(level=0).last().T  # a day of several parts, the last one
+    rows = np.array([report.loc[RECORDS, 'missing'] for report in reports])
+    values = np.array([report['missing'].to_numpy() for report in reports])
+    report = pd.DataFrame(index=reports[0].index)
+    report['missing'] = (values * rows[:, None]).sum(axis=0) / rows.sum()
+    report.loc[RECORDS, 'missing'] = rows.sum()
+    gaps = np.array([r['longestGap'].fillna(-1).to_numpy() for r in reports])
+    best = gaps.argmax(axis=0)
+    report['longestGap'] = [reports[b]['longestGap'].iloc[i] for i, b in enumerate(best)]
+    report['longestGapStart'] = [reports[b]['longestGapStart'].iloc[i] for i, b in enumerate(best)]
+    return pd.concat([report, daily], axis=1)
+
+
+def summary(report):
+    """ Return a line with the days with missing data, the worst one and the longest gap, None if nothing is missing """
+    if report is None:
+        return None
+    days = report.loc[ALL].drop(INFO_COLUMNS).astype(float)
+    if not (days > 0).any():
+        return None
+    worst = days.idxmax()
+    column = report.drop(index=[RECORDS, ALL])['longestGap'].astype(float).idxmax()
+    return (f'{(days > 0).sum()} of {len(days)} days with missing data ({report.loc[ALL, "missing"]:.2f}%), the worst '
+            f'{worst} ({days[worst]:.2f}%). Longest gap: {int(report.loc[column, "longestGap"])} records of {column} '
+            f'from {report.loc[column, "longestGapStart"]}')
+
+
+def getQCPath(pathFile):
+    """ Return the path of the QC sidecar of a file in consts.PATH_CLOUD, None if it is not in consts.PATH_CLOUD """
+    try:
+        relative = Path(pathFile).relative_to(consts.PATH_CLOUD)
+    except ValueError:
+        return None
+    return consts.PATH_QC.joinpath(relative.parent, f'{relative.name}{QC_EXTENSION}')
+
+
+def writeQC(pathFile, report, pathSource=None, contentHash=None, log=None):
+    """ Save the report as the QC sidecar of pathFile, tagged with the size and mtime of pathSource (pathFile if None),
+     the file whose data was checked, and contentHash, its LibDataTransfer.hashFile if it is known.
+     Return True if it was written """
+    pathQC = getQCPath(pathFile)
+    if pathQC is None or report is None:
+        return False
+    pathSource = Path(pathFile if pathSource is None else pathSource)
+    try:
+        stat = pathSource.stat()
+        info = {'size': stat.st_size, 'mtime': stat.st_mtime, 'hash': contentHash}
+        pathQC.parent.mkdir(parents=True, exist_ok=True)
+        pathTemp = pathQC.with_name(f'{pathQC.name}.tmp')
+        with open(pathTemp, 'w', newline='') as f:
+            f.write(f'# {json.dumps(info)}\n')
+            report.to_csv(f, index_label='column')
+        pathTemp.replace(pathQC)
+    except OSError as e:
+        Log.logMsg(f'<Completeness> Error writing the QC sidecar of {Path(pathFile).name}: {e}', log, 'warn')
+        return False
+    return True
+
+
+def readQC(pathFile, log=None):
+    """ Return the report of the QC sidecar of the file if the file did not change since it was written: the same size
+     and mtime, or the same hash recorded in the catalog. Otherwise None """
+    pathQC = getQCPath(pathFile)
+    if pathQC is None or not pathQC.is_file():
+        return None
+    try:
+        stat = Path(pathFile).stat()
+        with open(pathQC, 'r') as f:
+            info = json.loads(f.readline()[1:])
+            if info['size'] != stat.st_size:
+                return None
+            if info['mtime'] != stat.st_mtime and (info['hash'] is None or
+                                                   info['hash'] != Catalog.getContentHash(pathFile)):
+                return None
+            report = pd.read_csv(f, index_col=0)
+    except (OSError, ValueError, KeyError) as e:
+        Log.logMsg(f'<Completeness> Error reading the QC sidecar of {Path(pathFile).name}: {e}', log, 'warn')
+        return None
+    report.index.name = None
+    report['longestGapStart'] = pd.to_datetime(report['longestGapStart'])
+    return report
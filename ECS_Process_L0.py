@@ -10,8 +10,12 @@
 #               6. The script will append the current file to the stored file and save the new file.
 #               7. If there is not a L1 file, the script will create a new file with the current data.
 #               8. The script will move the L0 files to the corresponding folder.
+#               The consecutive files of the same table are fused together, so each L1 file is written once.
+#               The files of different sites and tables can be processed at the same time (-w or
+#                   consts.PROCESS_WORKERS), the files of the same table are processed in order by the same process.
 #               9. The local files are uploaded to the SharePoint folder and backed up in a temporal folder.
 #               10. Finally, the files on the temporal backup folder are removed after a certain time.
+#               The time of each stage by site and table is written in the report of the run (see Timing).
 #
 # Version:     1.0
 #
@@ -32,18 +36,31 @@ import time
 import getopt
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
 
 import systemTools
 import consts
 import Log
 import InfoFile
 import LibDataTransfer
-
-# Add the path to the MSSP_file_driver folder, this a different repository
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'MSSP_file_driver'))
-import office365_api
+import ColumnStore
+import Catalog
+import SPTransfer
+import Journal
+import Timing
+import Storage
+import config
 
 _PATH_DATA_2_PROCESS_ = consts.PATH_HARVESTED_DATA
+_WORKERS_ = consts.PROCESS_WORKERS
+_RECONCILE_ = False  # upload all the files modified in the last days, not only the ones in the journal
+_workerLog_ = None  # log of the worker of the pool, also used by InfoFile (see processFiles)
+
+# the log files written are added to the journal of the files to upload
+Log.setJournal(Journal.markDirty)
+# the lines of the logs are written by a writer thread
+Log.setAsync(consts.LOG_ASYNC)
 
 # Initialize the general log file
 log = Log.Log(path=consts.PATH_GENERAL_LOGS.joinpath('ECS_Process_L0.log'))
@@ -62,7 +79,8 @@ def getReadyFiles(dirList):
     newDirList = []
     for item in dirList:
         log.live(f'Renaming {item.name}')
-        nf = LibDataTransfer.renameAFileWithDate(item)
+        with Timing.span('rename', site=item.name.split('_')[consts.CS_FILE_NAME_SITE], bytes=item.stat().st_size):
+            nf = LibDataTransfer.renameAFileWithDate(item)
         if nf:
             newDirList.append(nf)
     return newDirList
@@ -95,6 +113,10 @@ def cmd_help():
     print('         After process path:       ', consts.PATH_TEMPSHARE)
     print('   If required to process extra data, you need to run the script without any parameters.')
     print('   If the script will be run atomatically by the system, the parameter -a must be added.')
+    print('   To process the files of different tables at the same time, add -w and the number of workers,')
+    print(f'      e.g.: -w 4. Default: {consts.PROCESS_WORKERS}')
+    print('   Only the files written since the last upload are uploaded (see Journal). To check all the files')
+    print('      modified in the last 7 days, add -r (reconcile).')
     print('   ')
     print('   To use default folders use no parameters')
     print('   To change folders, modify consts.py file only if you really know what are you doing!')
@@ -107,17 +129,21 @@ def arguments(argv):
     Args:
         argv (list): List of command line arguments.
     """
-    global _PATH_DATA_2_PROCESS_
+    global _PATH_DATA_2_PROCESS_, _WORKERS_, _RECONCILE_
     try:
-        opts, args = getopt.getopt(argv, "ah", ["help"])
+        opts, args = getopt.getopt(argv, "ahrw:", ["help", "reconcile", "workers="])
     except getopt.GetoptError:
         cmd_help()
         sys.exit(2)
-    if not opts:
+    if '-a' not in [opt for opt, arg in opts]:
         _PATH_DATA_2_PROCESS_ = consts.PATH_TEMPSHARE
     for opt, arg in opts:
         if opt == '-a':
             _PATH_DATA_2_PROCESS_ = consts.PATH_HARVESTED_DATA
+        elif opt in ('-w', '--workers') and arg.isdigit():
+            _WORKERS_ = int(arg)
+        elif opt in ('-r', '--reconcile'):
+            _RECONCILE_ = True
         elif opt in ('-h', '--help'):
             cmd_help()
             sys.exit()
@@ -162,81 +188,169 @@ def check_temp_backup():
                 log.error(f"Unexpected error: {e}")
 
 
+def newSPClient():
+    """
+    Returns a new client of SharePoint, of the backend of consts.STORAGE_BACKEND (see Storage). Each thread of the
+    transfer pool creates its own with this function.
+
+    Returns:
+        office365_api.SharePoint: The authenticated client, or the client of the backend.
+    """
+    return Storage.newClient(log=log)
+
+
+def downloadSPfile(pool, pf):
+    """
+    Downloads one file from SharePoint in a thread of the transfer pool, checking local existence and metadata before
+    downloading. If the local file is newer or larger than the file in SharePoint, the file in SharePoint is renamed
+    and the local file is used.
+
+    Args:
+        pool (SPTransfer.TransferPool): The transfer pool.
+        pf (Path): Local path of the file, in consts.PATH_CLOUD.
+
+    Returns:
+        bool: True if the file was downloaded.
+    """
+    file_name = pf.name
+    folder_name = pf.relative_to(consts.PATH_CLOUD).parent
+    if pf.exists():
+        log.info(f'File {pf.name} already exists in local folder')
+        if Catalog.isUploaded(pf):
+            log.debug(f'The local file {pf.name} did not change since it was uploaded, it is not downloaded')
+            return False
+    # a file that is not in SharePoint is not an error, so it is not retried
+    remote_file_properties = pool.call(lambda sp: sp.get_file_properties(file_name, folder_name),
+                                       name=f'Properties of {file_name}', retryFalse=False)
+    if not remote_file_properties:
+        log.debug(f"The file {file_name} doesn't exist on SharePoint, skiping this file.")
+        return False
+    if pf.exists():
+        flag = False
+        # Compare size and modification date of the local file with the file in SharePoint
+        if pf.stat().st_size > remote_file_properties['file_size']:
+            log.warn(f'The local file {pf.name} looks to have more information than the file in SharePoint')
+            flag = True
+        if datetime.fromtimestamp(pf.stat().st_mtime) > remote_file_properties['time_last_modified']:
+            log.warn(f'File {pf.name} in local folder is newer than the file in SharePoint')
+            flag = True
+        if flag:
+            new_name = f'{file_name}_{Log.getStrTime()}'
+            log.warn(f'The file in SharePoint will be renamed to {new_name}')
+            pool.call(lambda sp: sp.rename_file(f'{folder_name}/{file_name}', f'{folder_name}/{new_name}'),
+                      name=f'Rename of {file_name}')
+            return False
+    pf.parent.mkdir(parents=True, exist_ok=True)
+    # download the file from SharePoint
+    log.live(f'Downloading {file_name} from SharePoint')
+    with Timing.span('download') as span:  # the site and table of the context of the table processed
+        downloaded = pool.call(lambda sp: sp.download_large_file(file_name, folder_name, pf),
+                               name=f'Download of {file_name}')
+        span['bytes'] = pf.stat().st_size if downloaded and pf.is_file() else 0
+    if not downloaded:
+        log.warn(f'Not possible download {file_name} from SharePoint.')
+        return False
+    # the catalog trusts the downloaded file only if it has the content recorded, not only the same size
+    Catalog.recordDownload(pf, LibDataTransfer.hashFile(pf) if consts.CATALOG else None, log)
+    return True
+
+
 def download_SP_files(pathfiles):
     """
-    Download files from SharePoint, checking local existence and metadata before downloading.
-    If the local file is newer or larger than the file in SharePoint, the file in SharePoint will be renamed and
-    the local file will be used.
+    Download files from SharePoint, consts.SP_WORKERS files at the same time (see downloadSPfile).
     Args:
         pathfiles (list or str): List of paths or single path to download files.
     """
     et = systemTools.ElapsedTime()
-    sp = office365_api.SharePoint(log=log)
     if not isinstance(pathfiles, list):
         pathfiles = [pathfiles]
-    for file in pathfiles:
-        pf = Path(file)
-        file_name = pf.name
-        folder_name = pf.relative_to(consts.PATH_CLOUD).parent
-        if pf.exists():
-            log.info(f'File {pf.name} already exists in local folder')
-            remote_file_properties = sp.get_file_properties(file_name, folder_name)
-            if not remote_file_properties:
-                log.debug(f"The file {file_name} doesn't exist on SharePoint, skiping this file.")
-                continue
-            flag = False
-            # Compare size and modification date of the local file with the file in SharePoint
-            if pf.stat().st_size > remote_file_properties['file_size']:
-                log.warn(f'The local file {pf.name} looks to have more information than the file in SharePoint')
-                flag = True
-            if datetime.fromtimestamp(pf.stat().st_mtime) > remote_file_properties['time_last_modified']:
-                log.warn(f'File {pf.name} in local folder is newer than the file in SharePoint')
-                flag = True
-            if flag:
-                new_name = f'{file_name}_{Log.getStrTime()}'
-                log.warn(f'The file in SharePoint will be renamed to {new_name}')
-                sp.rename_file(f'{folder_name}/{file_name}', f'{folder_name}/{new_name}')
-                time.sleep(5)
-        if not pf.parent.exists():
-            pf.parent.mkdir(parents=True)
-        # download the file from SharePoint
-        log.live(f'Downloading {file_name} from SharePoint')
-        if not sp.download_large_file(file_name, folder_name, pf):
-            log.warn(f'Not possible download {file_name} from SharePoint.')
-    log.info(f'Time downloading the files was: {et.elapsed()}')
-
-
-def upload_SP_files():
-    """
-    Upload files from the local folder to SharePoint, resuming uploads based on modification time.
+    with SPTransfer.TransferPool(newSPClient, log=log) as pool:
+        results = pool.map(lambda pf: downloadSPfile(pool, pf), [Path(file) for file in pathfiles],
+                           name=lambda pf: pf.name)
+    log.info(f'Downloaded {sum(results.values())} of {len(pathfiles)} files in {et.elapsed()}')
+
+
+def getContentHash(item):
+    """
+    Returns the content hash of a file for the catalog: the one recorded when it was written, or the file is hashed.
+
+    Args:
+        item (Path): Path of the file.
+
+    Returns:
+        str: The hash (LibDataTransfer.hashFile), or None without consts.CATALOG, where it would not be used.
+    """
+    if not consts.CATALOG:
+        return None
+    return Catalog.getContentHash(item) or LibDataTransfer.hashFile(item)
+
+
+def uploadSPfile(pool, item):
+    """
+    Uploads one file to SharePoint in a thread of the transfer pool. If the file is uploaded, it is moved to the
+    temporal backup folder, except the log files.
+
+    Args:
+        pool (SPTransfer.TransferPool): The transfer pool.
+        item (Path): Path of the file, in consts.PATH_CLOUD.
+
+    Returns:
+        bool: True if the file is in SharePoint, uploaded now or before.
+    """
+    upload_file = item.relative_to(consts.PATH_CLOUD)
+    # the file in SharePoint is already this one, the same mtime or the same content
+    contentHash = None
+    uploaded = Catalog.isUploaded(item)
+    if not uploaded:
+        contentHash = getContentHash(item)
+        uploaded = Catalog.isUploaded(item, contentHash)
+    if uploaded:
+        if not check_log_file(item):
+            log.info(f'Local copy of {item.name} did not change since it was uploaded, moved to temporal backup')
+            LibDataTransfer.moveAfileWOOW(item, consts.PATH_TEMP_BACKUP.joinpath(upload_file), log)
+        return True
+    # Upload the files to the SharePoint folder, by chunks that are resumed if the upload is interrupted
+    with Timing.span('upload', site=upload_file.parts[0], bytes=item.stat().st_size):
+        uploaded = pool.call(lambda sp: SPTransfer.uploadResumable(sp, item, upload_file, contentHash, log=log),
+                             name=f'Upload of {item.name}')
+    if not uploaded:
+        log.warn(f'Unable to upload {item.name} to SharePoint. File will be left for next attempt')
+        return False
+    Catalog.recordUpload(item, contentHash, log)
+    if not check_log_file(item):
+        log.info(f'Local copy of {item.name} was uploaded to SharePoint and local file moved to temporal backup')
+        LibDataTransfer.moveAfileWOOW(item, consts.PATH_TEMP_BACKUP.joinpath(upload_file), log)
+    else:
+        log.info(f'Local copy of {item.name} was uploaded to SharePoint')
+    return True
+
+
+def upload_SP_files(reconcile=False):
+    """
+    Upload files from the local folder to SharePoint. The files are the ones written since the last upload (see
+    Journal), or with reconcile (or without consts.UPLOAD_JOURNAL) all the files modified in the last 7 days. The files
+    are uploaded consts.SP_WORKERS at the same time (see uploadSPfile).
     If the file is successfully uploaded, it will be moved to the temporal backup folder.
+
+    Args:
+        reconcile (bool): Walk the whole local folder instead of using the journal.
     """
     # Create the elapsed time object
     et = systemTools.ElapsedTime()
-    # set connection to SharePoint
-    sp = office365_api.SharePoint(log=log)
-    # Get the current time and the time from 7 days ago
-    last_mod_time = datetime.now() - timedelta(days=7)
-    # Get the list of files in the local folder
-    files = [f for f in consts.PATH_CLOUD.rglob('*') if
-             f.is_file() and datetime.fromtimestamp(f.stat().st_mtime) >= last_mod_time]
-    idx = 1
-    for item in files:
-        log.live(f'File: {item.name}, ({idx}/{len(files)})')
-        upload_file = item.relative_to(consts.PATH_CLOUD)
-        # Upload the files to the SharePoint folder
-        if sp.upload_large_file(local_file_path=item, target_file_url=upload_file):
-            if not check_log_file(item):
-                log.info(
-                    f'Local copy of {item.name} was uploaded to SharePoint and local file moved to temporal backup')
-                LibDataTransfer.moveAfileWOOW(item, consts.PATH_TEMP_BACKUP.joinpath(upload_file), log)
-            else:
-                log.info(f'Local copy of {item.name} was uploaded to SharePoint')
-        else:
-            log.warn(f'Unable to upload {item.name} to SharePoint. File will be left for next attempt')
-        idx += 1
+    Log.flush(close=True)  # the log files are uploaded with all their lines
+    files = Journal.takeDirty()
+    if reconcile or not consts.UPLOAD_JOURNAL:
+        # Get the current time and the time from 7 days ago
+        last_mod_time = datetime.now() - timedelta(days=7)
+        # Get the list of files in the local folder
+        files = list(dict.fromkeys(files + [f for f in consts.PATH_CLOUD.rglob('*') if
+                                            f.is_file() and datetime.fromtimestamp(f.stat().st_mtime) >= last_mod_time]))
+    with SPTransfer.TransferPool(newSPClient, log=log) as pool:
+        results = pool.map(lambda item: uploadSPfile(pool, item), files, name=lambda item: item.name)
+    # the files that were not uploaded are in the journal again, for the next attempt
+    Journal.doneDirty([item for item, uploaded in results.items() if not uploaded and item.is_file()])
     # Log the elapsed time
-    log.info(f'Uploaded {len(files)} files in {et.elapsed()}.')
+    log.info(f'Uploaded {sum(results.values())} of {len(files)} files in {et.elapsed()}.')
 
 
 def get_file_info(file_path: Path) -> dict:
@@ -254,7 +368,9 @@ def get_file_info(file_path: Path) -> dict:
 
 def uploadAfile(sp, item, upload_file):
     #    Upload the files to the SharePoint and then erase local copy
-    if sp.upload_large_file(local_file_path=item, target_file_url=upload_file):
+    contentHash = getContentHash(item)
+    if SPTransfer.uploadResumable(sp, item, upload_file, contentHash, log=log):
+        Catalog.recordUpload(item, contentHash, log)
         if not check_log_file(item):
             print(f'Local copy of {item.name} was uploaded to SharePoint and local file is removed')
             # LibDataTransfer.moveAfileWOOW(item, consts.PATH_TEMP_BACKUP.joinpath(upload_file), log)
@@ -272,7 +388,7 @@ def check_and_upload_SP_files_v2():
     # Create the elapsed time object
     et = systemTools.ElapsedTime()
     # set connection to SharePoint
-    sp = office365_api.SharePoint(log=log)
+    sp = newSPClient()
     # Get the current time and the time from 7 days ago
     last_mod_time = datetime.now() - timedelta(days=500)
     # Get the list of files in the local folder
@@ -282,6 +398,11 @@ def check_and_upload_SP_files_v2():
     for item in files:
         log.live(f'File: {item.name}, ({idx}/{len(files)})')
         upload_file = item.relative_to(consts.PATH_CLOUD)
+        if Catalog.isUploaded(item) and not check_log_file(item):  # no need to ask SharePoint
+            print(f'Erasing file {item.name} because it did not change since it was uploaded to SP.')
+            item.unlink()
+            idx += 1
+            continue
         spFileProp = sp.get_file_properties(upload_file.name, upload_file.parent)
         lcFileProp = get_file_info(item)
         if not spFileProp:
@@ -298,9 +419,15 @@ def check_and_upload_SP_files_v2():
             else:
                 Log.pCyan(f'Local copy of {item.name} is bigger so it will be upload.')
                 uploadAfile(sp, item, upload_file)
-        else:
+        # the same size is not the same content: the local copy is erased only if it has the content uploaded (see
+        # Catalog) or if it did not change after the SP copy was modified
+        elif Catalog.isUploaded(item, getContentHash(item)) or \
+                spFileProp['time_last_modified'] >= datetime.fromtimestamp(item.stat().st_mtime):
             Log.pYellow(f'Erasing file {item.name} because already exist and same size of SP copy.')
             item.unlink()
+        else:
+            Log.pCyan(f'Local copy of {item.name} has the same size but it changed after the SP copy, it will be upload.')
+            uploadAfile(sp, item, upload_file)
         # Upload the files to the SharePoint folder
         #        if sp.upload_large_file(local_file_path=item, target_file_url=upload_file):
         #            if not check_log_file(item):
@@ -315,9 +442,368 @@ def check_and_upload_SP_files_v2():
     log.info(f'Uploaded {len(files)} files in {et.elapsed()}.')
 
 
+def appendL1(l0, fL1, c_df):
+    """
+    Appends the data of the L0 file at the end of the L1 file, without reading or rewriting it, when all the data is
+    after the last line of the L1 file and the headers are the same. The gap between the files is filled with flagged
+    rows like the full fuse does.
+
+    Args:
+        l0 (InfoFile): The L0 file.
+        fL1 (Path): The L1 file.
+        c_df (pd.DataFrame): The data of the L0 file for the L1 file.
+
+    Returns:
+        bool: True if the data was appended, False if the L1 file needs the full fuse and rewrite.
+    """
+    if l0.staticTable or l0.resample or len(c_df) == 0 or not fL1.is_file():
+        return False
+    entry = Catalog.getFile(fL1)  # the catalog knows the L1 file if it did not change since it was written
+    if entry is not None and entry['lastDT'] is not None:
+        meta = {'headers': entry['headers'], 'firstLineDT': entry['firstDT'], 'lastLineDT': entry['lastDT']}
+    else:
+        meta = LibDataTransfer.getHeaderFLlineFile(fL1, log)
+    lastDT = meta['lastLineDT']
+    # when the last line can not be read, the last timestamp is the first one
+    if meta['headers'] != l0.cs_headers or lastDT is None or lastDT == meta['firstLineDT']:
+        return False
+    if c_df.index[0] <= lastDT:  # overlapped or out of order data
+        return False
+    freq = c_df.index.freq
+    if freq is not None:  # the data has a fixed frequency, fill the gap from the last line of the L1 file
+        gap = pd.date_range(lastDT, c_df.index[0], freq=freq)
+        if gap[-1] != c_df.index[0]:  # the new data is not on the same time steps than the L1 file
+            return False
+        c_df = c_df.reindex(gap[1:-1].append(c_df.index))
+    # the gap was filled, so the rows continue the L1 file on its frequency
+    return LibDataTransfer.appendDF2csv(fL1, c_df, indexMapFunc=l0.metaTable['indexMapFunc'], normalized=freq,
+                                        log=log)
+
+
+def processL1(l0, idx, c_df):
+    """
+    Appends the data of one L1 period (a day or a year) of the L0 file to the L1 file of that period.
+
+    Args:
+        l0 (InfoFile): The L0 file.
+        idx (str): The key of the period as returned by LibDataTransfer.fuseDataFrame(group=l0.st_fq).
+        c_df (pd.DataFrame): The data of the L0 file for that period.
+    """
+    fL1, pathResample, pathStore = l0.getL1paths(idx)
+    start2 = time.time()  # keep track of the time for each L1 file
+    createNewFile = False  # flag to create a new file
+    log.live(f'For {l0.pathFile.name}, processing L1 {fL1.name}')
+
+    # the new data is after the last line of the L1 file, so it is only appended. Not for the tables with column
+    # store, the store is written with the data of the whole day
+    if consts.L1_INCREMENTAL_WRITE and pathStore is None:
+        with Timing.span('write-L1', rows=len(c_df)) as span:
+            appended = appendL1(l0, fL1, c_df)
+            span['bytes'] = fL1.stat().st_size if appended else 0
+        if appended:
+            log.live(f'Appended {len(c_df)} rows to L1 {fL1.name} in {time.time() - start2:.2f} seconds')
+            return
+
+    l1 = InfoFile.InfoFile(fL1, log=_workerLog_)  # get the info for the L1 file
+
+    # start the process to check the current L0 to be appended to the L1 file
+    if l1.ok():  # there is available L1 file for the current file (the L1 file exists and has data)
+
+        # compare headers of the current with any of the stored files
+        chFrom = list(set(l1.cs_headers) - set(l0.cs_headers))
+        chTo = list(set(l0.cs_headers) - set(l1.cs_headers))
+
+        if len(chFrom) > 0:  # there are changes. log the changes
+            log.warn(f'For site {l1.f_site}, the table {l1.cs_tableName} changed from: "{chFrom}" to: "{chTo}"')
+
+            if l1.numberColumns != l0.numberColumns:  # check NUMBER of columns
+                log.warn(f'For site {l1.f_site}, the table {l1.cs_tableName} changed the number of columns '
+                         f'from: "{l1.numberColumns}" to: "{l0.numberColumns}"')
+                createNewFile = True
+
+            if l1.colNames != l0.colNames:  # check columns NAMES
+                a = set(l1.colNames) - set(l0.colNames)
+                b = set(l0.colNames) - set(l1.colNames)
+                log.warn(f'For site {l1.f_site}, the table {l1.cs_tableName} changed the columns names from: "'
+                         f'{a}" to: "{b}"')
+                createNewFile = True
+
+            if l1.cs_signature != l0.cs_signature:
+                log.warn(f'For site {l1.f_site}, the table {l1.cs_tableName} changed the signature from: "'
+                         f'{l1.cs_signature}" to: "{l0.cs_signature}"')
+
+            if l1.cs_serialNumber != l0.cs_serialNumber:
+                log.warn(f'For site {l1.f_site}, the table {l1.cs_tableName} changed the serial number from: "'
+                         f'{l1.cs_serialNumber}" to: "{l0.cs_serialNumber}"')
+
+            if l1.cs_program != l0.cs_program:
+                log.warn(f'For site {l1.f_site}, the table {l1.cs_tableName} changed the program from: "'
+                         f'{l1.cs_program}" to: "{l0.cs_program}"')
+
+            if l1.cs_os != l0.cs_os:
+                log.warn(f'For site {l1.f_site}, the table {l1.cs_tableName} changed the OS from: "'
+                         f'{l1.cs_os}" to: "{l0.cs_os}"')
+
+        if createNewFile:
+            newName = LibDataTransfer.renameAFileWithDate(l1.pathFile, log)
+            log.warn(f'For site {l1.f_site}, the file L1 {l1.pathFile.name} was renamed because the header '
+                     f'is different to L0. The new file name is: {newName.name}')
+            l1.df = None
+        else:
+            log.info(f'For site {l0.f_site}, the table {l0.cs_tableName} there is a L1 file named: '
+                     f'{l1.pathFile.name}')
+
+        # this section is for the header that is the same from the current to the stored file
+        # this line add the current data to the stored file, in other words, L0 is appended to L1
+        with Timing.span('fuse', rows=len(c_df) + (0 if l1.df is None else len(l1.df))):
+            c_df = LibDataTransfer.fuseDataFrame(c_df, l1.df, freq=l0.frequency, group=l0.st_fq)
+        if len(c_df) > 1:
+            log.error(f'For site {l0.f_site}, the table {l0.cs_tableName} on files {l0.pathFile.name} and '
+                      f'{l1.pathFile.name} have more than a set of data grouped on "{l0.st_fq}", {c_df.keys()}.'
+                      f' Skipped this file.')
+            return
+
+        if idx in c_df.keys():
+            c_df = c_df.pop(idx)
+        else:
+            log.error(f'!!!!!For site {l0.f_site}, the table {l0.cs_tableName} on files {l0.pathFile.name} and '
+                      f'{l1.pathFile.name} have different grouped ({l0.st_fq}) data {c_df.keys()}. Skipped this'
+                      f' file.')
+            return
+    else:  # there is not L1 file for the current file so creating a new one
+        log.info(f'For site {l0.f_site}, table {l0.cs_tableName} there is not L1 file. Creating: {fL1.name}')
+
+    if l0.hf:  # if high frequency data
+        startDate = c_df.index[0]
+        if startDate != startDate.floor(freq='D'):
+            log.info(f'For site {l0.f_site}, table {l0.cs_tableName}: Is going to create flagged data from '
+                     'beginning of this day')
+            c_df = LibDataTransfer.createFlaggedData(df=c_df, freq=consts.FREQ_10HZ, st_fq=consts.FREQ_DAILY)
+
+    # update the L1 resample files if needed
+    if l0.resample:
+        log.info(f'For site {l0.f_site}, table {l0.cs_tableName} resampling to {l0.resample}')
+        with Timing.span('resample', rows=len(c_df)) as span:
+            resampleDF = LibDataTransfer.resampleDataFrame(df=c_df, freq=l0.resample, method='last')
+            log.debug(f'For site {l0.f_site}, table {l0.cs_tableName} resampled saved to {pathResample}')
+            LibDataTransfer.writeDF2csv(pathFile=pathResample, dataframe=resampleDF, header=l0.cs_headers,
+                                        indexMapFunc=l0.metaTable['indexMapFunc'], log=log)
+            span['bytes'] = pathResample.stat().st_size if pathResample.is_file() else 0
+
+    with Timing.span('write-L1', rows=len(c_df)) as span:
+        # write the column store before the csv file, writeDF2csv formats the index of the dataframe
+        if pathStore is not None:
+            log.debug(f'For site {l0.f_site}, table {l0.cs_tableName} column store saved to {pathStore}')
+            ColumnStore.writeDay(pathStore, c_df, l0.cs_headers, dtype=l0.metaTable[config.COLUMN_STORE], log=log)
+
+        # write the data to a csv file that is L1, it is already clean (fused with the frequency of the L0 file)
+        LibDataTransfer.writeDF2csv(pathFile=fL1, dataframe=c_df, header=l0.cs_headers,
+                                    indexMapFunc=l0.metaTable['indexMapFunc'], normalized=l0.frequency, log=log)
+        span['bytes'] = fL1.stat().st_size if fL1.is_file() else 0
+
+    end2 = time.time()
+    log.live(f'Total time for file L1: {fL1.name}: {end2 - start2:.2f} seconds')
+
+
+def loadL0(file, prefetcher=None):
+    """
+    Loads the L0 file with InfoFile. Big files are loaded in streaming mode.
+
+    Args:
+        file (Path): The L0 file.
+        prefetcher (SPTransfer.Prefetcher): If given, the L1 files are downloaded while the file is read.
+
+    Returns:
+        InfoFile: The L0 file, or None if it has problems.
+    """
+    log.live(f'Processing L0 file: {file.name}')
+    # create the object that read the CS file (file Level 0) from fL0 get the related stored files and load them
+    # using InfoFile
+    l0 = InfoFile.InfoFile(file, streaming=file.stat().st_size >= consts.STREAMING_MIN_FILE_SIZE,
+                           prefetch=None if prefetcher is None else prefetcher.prefetch, log=_workerLog_)
+    if not l0.ok():
+        log.error(f'The file {l0} is skiping because has problems.\n{l0.statusFile}')
+        return None
+    return l0
+
+
+def getBatchKey(l0):
+    """
+    Returns the key of the L0 files that can be fused together before writing the L1 files: the same site, datalogger,
+    headers, frequency and storage frequency.
+
+    Args:
+        l0 (InfoFile): The L0 file.
+
+    Returns:
+        tuple: The key.
+    """
+    return l0.f_site_r, l0.f_project, tuple(l0.cs_headers), l0.frequency, l0.st_fq
+
+
+def iterL0batches(files, prefetcher=None):
+    """
+    Loads the L0 files in order and yields them by batches of consecutive files of the same table and header, so the
+    L1 files they write to are downloaded, fused and written once for all of them. A batch is closed when the next file
+    is not compatible or the batch reaches consts.L1_BATCH_MAX_SIZE bytes. The files in streaming mode go alone.
+
+    Args:
+        files (list): The L0 files.
+        prefetcher (SPTransfer.Prefetcher): If given, the L1 files are downloaded while the files are read.
+
+    Yields:
+        list: The InfoFile of the L0 files of the batch.
+    """
+    batch = []
+    batchSize = 0
+    for file in files:
+        l0 = loadL0(file, prefetcher)
+        if l0 is None:
+            continue
+        if batch and (l0.streaming or getBatchKey(l0) != getBatchKey(batch[0]) or
+                      batchSize + l0.f_size > consts.L1_BATCH_MAX_SIZE):
+            yield batch
+            batch = []
+            batchSize = 0
+        batch.append(l0)
+        batchSize += l0.f_size
+        if l0.streaming:
+            yield batch
+            batch = []
+            batchSize = 0
+    if batch:
+        yield batch
+
+
+def processL0(l0s, prefetcher=None):
+    """
+    Processes a batch of L0 files (see iterL0batches): fuses their data, appends it to the L1 files and moves the files
+    to the L0 folder.
+
+    Args:
+        l0s (list): The InfoFile of the L0 files, all of the same table and header.
+        prefetcher (SPTransfer.Prefetcher): If given, the L1 files are downloaded in the background and each L1 file
+            is waited for only before it is written. Otherwise, all of them are downloaded first.
+    """
+    elapsedTime1 = systemTools.ElapsedTime()
+    l0 = l0s[0]
+    names = ', '.join([item.pathFile.name for item in l0s])
+    log.live(f'>>>>>>>>>>>>>>>>>> {names} >>>>>>>>>>>>>>>>>>')
+
+    # the l0 dataframe is cleaned (if the frequency is correct and not an static table) and organized by the
+    # storage frequency. Big files are read by chunks, one day at a time
+    if l0.streaming:
+        gDF = l0.iterDays()
+    else:
+        # the first files go at the end, so on the duplicated timestamps they are kept like when the files were
+        # appended one by one to the L1 files
+        df = l0.df if len(l0s) == 1 else pd.concat([item.df for item in reversed(l0s)])
+        with Timing.span('fuse', rows=len(df)):
+            gDF = LibDataTransfer.fuseDataFrame(df, freq=l0.frequency, group=l0.st_fq, log=log).items()
+
+    # download the L1 files needed from SharePoint for the current files
+    if prefetcher is None:
+        download_SP_files(list(dict.fromkeys([path for item in l0s for path in item.pathL1])))
+    else:
+        prefetcher.prefetch(list(dict.fromkeys([path for item in l0s for path in item.pathL1])))
+    for idx, c_df in gDF:  # for each key, year or day, and its data. Each key is a stored or cloud file (L1 file)
+        if prefetcher is not None:
+            prefetcher.wait(l0.getL1paths(idx)[0])
+        processL1(l0, idx, c_df)
+
+    # move the L0 files to the corresponding folder
+    for item in l0s:
+        if item.pathTOA and item.pathTOA.is_file():
+            log.debug(f'Moving {item.pathTOA} to {item.pathL0TOA}')
+            LibDataTransfer.moveAfileWOOW(item.pathTOA, item.pathL0TOA)
+            if item.pathTOA == item.pathData:
+                Catalog.recordMove(item.pathTOA, item.pathL0TOA, log)
+
+        if item.pathTOB and item.pathTOB.is_file():
+            log.debug(f'Moving {item.pathTOB} to {item.pathL0TOB}')
+            LibDataTransfer.moveAfileWOOW(item.pathTOB, item.pathL0TOB)
+            if item.pathTOB == item.pathData:
+                Catalog.recordMove(item.pathTOB, item.pathL0TOB, log)
+    log.live(f'Total time for {len(l0s)} L0 files: {names}: {elapsedTime1.elapsed()}')
+    log.live(f'<<<<<<<<<<<<<<<<< {names} <<<<<<<<<<<<<<<<<<<')
+
+
+def getFileKey(file):
+    """
+    Returns the site, datalogger and table of a harvested file, e.g.: Bahada_CR3000_flux_20240101_000000. The table is
+    the one in the header of the file, because it is the one that sets the L1 files. The files with the same key write
+    to the same L1 files, so they must be processed one after the other.
+
+    Args:
+        file (Path): The L0 file.
+
+    Returns:
+        tuple: (site, datalogger, table), or the name of the file if it does not have that structure.
+    """
+    nameSplit = file.stem.split('_')
+    if len(nameSplit) <= consts.CS_FILE_NAME_TABLE + 2:
+        return (file.stem,)
+    table = '_'.join(nameSplit[consts.CS_FILE_NAME_TABLE:-2])
+    try:
+        with open(file, 'r', errors='ignore') as f:
+            nl = LibDataTransfer.getStrippedHeaderLine(f.readline().strip())
+        if len(nl) > consts.CS_FILE_METADATA['tableName']:
+            table = nl[consts.CS_FILE_METADATA['tableName']]
+    except OSError as e:
+        log.warn(f'Not possible to read the header of {file.name}: {e}')
+    return nameSplit[consts.CS_FILE_NAME_SITE], nameSplit[consts.CS_FILE_NAME_DATALOGGER], table
+
+
+def processFiles(key, files):
+    """
+    Worker of the process pool. Processes in order the files of the same site, datalogger and table, with its own log
+    file, also for the InfoFile of the files, so the logs of the workers do not interleave.
+
+    Args:
+        key (tuple): The key of the files, see getFileKey().
+        files (list): The L0 files.
+
+    Returns:
+        list: The spans of Timing of the files, they are added to the report of the main process.
+    """
+    global log, _workerLog_
+    log = Log.Log(path=consts.PATH_GENERAL_LOGS.joinpath(f'ECS_Process_L0_{"_".join(key)}.log'))
+    _workerLog_ = log  # the InfoFile of the worker write in its log, not in the files shared with the other workers
+    processTable(files, key)
+    Log.flush(close=True)  # the workers of the pool end without the atexit functions
+    return Timing.takeSpans()
+
+
+def processTable(files, key=None):
+    """
+    Processes in order the files of the same site, datalogger and table, by batches (see iterL0batches). With
+    consts.L1_PREFETCH, the L1 files are downloaded in the background while the L0 files are read.
+
+    Args:
+        files (list): The L0 files.
+        key (tuple): The key of the files, see getFileKey(). The spans of Timing are tagged with its site and table.
+    """
+    tags = {'site': key[0], 'table': key[2]} if key is not None and len(key) == 3 else {}
+    with Timing.context(**tags):
+        if not consts.L1_PREFETCH:
+            for l0s in iterL0batches(files):
+                processL0(l0s)
+            return
+        et = systemTools.ElapsedTime()
+        with SPTransfer.TransferPool(newSPClient, log=log) as pool:
+            # each L1 file is downloaded once, the next batches use the local file written by the previous ones
+            prefetcher = SPTransfer.Prefetcher(pool, lambda pf: downloadSPfile(pool, pf))
+            for l0s in iterL0batches(files, prefetcher):
+                processL0(l0s, prefetcher)
+            prefetcher.waitAll()  # the L1 files prefetched but not used
+        log.info(f'Time processing the files with the L1 files prefetched: {et.elapsed()}')
+
+
 def run():
     """
     Main function to process L0 files, update tables, and manage file transfers.
+    With more than one worker (consts.PROCESS_WORKERS or -w), the files of different sites and tables are processed at
+    the same time in a process pool.
     """
     # get the list of files in the folder
     files = [x for x in _PATH_DATA_2_PROCESS_.iterdir() if
@@ -326,139 +812,29 @@ def run():
     # rename the files
     files = getReadyFiles(files)
 
-    # process the files
-    for file in files:  # for each file in the collect folder
-        elapsedTime1 = systemTools.ElapsedTime()
-        log.live(f'>>>>>>>>>>>>>>>>>> {file.name} >>>>>>>>>>>>>>>>>>')
-        log.live(f'Processing L0 file: {file.name}')
-
-        # create the object that read the CS file (file Level 0) from fL0 get the related stored files and load them
-        # using InfoFile
-        l0 = InfoFile.InfoFile(file)
-        if not l0.ok():
-            log.error(f'The file {l0} is skiping because has problems.\n{l0.statusFile}')
-            continue
-
-        # the l0 dataframe is cleaned (if the frequency is correct and not an static table) and organized by the
-        # storage frequency
-        gDF = LibDataTransfer.fuseDataFrame(l0.df, freq=l0.frequency, group=l0.st_fq, log=log)
-
-        # created a list based on the storage frequency. If days, for ts, then each day is a key.
-        i_gDF = list(gDF.keys())
-
-        # download the L1 files needed from SharePoint for the current file
-        download_SP_files(l0.pathL1)
-        for idx_pL1 in range(
-                len(l0.pathL1)):  # for each stored or cloud file (L1 file) related to the current file, L0 file
-            fL1 = l0.pathL1[idx_pL1]
-            start2 = time.time()  # keep track of the time for each L1 file
-            createNewFile = False  # flag to create a new file
-            log.live(f'For {file.name}, processing L1 {fL1.name}')
-            l1 = InfoFile.InfoFile(fL1)  # get the info for the L1 file
-            idx = i_gDF.pop(0)  # get the first key, year or day, of the list that should be the oldest L1 file
-            c_df = gDF.pop(idx)  # get the dataframe for the oldest L1 file that is the key idx
-
-            # start the process to check the current L0 to be appended to the L1 file
-            if l1.ok():  # there is available L1 file for the current file (the L1 file exists and has data)
-
-                # compare headers of the current with any of the stored files
-                chFrom = list(set(l1.cs_headers) - set(l0.cs_headers))
-                chTo = list(set(l0.cs_headers) - set(l1.cs_headers))
-
-                if len(chFrom) > 0:  # there are changes. log the changes
-                    log.warn(f'For site {l1.f_site}, the table {l1.cs_tableName} changed from: "{chFrom}" to: "{chTo}"')
-
-                    if l1.numberColumns != l0.numberColumns:  # check NUMBER of columns
-                        log.warn(f'For site {l1.f_site}, the table {l1.cs_tableName} changed the number of columns '
-                                 f'from: "{l1.numberColumns}" to: "{l0.numberColumns}"')
-                        createNewFile = True
-
-                    if l1.colNames != l0.colNames:  # check columns NAMES
-                        a = set(l1.colNames) - set(l0.colNames)
-                        b = set(l0.colNames) - set(l1.colNames)
-                        log.warn(f'For site {l1.f_site}, the table {l1.cs_tableName} changed the columns names from: "'
-                                 f'{a}" to: "{b}"')
-                        createNewFile = True
-
-                    if l1.cs_signature != l0.cs_signature:
-                        log.warn(f'For site {l1.f_site}, the table {l1.cs_tableName} changed the signature from: "'
-                                 f'{l1.cs_signature}" to: "{l0.cs_signature}"')
-
-                    if l1.cs_serialNumber != l0.cs_serialNumber:
-                        log.warn(f'For site {l1.f_site}, the table {l1.cs_tableName} changed the serial number from: "'
-                                 f'{l1.cs_serialNumber}" to: "{l0.cs_serialNumber}"')
-
-                    if l1.cs_program != l0.cs_program:
-                        log.warn(f'For site {l1.f_site}, the table {l1.cs_tableName} changed the program from: "'
-                                 f'{l1.cs_program}" to: "{l0.cs_program}"')
-
-                    if l1.cs_os != l0.cs_os:
-                        log.warn(f'For site {l1.f_site}, the table {l1.cs_tableName} changed the OS from: "'
-                                 f'{l1.cs_os}" to: "{l0.cs_os}"')
-
-                if createNewFile:
-                    newName = LibDataTransfer.renameAFileWithDate(l1.pathFile, log)
-                    log.warn(f'For site {l1.f_site}, the file L1 {l1.pathFile.name} was renamed because the header '
-                             f'is different to L0. The new file name is: {newName.name}')
-                    l1.df = None
-                else:
-                    log.info(f'For site {l0.f_site}, the table {l0.cs_tableName} there is a L1 file named: '
-                             f'{l1.pathFile.name}')
-
-                # this section is for the header that is the same from the current to the stored file
-                # this line add the current data to the stored file, in other words, L0 is appended to L1
-                c_df = LibDataTransfer.fuseDataFrame(c_df, l1.df, freq=l0.frequency, group=l0.st_fq)
-                if len(c_df) > 1:
-                    log.error(f'For site {l0.f_site}, the table {l0.cs_tableName} on files {l0.pathFile.name} and '
-                              f'{l1.pathFile.name} have more than a set of data grouped on "{l0.st_fq}", {c_df.keys()}.'
-                              f' Skipped this file.')
-                    continue
-
-                if idx in c_df.keys():
-                    c_df = c_df.pop(idx)
-                else:
-                    log.error(f'!!!!!For site {l0.f_site}, the table {l0.cs_tableName} on files {l0.pathFile.name} and '
-                              f'{l1.pathFile.name} have different grouped ({l0.st_fq}) data {c_df.keys()}. Skipped this'
-                              f' file.')
-                    continue
-            else:  # there is not L1 file for the current file so creating a new one
-                log.info(f'For site {l0.f_site}, table {l0.cs_tableName} there is not L1 file. Creating: {fL1.name}')
-
-            if l0.hf:  # if high frequency data
-                startDate = c_df.index[0]
-                if startDate != startDate.floor(freq='D'):
-                    log.info(f'For site {l0.f_site}, table {l0.cs_tableName}: Is going to create flagged data from '
-                             'beginning of this day')
-                    c_df = LibDataTransfer.createFlaggedData(df=c_df, freq=consts.FREQ_10HZ, st_fq=consts.FREQ_DAILY)
-
-            # update the L1 resample files if needed
-            if l0.resample:
-                log.info(f'For site {l0.f_site}, table {l0.cs_tableName} resampling to {l0.resample}')
-                resampleDF = LibDataTransfer.resampleDataFrame(df=c_df, freq=l0.resample, method='last')
-                pathResample = l0.pathL1Resample[idx_pL1]
-                log.debug(f'For site {l0.f_site}, table {l0.cs_tableName} resampled saved to {pathResample}')
-                LibDataTransfer.writeDF2csv(pathFile=pathResample, dataframe=resampleDF, header=l0.cs_headers,
-                                            indexMapFunc=l0.metaTable['indexMapFunc'], log=log)
-
-            # write the data to a csv file that is L1
-            LibDataTransfer.writeDF2csv(pathFile=fL1, dataframe=c_df, header=l0.cs_headers,
-                                        indexMapFunc=l0.metaTable['indexMapFunc'], log=log)
-
-            end2 = time.time()
-            log.live(f'Total time for file L1: {fL1.name}: {end2 - start2:.2f} seconds')
+    # group the files by the L1 files they write to
+    groups = {}
+    for file in files:
+        groups.setdefault(getFileKey(file), []).append(file)
+    workers = min(_WORKERS_, len(groups))
 
-        # move the L0 files to the corresponding folder
-        if l0.pathTOA and l0.pathTOA.is_file():
-            log.debug(f'Moving {l0.pathTOA} to {l0.pathL0TOA}')
-            LibDataTransfer.moveAfileWOOW(l0.pathTOA, l0.pathL0TOA)
+    # process the files
+    if workers <= 1:
+        for key, groupFiles in groups.items():  # for each table, the batches of its files in the collect folder
+            processTable(groupFiles, key)
+    else:
+        log.live(f'Processing {len(files)} files of {len(groups)} tables with {workers} workers')
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(processFiles, key, groupFiles): key for key, groupFiles in groups.items()}
+            for future in as_completed(futures):
+                try:
+                    Timing.addSpans(future.result())
+                    log.live(f'Finished the files of {"_".join(futures[future])}')
+                except Exception as e:
+                    log.error(f'Error processing the files of {"_".join(futures[future])}: {e}')
 
-        if l0.pathTOB and l0.pathTOB.is_file():
-            log.debug(f'Moving {l0.pathTOB} to {l0.pathL0TOB}')
-            LibDataTransfer.moveAfileWOOW(l0.pathTOB, l0.pathL0TOB)
-        log.live(f'Total time for file L0: {file.name} {file.name}: {elapsedTime1.elapsed()}')
-        log.live(f'<<<<<<<<<<<<<<<<< {file.name} <<<<<<<<<<<<<<<<<<<')
     # move the files to the SharePoint
-    upload_SP_files()
+    upload_SP_files(reconcile=_RECONCILE_)
 
 
 if __name__ == '__main__':
@@ -468,3 +844,10 @@ if __name__ == '__main__':
     run()
     check_temp_backup()
     log.info(f'Total time for all the files: {elapsedTime.elapsed()}')
+    # the report with the time of each stage, site and table, it is uploaded with the logs by the next run
+    for stage in Timing.summary(by=('stage',)):
+        log.info(f'Stage {stage["stage"]}: {stage["seconds"]:.2f} seconds, {stage["count"]} times, {stage["rows"]} '
+                 f'rows, {systemTools.sizeof_fmt(stage["bytes"])}')
+    for pathReport in Timing.writeReport(log=log, workers=_WORKERS_, reconcile=_RECONCILE_,
+                                         pathData=_PATH_DATA_2_PROCESS_) or []:
+        Journal.markDirty(pathReport)
@@ -27,12 +27,16 @@
 #       the date, project, and site.
 #       genDataFrame(): Reads the file into a Pandas DataFrame, handles cleaning, and sets up fragmentation for large
 #       files.
-#       checkData(): Groups data by day and checks for missing data, logging the percentage of missing records.
+#       iterDays(): Streaming mode for big files, reads the file by chunks and yields the data of each day.
+#       readStore(): Reads a time window of the L1 column store of the 10 Hz tables (see ColumnStore).
+#       checkData(): Daily completeness of the data (see Completeness): missing percentage by day and column and the
+#       longest gap of each column, kept in completeness and saved as the QC sidecar of the file.
 #       setFragmentation(): Calculates fragmentation in the data file, useful for data integrity checks.
 #
 #   Logging:
 #       The class uses a Log object to log errors, warnings, and performance metrics (e.g., time taken to process a
-#       file, missing data).
+#       file, missing data). The times of the header scan, the read and the cleaning are also recorded as spans of
+#       Timing (header-scan, read_csv and clean) for the report of the run.
 #
 #   Error Handling:
 #       The class checks for missing files, empty files, mismatched column numbers, and other issues, terminating the
@@ -76,7 +80,12 @@ import consts
 import config
 import systemTools
 import LibDataTransfer
+import ReaderCambellsciData
+import ColumnStore
+import Catalog
+import Completeness
 import Log
+import Timing
 
 
 class InfoFile:
@@ -147,8 +156,13 @@ class InfoFile:
         Reads the file into a Pandas DataFrame, cleans the data, and handles large file fragmentation. Logs any issues
         found during data processing.
 
-    checkData(self):
-        Groups data by day, checks for missing data, and logs the percentage of missing records.
+    iterDays(self, chunkSize):
+        Streaming mode for big files. Reads the file by chunks and yields (key, DataFrame) for each day, so only about
+        a day of data is in memory.
+
+    checkData(self, df=None):
+        Computes the daily completeness of the data (missing percentage by day and column and the longest gap of each
+        column) and saves it as the QC sidecar of the file.
 
     setFragmentation(self):
         Analyzes the data file for fragmentation, useful for ensuring data integrity.
@@ -196,16 +210,20 @@ class InfoFile:
     pathTOA = None  # path of the current file in TOA5 format
     pathL0TOB = None  # storage path where the table will be saved in TOB1 format
     pathTOB = None  # path of the current file in TOB1 format
+    pathData = None  # path of the file that is read, pathTOA or pathTOB if the TOB is read without conversion
     pathL1Resample = []  # path for the resampled data
+    pathL1Store = []  # paths (folders) of the column store of each L1 file, see ColumnStore and config.COLUMN_STORE
     statusFile = None  # The file is OK
     pathLog = None  # path for the log
     log = None  # log object
+    _sharedLog_ = False  # the log was given by the caller, it is not replaced by the log of the table
     firstLineDT = None  # datetime object from first line of the file
     lastLineDT = None  # datetime object from last line of the file
     frequency = None  # frequency of the table
     st_fq = None  # frequency of the table on storage
     level = 0  # level of the file
     df = None
+    completeness = None  # report of the completeness of the data, see checkData()
     fragmentation = None
     _cleaned_ = False
     hf = False  # high frequency flag
@@ -214,8 +232,10 @@ class InfoFile:
     staticTable = False  # flag to indicate if the table is static or not
     metaTable = None  # metadata of the table from consts
     resample = False  # if string, then it is the frequency of the resample
+    streaming = False  # if True, the data is not loaded in df but read by chunks with iterDays()
+    prefetch = None  # callable called with the L1 paths before reading the data, e.g. to download them
 
-    def __init__(self, pathFileName, cleanDataFrame=True, rename=True):
+    def __init__(self, pathFileName, cleanDataFrame=True, rename=True, streaming=False, prefetch=None, log=None):
         """
         Initializes the InfoFile class with the given file path and optional parameters.
 
@@ -223,14 +243,24 @@ class InfoFile:
             pathFileName (str or Path): Path to the file to be processed.
             cleanDataFrame (bool): Whether to clean the data after loading into a DataFrame (default: True).
             rename (bool): Whether to rename the file during processing (default: True).
+            streaming (bool): Whether to read the data by chunks with iterDays() instead of loading the whole file
+                in df. Only used for tables stored in daily L1 files (default: False).
+            prefetch (callable): Called with the L1 paths from the timestamps of the header scan before the data is
+                read, so they can be downloaded while the file is parsed (default: None).
+            log (Log.Log): Log for all the messages, e.g. the log of a worker of ECS_Process_L0 so the processes do not
+                write in the same files. If None, InfoFile.log in consts.PATH_GENERAL_LOGS and then the log of the
+                table (default: None).
 
         Initializes class attributes such as file path, log, and metadata. It also checks for file existence
         and converts file format if necessary (e.g., TOB to TOA).
         """
         self.statusFile = consts.STATUS_FILE.copy()
         self._cleanDF_ = cleanDataFrame
+        self.streaming = streaming
+        self.prefetch = prefetch
         start_time = time.time()
-        self.log = Log.Log(path=consts.PATH_GENERAL_LOGS.joinpath('InfoFile.log'))
+        self._sharedLog_ = log is not None
+        self.log = log if self._sharedLog_ else Log.Log(path=consts.PATH_GENERAL_LOGS.joinpath('InfoFile.log'))
         if not isinstance(pathFileName, Path):
             self.pathFile = Path(pathFileName)
         else:
@@ -257,6 +287,7 @@ class InfoFile:
                 self.pathTOB = Path(paths['tobPath'])
             if paths['err'] is not None:
                 self.statusFile[paths['err']] = True
+            self.pathData = self.pathTOA if self.pathTOA is not None else self.pathTOB
         else:
             self.statusFile[consts.STATUS_FILE_NOT_EXIST] = True  # set missing file flag to statusFile
         self.metaTable = config.getTable(self.cs_tableName)  # get the metadata of the table
@@ -282,22 +313,22 @@ class InfoFile:
         if (self.statusFile[consts.STATUS_FILE_NOT_EXIST] or self.statusFile[consts.STATUS_FILE_EMPTY] or
             self.statusFile[consts.STATUS_FILE_NOT_HEADER] or self.statusFile[consts.STATUS_FILE_EXCEPTION_ERROR] or
             self.statusFile[consts.STATUS_FILE_UNKNOWN_FORMAT] or self.statusFile[consts.STATUS_FILE_NOT_READABLE] or
-            self.pathTOA is None):
+            self.pathData is None):
             self.log.error(f'The file: {self.pathFile} has problems to be read.\n{self.statusFile}')
             return
 
         # try:
 
         # check and set the file level
-        if self.pathTOA.suffix.lower() == '.csv':
+        if self.pathData.suffix.lower() == '.csv':
             self.level = 1
 
         # get the metadata from the file name
         # get the name of the file
-        fileName = self.pathTOA.stem
+        fileName = self.pathData.stem
 
         # get the extension of the file
-        self.f_ext = self.pathTOA.suffix
+        self.f_ext = self.pathData.suffix
 
         # split the name of the file
         fileNameSplit = fileName.split('_')
@@ -319,33 +350,35 @@ class InfoFile:
             self.pathLog = consts.PATH_CLOUD.joinpath(self.f_site_r, consts.ECS_NAME, 'logs', logName)
         elif consts.FILE_STRUCTURE_VERSION == 2:
             self.pathLog = consts.PATH_CLOUD.joinpath(self.f_site_r, self.f_project, 'logs', logName)
-        self.log = Log.Log(path=self.pathLog)
+        if not self._sharedLog_:
+            self.log = Log.Log(path=self.pathLog)
 
         # check if the fileNameSplit has more than 3 elements and if yes, get the date and time. Usually must be yes
         if len(fileNameSplit) > 3:
             self.f_nameDT = systemTools.getDT4Str(fileName[-15:])
 
         # get the creation date and time of the file
-        if self.pathTOA.exists():
-            self.f_size = self.pathTOA.stat().st_size
+        if self.pathData.exists():
+            self.f_size = self.pathData.stat().st_size
             self.statusFile[consts.STATUS_FILE_NOT_EXIST] = False
-            self.f_creationDT = datetime.fromtimestamp(self.pathTOA.stat().st_ctime)
+            self.f_creationDT = datetime.fromtimestamp(self.pathData.stat().st_ctime)
             if self.f_size > 1:
                 self.statusFile[consts.STATUS_FILE_OK] = True
             else:
                 self.statusFile[consts.STATUS_FILE_EMPTY] = True
-                self.log.error(f'{self.pathFile} ({self.pathTOA.name}) is empty')
+                self.log.error(f'{self.pathFile} ({self.pathData.name}) is empty')
                 self.terminate()
                 return
         else:
             self.statusFile[consts.STATUS_FILE_NOT_EXIST] = True
         if self.statusFile[consts.STATUS_FILE_NOT_EXIST] or not self.statusFile[consts.STATUS_FILE_OK]:
-            self.log.error(f'{self.pathFile} ({self.pathTOA.name}) does not exist or there is some problem with it')
+            self.log.error(f'{self.pathFile} ({self.pathData.name}) does not exist or there is some problem with it')
             self.terminate()
             return
 
         # get the metadata from the actual file
-        _meta_ = LibDataTransfer.getHeaderFLlineFile(self.pathTOA, self.log)
+        scanStart = time.time()
+        _meta_ = LibDataTransfer.getHeaderFLlineFile(self.pathData, self.log)
         self.cs_headers = _meta_['headers']
         self.colNames = LibDataTransfer.getStrippedHeaderLine(self.cs_headers[consts.CS_FILE_HEADER_LINE['FIELDS']])
         self.firstLineDT = _meta_['firstLineDT']
@@ -353,7 +386,7 @@ class InfoFile:
 
         # if the file is empty or has no headers, log the issue and terminate
         if len(self.cs_headers) == 0:
-            self.log.error(f'{self.pathFile} ({self.pathTOA.name}) has no headers or it is empty')
+            self.log.error(f'{self.pathFile} ({self.pathData.name}) has no headers or it is empty')
             self.statusFile[consts.STATUS_FILE_NOT_HEADER] = True
             self.terminate()
             return
@@ -368,6 +401,8 @@ class InfoFile:
         self.cs_program = nl[consts.CS_FILE_METADATA['program']]
         self.cs_signature = nl[consts.CS_FILE_METADATA['signature']]
         self.cs_tableName = nl[consts.CS_FILE_METADATA['tableName']]
+        Timing.record('header-scan', time.time() - scanStart, scanStart, site=self.f_site, table=self.cs_tableName,
+                      bytes=self.f_size, level=self.level)
         self.metaTable = config.getTable(self.cs_tableName)
         self.frequency = self.metaTable[config.FREQUENCY]  # 'frequency']
 
@@ -391,12 +426,16 @@ class InfoFile:
             self._cleanDF_ = False
             self.staticTable = True
 
+        # streaming is only for tables stored in daily files, otherwise one L1 file could be the whole data
+        if self.streaming and (self.staticTable or self.st_fq != consts.FREQ_DAILY):
+            self.streaming = False
+
         # check if the number of columns in the header and the first line are the same, if not, terminate
         if not self.staticTable and _meta_['lineNumCols'] != _meta_['headerNumCols']:
-            self.log.error(f'{self.pathTOA.name} has different number of columns in the header and the first line. '
+            self.log.error(f'{self.pathData.name} has different number of columns in the header and the first line. '
                            f'The number of columns in the header is {_meta_["headerNumCols"]} and in '
                            f'the first line is {_meta_["lineNumCols"]}. This file is going to be renamed and avoided')
-            nf = LibDataTransfer.renameAFileWithDate(self.pathTOA, log=self.log)
+            nf = LibDataTransfer.renameAFileWithDate(self.pathData, log=self.log)
             LibDataTransfer.moveAfileWOOW(nf, nf.parent.joinpath(f'{nf.name}.avoided'))
             self.statusFile[consts.STATUS_FILE_MISSMATCH_COLUMNS] = True
             self.terminate()
@@ -405,16 +444,27 @@ class InfoFile:
         # get the number of columns of the file
         self.numberColumns = _meta_['lineNumCols']
 
-        # get the number of lines of the file
-        if 'TOA' in self.cs_type:
-            self.numberLines = systemTools.rawincount(self.pathTOA) - len(consts.CS_FILE_HEADER_LINE) + 1
+        # get the number of lines of the file. For TOB files read directly it is known from the header scan, for TOA
+        # files it is taken from the data when it is read, so the file is not read again only to count the lines
+        self.numberLines = _meta_['numberLines']
 
         # get the L0 paths
         self._setL0paths_()
 
+        # the L1 paths from the first and last timestamps of the header scan, to get them while the data is read. The
+        # final paths are set from the data
+        if self.prefetch is not None and not self.staticTable and self.firstLineDT is not None and \
+                self.lastLineDT is not None:
+            self.prefetch(self._listL1paths_(self.firstLineDT, self.lastLineDT)[0])
+
         # get the actual data from the file
         self.genDataFrame()
 
+        # record the file in the catalog, so its header and time range are known without reading it
+        if not self.staticTable:
+            Catalog.recordFile(self.pathData, self.cs_headers, self.firstLineDT, self.lastLineDT, self.numberLines,
+                               level=self.level, site=self.f_site_r, project=self.f_project, log=self.log)
+
     # except Exception as e:
     #    exc_type, exc_obj, exc_tb = sys.exc_info()
     #    self.log.error(f'Exception in getInfoFileName: {e}, line {exc_tb.tb_lineno}\n{sys.exc_info()}')
@@ -452,14 +502,15 @@ class InfoFile:
         if version == 1:  # old file structure version, not anymore used
             basePath = consts.PATH_CLOUD.joinpath(self.f_site_r, consts.ECS_NAME, folderName, year, 'Raw_Data')
             self.pathL0TOA = basePath.joinpath(consts.ST_NAME_TOA, month, day, filenameTOA)
-            if self.metaTable[config.SAVE_L0_TOB]:
+            if self.metaTable[config.SAVE_L0_TOB] or self.pathTOA is None:
                 self.pathL0TOB = basePath.joinpath(consts.ST_NAME_TOB, month, day, filenameTOB)
             else:
                 self.pathL0TOB = None
         elif version == 2:
             basePath = consts.PATH_CLOUD.joinpath(self.f_site_r, project, consts.L0, folderName, year, month, day)
             self.pathL0TOA = basePath.joinpath(filenameTOA)
-            if self.metaTable[config.SAVE_L0_TOB]:
+            # the TOB is the only L0 copy when it was read without conversion, so it is always kept
+            if self.metaTable[config.SAVE_L0_TOB] or self.pathTOA is None:
                 self.pathL0TOB = basePath.joinpath(filenameTOB)
             else:
                 self.pathL0TOB = None
@@ -470,61 +521,135 @@ class InfoFile:
 
         This method determines the storage paths for processed (L1) data, generating paths for both the main
         L1 data and any resampled versions, based on the file's metadata and timestamps.
+        In streaming mode there is no dataframe, so the first and last timestamps from the header scan are used.
         """
 
+        if self.streaming:
+            if self.firstLineDT is None or self.lastLineDT is None:
+                self.log.warn(f'No first and last timestamps available to set the L1 paths')
+                return
+
         # check if the dataframe is empty, if yes, return
-        if self.df is None or len(self.df) == 0:
+        elif self.df is None or len(self.df) == 0:
             self.log.warn(f'No dataframe available, please run genDataFrame()')
             return
 
         # set the first and last line of the dataframe
-        try:
-            self.firstLineDT = self.df.index[0]
-            self.lastLineDT = self.df.index[-1]
-        except Exception as e:
-            self.log.error(f'in _setL1paths_ when try to read from df the first and last line, looks like no data {e}')
-            self.log.error(f'{self.df}')
-            return
+        else:
+            try:
+                self.firstLineDT = self.df.index[0]
+                self.lastLineDT = self.df.index[-1]
+            except Exception as e:
+                self.log.error(f'in _setL1paths_ when try to read from df the first and last line, looks like no data '
+                               f'{e}')
+                self.log.error(f'{self.df}')
+                return
 
-        filenameCSV = []
-        filenameCSV_res = []
-        self.pathL1 = []
-        self.pathL1Resample = []
+        self.pathL1, self.pathL1Resample, self.pathL1Store = self._listL1paths_(self.firstLineDT, self.lastLineDT)
 
-        # get metadata from config.py
-        tableName = self.metaTable[config.L1_FILE_NAME]
-        folderName = self.metaTable[config.L1_FOLDER_NAME]
-        project = self.f_project
+    def _listL1paths_(self, firstDT, lastDT):
+        """
+        Returns the L1 paths, the L1 resampled paths and the L1 column store paths of the years or days between two
+        timestamps.
+
+        Args:
+            firstDT (datetime): The first timestamp.
+            lastDT (datetime): The last timestamp.
+
+        Returns:
+            tuple: (pathL1, pathL1Resample, pathL1Store), three lists.
+        """
+        pathsL1, pathsL1Resample, pathsL1Store = [], [], []
 
         # file name for yearly data to store
         if self.st_fq == consts.FREQ_YEARLY:
-            years = range(self.firstLineDT.year, self.lastLineDT.year + 1)
-            for year in years:
-                filenameCSV.append([f'{self.f_site_r}_{project}_{tableName}_{consts.L1}_{year}.csv', year])
-                filenameCSV_res.append([f'{self.f_site_r}_{project}_{tableName}_{consts.L1}_{year}_1min.csv', year])
+            dts = [datetime(year, 1, 1) for year in range(firstDT.year, lastDT.year + 1)]
 
         # file name for high frequency data to store, daily
         elif self.st_fq == consts.FREQ_DAILY:
-            fdt = self.firstLineDT.replace(hour=0, minute=0, second=0, microsecond=0)
-            ldt = self.lastLineDT.replace(hour=23, minute=59)
-            days = range((ldt - fdt).days + 1)
-            for item in days:
-                dtItem = fdt + timedelta(days=item)
-                dtItemStr = dtItem.strftime(consts.TIMESTAMP_FORMAT_DAILY)
-                filenameCSV.append([f'{self.f_site_r}_{project}_{tableName}_{consts.L1}_{dtItemStr}.csv', dtItem.year])
-                filenameCSV_res.append([f'{self.f_site_r}_{project}_{tableName}_{consts.L1}_{dtItemStr}_1min.csv',
-                                        dtItem.year])
+            fdt = firstDT.replace(hour=0, minute=0, second=0, microsecond=0)
+            ldt = lastDT.replace(hour=23, minute=59)
+            dts = [fdt + timedelta(days=item) for item in range((ldt - fdt).days + 1)]
+        else:
+            dts = []
+
+        for dtItem in dts:
+            pathL1, pathL1Resample, pathL1Store = self._getL1paths_(dtItem)
+            pathsL1.append(pathL1)
+            pathsL1Resample.append(pathL1Resample)
+            pathsL1Store.append(pathL1Store)
+        return pathsL1, pathsL1Resample, pathsL1Store
+
+    def _getL1paths_(self, dtItem):
+        """
+        Returns the L1 path, the L1 resampled path and the L1 column store path for the year or the day of dtItem.
+
+        Args:
+            dtItem (datetime): Any datetime of the year (yearly storage) or of the day (daily storage).
+
+        Returns:
+            tuple: (pathL1, pathL1Resample, pathL1Store), pathL1Store is None if the table has no column store.
+        """
+        # get metadata from config.py
+        tableName = self.metaTable[config.L1_FILE_NAME]
+        folderName = self.metaTable[config.L1_FOLDER_NAME]
+        project = self.f_project
 
         # path data structure
         basePath = consts.PATH_CLOUD.joinpath(self.f_site_r, project, consts.L1, folderName)
-        if self.st_fq == consts.FREQ_YEARLY:
-            for item in filenameCSV:
-                self.pathL1.append(basePath.joinpath(item[0]))
-        elif self.st_fq == consts.FREQ_DAILY:
-            for item in filenameCSV:
-                self.pathL1.append(basePath.joinpath(str(item[1]), item[0]))
-        for item in filenameCSV_res:
-            self.pathL1Resample.append(basePath.joinpath(f'{item[1]}_1min', item[0]))
+        if self.st_fq == consts.FREQ_DAILY:
+            dtItemStr = dtItem.strftime(consts.TIMESTAMP_FORMAT_DAILY)
+            filename = f'{self.f_site_r}_{project}_{tableName}_{consts.L1}_{dtItemStr}'
+            pathL1 = basePath.joinpath(str(dtItem.year), f'{filename}.csv')
+        else:
+            filename = f'{self.f_site_r}_{project}_{tableName}_{consts.L1}_{dtItem.year}'
+            pathL1 = basePath.joinpath(f'{filename}.csv')
+        pathL1Resample = basePath.joinpath(f'{dtItem.year}_1min', f'{filename}_1min.csv')
+        pathL1Store = None
+        if self.metaTable[config.COLUMN_STORE]:
+            # local, the files in PATH_CLOUD are uploaded and moved
+            pathL1Store = consts.PATH_L1_STORE.joinpath(self.f_site_r, project, consts.L1, folderName,
+                                                        str(dtItem.year), filename)
+        return pathL1, pathL1Resample, pathL1Store
+
+    def getL1paths(self, key):
+        """
+        Returns the L1 path, the L1 resampled path and the L1 column store path for a key of the dict returned by
+        LibDataTransfer.fuseDataFrame(group=self.st_fq), e.g.: '20240101_0000' for daily or '2024' for yearly files.
+
+        Args:
+            key (str): The day or year key.
+
+        Returns:
+            tuple: (pathL1, pathL1Resample, pathL1Store)
+        """
+        if self.st_fq == consts.FREQ_DAILY:
+            return self._getL1paths_(datetime.strptime(key, consts.TIMESTAMP_FORMAT_DAILY))
+        return self._getL1paths_(datetime.strptime(key, consts.TIMESTAMP_FORMAT_YEARLY))
+
+    def readStore(self, start, end, columns=None):
+        """
+        Reads a time window of the L1 column store of the table (see ColumnStore), of any day and not only of the days
+        of this file. Only the rows and columns of the window are read from the disk.
+
+        Args:
+            start (datetime): The first timestamp of the window.
+            end (datetime): The last timestamp of the window.
+            columns (list): The names of the columns, all of them if None.
+
+        Returns:
+            pd.DataFrame: The data of the window, or None if the table has no column store or there is no data.
+        """
+        if not self.metaTable[config.COLUMN_STORE]:
+            return None
+        start = pd.Timestamp(start)
+        end = pd.Timestamp(end)
+        if self.st_fq == consts.FREQ_DAILY:
+            dts = pd.date_range(start.floor(consts.FREQ_DAILY), end, freq=consts.FREQ_DAILY)
+        else:
+            dts = [datetime(year, 1, 1) for year in range(start.year, end.year + 1)]
+        return ColumnStore.readWindow([self._getL1paths_(dtItem)[2] for dtItem in dts], start, end, columns,
+                                      log=self.log)
 
     def genDataFrame(self):
         """
@@ -534,28 +659,46 @@ class InfoFile:
         file type (e.g., TOA5 format, handling flagged data, and fragmentation).
 
         It cleans the data if necessary, generates fragmentation details, and sets the paths for L1 data storage.
+        A L1 file written clean by the pipeline (see Catalog.getNormalized) is not cleaned again.
         Logs the time taken to process the file and any errors encountered.
         """
         self.log.live(f'Generating DataFrame for {self.pathFile.stem}')
         start_time = time.time()
 
-        # check if the file to read is a static table, if not use this one, else use the other one
-        # then read the TOA file
-        if self.staticTable:
-            self.df = pd.read_csv(self.pathTOA, header=None, skiprows=len(consts.CS_FILE_HEADER_LINE) - 1, index_col=0,
-                                  keep_default_na=False, names=self.colNames, parse_dates=True, date_format='mixed')
-        else:
-            self.df = pd.read_csv(self.pathTOA, header=None, skiprows=len(consts.CS_FILE_HEADER_LINE) - 1, index_col=0,
-                                  na_values=[consts.FLAG, "NAN"], names=self.colNames, parse_dates=True,
-                                  date_format='mixed')
-        self._cleaned_ = False
+        # in streaming mode the data is read later by chunks with iterDays(), only the L1 paths are needed now
+        if self.streaming:
+            self.df = None
+            self._setL1paths_()
+            self.log.live(f'Streaming mode, the data of {self.pathFile.stem} will be read by chunks of '
+                          f'{consts.STREAMING_CHUNK_ROWS} rows')
+            return
 
-        # set the fragmentation of the file and set the frequency
-        self.setFragmentation()
+        with Timing.span('read_csv', site=self.f_site, table=self.cs_tableName, bytes=self.f_size,
+                         level=self.level) as span:
+            self.df = self._readData_()
+            span['rows'] = 0 if self.df is None else len(self.df)
+        self._cleaned_ = False
+        if self.numberLines is None and self.df is not None:
+            self.numberLines = len(self.df)
+
+        # a L1 file written by the pipeline is already clean (see Catalog.getNormalized), only its frequency is set
+        normalized = None
+        if self.level == 1 and consts.L1_NORMALIZED and not self.staticTable and self.df is not None:
+            normalized = Catalog.getNormalized(self.pathFile)
+        if normalized is not None:
+            self.log.debug(f'{self.pathFile.name} was written clean with frequency {normalized}, it is not cleaned')
+            self.frequency = normalized
+            self.setStorageFrequency()
+            self._cleaned_ = True
+            if self._cleanDF_:
+                self.checkData()
+        else:
+            # set the fragmentation of the file and set the frequency
+            self.setFragmentation()
 
-        # clean the dataframe by removing the flagged data
-        if self._cleanDF_:
-            self.cleanDataFrame()
+            # clean the dataframe by removing the flagged data
+            if self._cleanDF_:
+                self.cleanDataFrame()
 
         # set the paths for the L1 data
         self._setL1paths_()
@@ -564,36 +707,164 @@ class InfoFile:
         self.log.live(f'DataFrame generated in {end_time - start_time:.2f} seconds from a '
                       f'{systemTools.sizeof_fmt(self.f_size)} file')
 
-    def checkData(self):
+    def _readData_(self, chunkSize=None):
         """
-        Checks for missing data by grouping the data per day and calculating the percentage of missing records.
+        Reads the data of the file, the TOA file or the TOB file if it was not converted.
 
-        This method checks each day’s data in the DataFrame and logs the percentage of missing records. It calculates
-        the total expected records per day based on the file's frequency and number of columns.
+        Args:
+            chunkSize (int): If None the whole file is read, otherwise the number of rows of each chunk (for TOB files
+                the chunks are of ReaderCambellsciData.CHUNK_SIZE bytes).
+
+        Returns:
+            pd.DataFrame or iterator: The data of the file, or an iterator of DataFrames if chunkSize is given.
         """
-        name: datetime
+        # a L1 file written by LibDataTransfer.writeDF2csv has a columnar sidecar, it is read if it is still valid
+        if self.level == 1 and consts.L1_SIDECAR and not self.staticTable and chunkSize is None:
+            df = LibDataTransfer.readSidecar(self.pathData, header=self.cs_headers, log=self.log)
+            if df is not None and list(df.columns) == self.colNames[1:]:
+                df.index.name = self.colNames[0]
+                self.log.debug(f'Data of {self.pathData.name} read from its sidecar')
+                return df
+
+        # read the TOA file, the flags are kept for static tables. A TOB file without TOA is decoded directly
+        if self.pathTOA is None:
+            if chunkSize is None:
+                return ReaderCambellsciData.readTOB(self.pathTOB, staticTable=self.staticTable, log=self.log)
+            return ReaderCambellsciData.iterTOB(self.pathTOB, staticTable=self.staticTable, log=self.log)
+        return ReaderCambellsciData.readTOA5(self.pathTOA, self.colNames, staticTable=self.staticTable,
+                                             chunkSize=chunkSize, log=self.log)
+
+    def iterDays(self, chunkSize=consts.STREAMING_CHUNK_ROWS):
+        """
+        Reads the file by chunks and yields the data of each day, cleaned and with the frequency set. A day is yielded
+        as soon as a chunk with data of a later day is read, so the caller can finish the L1 file of that day before
+        the next chunk is read and only about one day of data is in memory.
+
+        Args:
+            chunkSize (int): Number of rows read on each chunk (default: consts.STREAMING_CHUNK_ROWS).
+
+        Yields:
+            tuple: (key, pd.DataFrame), the key is the same day key used by LibDataTransfer.fuseDataFrame(group='D'),
+                e.g. '20240101_0000'. If there are rows out of order, a day could be yielded more than once.
+        """
+        start_time = time.time()
+        pending = None
+        numRows = 0
+        firstChunk = True
+        self.completeness = None
+        for chunk in self._readData_(chunkSize):
+            numRows += len(chunk)
+            if pending is not None:
+                chunk = pd.concat([pending, chunk])
+            if len(chunk) == 0:
+                continue
+            if firstChunk:  # set the frequency with the first chunk
+                self.setFragmentation(chunk)
+                firstChunk = False
+            # the last day of the chunk could continue in the next chunk
+            lastDay = chunk.index.max().floor(consts.FREQ_DAILY)
+            pending = chunk[chunk.index >= lastDay]
+            yield from self._fuseDays_(chunk[chunk.index < lastDay])
+        if pending is not None:
+            yield from self._fuseDays_(pending)
+        if self.numberLines is None:
+            self.numberLines = numRows
+        if not self.staticTable:
+            self._logCompleteness_()
+            self._writeQC_()
+        self.log.live(f'Streamed {numRows} rows in {time.time() - start_time:.2f} seconds from a '
+                      f'{systemTools.sizeof_fmt(self.f_size)} file')
 
-        # clean dataframe if not cleaned
+    def _fuseDays_(self, df):
+        """
+        Cleans and groups by day the data of a chunk, see iterDays().
+
+        Args:
+            df (pd.DataFrame): The data of one or more complete days.
+
+        Yields:
+            tuple: (key, pd.DataFrame) of each day.
+        """
+        if len(df) == 0:
+            return
+        freq = self.frequency if self._cleanDF_ else None
+        with Timing.span('clean', site=self.f_site, table=self.cs_tableName, rows=len(df), level=self.level):
+            days = LibDataTransfer.fuseDataFrame(df, freq=freq, group=consts.FREQ_DAILY, log=self.log)
+        for key, dfDay in days.items():
+            if not self.staticTable:
+                self.checkData(dfDay)
+            yield key, dfDay
+
+    def checkData(self, df=None):
+        """
+        Computes the daily completeness of the data with one pass over it (see Completeness): the percentage of missing
+        values by day and column and the longest gap of each column. The report is kept in completeness and, for the
+        whole data, summarized in one line of the log and saved as the QC sidecar of a L0 file. The QC sidecar of a L1
+        file is written by LibDataTransfer.writeDF2csv, the report of a L1 file that did not change since then is read
+        from the sidecar instead.
+
+        Args:
+            df (pd.DataFrame): The data to check, if None the DataFrame of the file, cleaned first if needed. Otherwise
+                a part of the data (e.g. a day in streaming mode), its report is added to completeness.
+
+        Returns:
+            pd.DataFrame: The report of the data checked, or None if there is no data.
+        """
+        if df is not None:
+            report = Completeness.dailyCompleteness(df)
+            self.completeness = Completeness.combine([self.completeness, report])
+            return report
+
+        # clean dataframe if not cleaned, the data is checked when it is cleaned
         if self._cleaned_ is False:
             self.cleanDataFrame()
-        totalRecordsPerDay = pd.Timedelta(days=1) / self.frequency * (self.numberColumns - 1)
-        for name, group in self.df.groupby(pd.Grouper(freq='D')):
-            missing = group.isna().sum().sum()
-            if missing > (self.numberColumns - 1):
-                self.log.info(
-                    f'On {name.strftime("%Y-%m-%d")} were {missing} missing records ({missing / totalRecordsPerDay * 100:.2f}%)')
+            return self.completeness
+        if self.level == 1 and consts.QC_SIDECAR:
+            report = Completeness.readQC(self.pathFile, log=self.log)
+            if report is not None:
+                self.log.debug(f'Completeness of {self.pathFile.name} read from its QC sidecar')
+                self.completeness = report
+                return report
+        self.completeness = Completeness.dailyCompleteness(self.df)
+        self._logCompleteness_()
+        self._writeQC_()
+        return self.completeness
+
+    def _logCompleteness_(self):
+        """
+        Logs one line with the days with missing data, the worst day and the longest gap of the report of completeness.
+        """
+        msg = Completeness.summary(self.completeness)
+        if msg is not None:
+            self.log.info(f'{self.pathFile.name}: {msg}')
 
-    def setFragmentation(self):
+    def _writeQC_(self):
+        """
+        Saves the report of completeness of a L0 file as the QC sidecar of the file in its L0 folder. The QC sidecars of
+        the L1 files are written with the data by LibDataTransfer.writeDF2csv.
+        """
+        if not consts.QC_SIDECAR or self.completeness is None or self.level == 1:
+            return
+        if self.pathL0TOA is not None:
+            Completeness.writeQC(self.pathL0TOA, self.completeness, pathSource=self.pathFile, log=self.log)
+
+    def setFragmentation(self, df=None):
         """
         Analyzes the file's data to determine fragmentation and sets the appropriate storage frequency.
 
+        Args:
+            df (pd.DataFrame): The data to analyze, if None the DataFrame of the file. In streaming mode it is the
+                first chunk.
+
         This method checks the DataFrame for fragmented data and determines the file's frequency. It then updates
         the `st_fq` attribute with the correct storage frequency based on the data fragmentation.
         """
-        if self.df is None:
+        if df is None:
+            df = self.df
+        if df is None:
             self.log.warn(f'No dataframe available, please run genDataFrame()')
             return
-        self.fragmentation = LibDataTransfer.getFragmentation4DF(self.df)
+        self.fragmentation = LibDataTransfer.getFragmentation4DF(df)
 
         if self.fragmentation is not None:
             self.fragmentation.index.rename('fragmentation', inplace=True)
@@ -635,11 +906,12 @@ class InfoFile:
             return
         self.log.live(f'Cleaning DataFrame for {self.pathFile.stem}')
         start_time = time.time()
-        ddf = LibDataTransfer.fuseDataFrame(self.df, freq=self.frequency, group=None, log=self.log)
-        self.df = ddf.pop(None)
-        self._cleaned_ = True
-        if not self.staticTable:
-            self.checkData()
+        with Timing.span('clean', site=self.f_site, table=self.cs_tableName, rows=len(self.df), level=self.level):
+            ddf = LibDataTransfer.fuseDataFrame(self.df, freq=self.frequency, group=None, log=self.log)
+            self.df = ddf.pop(None)
+            self._cleaned_ = True
+            if not self.staticTable:
+                self.checkData()
         end_time = time.time()
         self.log.live(f'DataFrame cleaned in {end_time - start_time:.2f} seconds')
 
@@ -710,10 +982,10 @@ class InfoFile:
     def __repr__(self):
         if self.pathFile is None:
             return 'No file'
-        elif self.pathTOA is None:
+        elif self.pathData is None:
             return f'{self.pathFile} (Not available TOA file)'
         else:
-            return f'{self.pathFile} ({self.pathTOA.name})'
+            return f'{self.pathFile} ({self.pathData.name})'
 
 
 if __name__ == '__main__':
@@ -0,0 +1,91 @@
+# -------------------------------------------------------------------------------
+# Name:        Journal
+# Purpose:     Append-only journal of the files written in consts.PATH_CLOUD, so the upload to SharePoint only looks at
+#              the files touched since the last upload instead of walking the whole cloud folder
+#
+# Author:      Gesuri
+#
+# Created:     October 17, 2026
+# Copyright:   (c) Gesuri 2026
+# Licence:     Apache 2.0
+# -------------------------------------------------------------------------------
+
+# upload_SP_files used to walk consts.PATH_CLOUD with rglob('*') and stat every file to find the ones modified in the
+#   last days. With years of daily files the walk alone takes minutes. The functions that write in PATH_CLOUD
+#   (LibDataTransfer.writeDF2csv/appendDF2csv/moveAfileWOOW/renameAFileWithDate, ColumnStore.writeDay and Log) mark
+#   the files as dirty, and upload_SP_files takes the dirty files. The full walk is only done in reconcile mode (-r).
+#
+# 1. Files in consts.PATH_UPLOAD_JOURNAL (a folder):
+#   'dirty_<pid>.txt': one line per file written by the process pid, each file once. Each process of the pool has its
+#       own file, so the processes do not write the same file.
+#   'dirty_<pid>_<uuid>.taken': the journals taken by an upload, each one with a new name, so a journal left by an
+#       interrupted upload is not replaced when the pid is used again. They are removed when the upload finishes, so if
+#       the upload is interrupted they are taken again by the next one.
+#
+# 2. Functions:
+#   'markDirty(pathFile)': Add the file to the journal of the process if it is in PATH_CLOUD.
+#   'takeDirty()': Return the dirty files of all the journals and mark the journals as taken.
+#   'doneDirty(failed=None)': Remove the taken journals, the files that failed are marked as dirty again.
+
+import os
+import threading
+import uuid
+from pathlib import Path
+
+import consts
+
+_seen_ = set()  # files already in the journal of this process
+_lock_ = threading.Lock()
+
+
+def _cloudPath_(pathFile):
+    """ Return the path of the file relative to consts.PATH_CLOUD as a path in PATH_CLOUD, or None if it is not in it """
+    try:
+        return consts.PATH_CLOUD.joinpath(Path(pathFile).resolve().relative_to(consts.PATH_CLOUD.resolve()))
+    except ValueError:
+        return None
+
+
+def markDirty(pathFile):
+    """ Add the file to the journal of the process if it is in PATH_CLOUD and it is not there yet """
+    if not consts.UPLOAD_JOURNAL:
+        return
+    with _lock_:
+        if pathFile in _seen_:
+            return
+        _seen_.add(pathFile)
+        pathCloud = _cloudPath_(pathFile)
+        if pathCloud is None:
+            return
+        try:
+            consts.PATH_UPLOAD_JOURNAL.mkdir(parents=True, exist_ok=True)
+            with open(consts.PATH_UPLOAD_JOURNAL.joinpath(f'dirty_{os.getpid()}.txt'), 'a') as f:
+                f.write(f'{pathCloud}\n')
+        except OSError as e:  # the reconcile mode uploads it anyway
+            print(f'<Journal> Not possible to add {pathCloud} to the journal: {e}')
+
+
+def takeDirty():
+    """ Return the files of all the journals (also the ones taken by an upload that did not finish) that still exist,
+     each one once. The journals are marked as taken, the new writes go to new journals """
+    with _lock_:
+        _seen_.clear()
+        if not consts.PATH_UPLOAD_JOURNAL.is_dir():
+            return []
+        for item in consts.PATH_UPLOAD_JOURNAL.glob('dirty_*.txt'):
+            item.replace(item.with_name(f'{item.stem}_{uuid.uuid4().hex}.taken'))
+        files = {}
+        for item in sorted(consts.PATH_UPLOAD_JOURNAL.glob('dirty_*.taken')):
+            with open(item, 'r') as f:
+                files.update({Path(line.strip()): None for line in f if line.strip()})
+    return [item for item in files if item.is_file()]
+
+
+def doneDirty(failed=None):
+    """ Remove the taken journals, the failed files are marked as dirty again for the next upload """
+    with _lock_:
+        if consts.PATH_UPLOAD_JOURNAL.is_dir():
+            for item in consts.PATH_UPLOAD_JOURNAL.glob('dirty_*.taken'):
+                item.unlink()
+    for item in failed or []:
+        markDirty(item)
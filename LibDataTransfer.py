@@ -34,6 +34,7 @@
 #
 # 4. MD5 Functions:
 #   'md5_for_file(path, block_size=256 * 128, hr=False)': Computes the MD5 hash of a file.
+#   'hashFile(path, block_size=HASH_BLOCK_SIZE)': Computes the BLAKE2b hash of the content of a file, by blocks.
 #   'checkMD5onZipFile(tempFolder, logFolder, compressedFile)': Checks the MD5 hash of files within a ZIP archive and
 #       logs any files with incorrect hashes.
 #   'createMD5file(localFolder)': Creates a file in the specified folder containing the MD5 hash of each file in
@@ -96,8 +97,19 @@ quoted strings.
 
 ---
 
+#### **`getLastLine(f, blockSize=SCAN_BLOCK_SIZE)`**
+- **Purpose**: Returns the last line of a file reading it backwards by blocks, so only the end of the file is read.
+- **Parameters**:
+  - `f (file)`: A file opened in binary mode.
+  - `blockSize (int)`: Bytes read on each step.
+- **Returns**: The last line as bytes, without the end of line.
+
+---
+
 #### **`getHeaderFLlineFile(pathFileName, log=None)`**
-- **Purpose**: Extracts file metadata, including headers and the first and last timestamps, from a file.
+- **Purpose**: Extracts file metadata, including headers and the first and last timestamps, from a file. Only the
+header, the first line and the end of the file are read. The number of lines is not counted (`None`) for TOA5 files,
+it is taken from the data when the file is read.
 - **Parameters**:
   - `pathFileName (str)`: The path to the file.
   - `log (Log)`: Optional logging object.
@@ -133,19 +145,51 @@ quoted strings.
 
 #### **`fuseDataFrame(df1, df2=None, freq=None, group=None, log=None, keep='last', maxNumYears=1)`**
 - **Purpose**: Combines two dataframes (`df1` and `df2`), removes duplicates, resamples them based on frequency, and
-groups data (daily or yearly).
+groups data (daily or yearly). If both are sorted without duplicated index they are merged with `mergeSorted`,
+otherwise the concatenation is sorted.
 - **Parameters**:
   - `df1 (pd.DataFrame)`: First dataframe.
   - `df2 (pd.DataFrame)`: Second dataframe (optional).
   - `freq (str)`: Resampling frequency.
   - `group (str)`: Whether to group by day or year.
   - `log (Log)`: Optional logging object.
-  - `keep (str)`: How to handle duplicate rows (`'last'` or `'first'`).
+  - `keep (str)`: Row to keep of the duplicated rows with the same number of non-NaN values (`'last'` or `'first'`).
   - `maxNumYears (int)`: Maximum number of years to retain in the dataframe.
 - **Returns**: A dictionary of grouped dataframes.
 
 ---
 
+#### **`isSortedUnique(index)`**
+- **Purpose**: Checks if an index is sorted and without duplicated values, without sorting it.
+- **Parameters**:
+  - `index (pd.Index)`: Index of a dataframe.
+- **Returns**: `True` if it is sorted and without duplicated values.
+
+---
+
+#### **`mergeSorted(df1, df2, keep='last')`**
+- **Purpose**: Merges two dataframes sorted and without duplicated index, the same than sorting their concatenation and
+`dropDuplicatedIndex`. If their time ranges do not overlap they are concatenated in order, otherwise only the rows of
+the overlap are sorted and deduplicated. Used by `fuseDataFrame`, so adding new data to a yearly L1 file does not sort
+the whole year.
+- **Parameters**:
+  - `df1 (pd.DataFrame)`: First dataframe, its rows go first on duplicated index.
+  - `df2 (pd.DataFrame)`: Second dataframe.
+  - `keep (str)`: Row to keep when several rows have the same number of non-NaN values (`'last'` or `'first'`).
+- **Returns**: The merged dataframe.
+
+---
+
+#### **`dropDuplicatedIndex(df, keep='last')`**
+- **Purpose**: Removes the duplicated index of a sorted dataframe, keeping the row with more non-NaN values. Vectorized
+replacement of `groupby(index).apply(custom_keep)` used by `fuseDataFrame`.
+- **Parameters**:
+  - `df (pd.DataFrame)`: Dataframe sorted by index.
+  - `keep (str)`: Row to keep when several rows have the same number of non-NaN values (`'last'` or `'first'`).
+- **Returns**: The dataframe without duplicated index.
+
+---
+
 #### **`datetime_format_HF(dt)`**
 - **Purpose**: Returns a datetime string formatted for high-frequency data (10Hz) in Campbell Scientific logger files.
 - **Parameters**:
@@ -163,6 +207,18 @@ groups data (daily or yearly).
 
 ---
 
+#### **`datetime_format_HF_index(index)` and `datetime_format_index(index, numDec=1)`**
+- **Purpose**: Vectorized versions of `datetime_format_HF` and `datetime_format`, they return the same strings for a
+whole `DatetimeIndex`. The date and time up to the minutes is formatted once per minute.
+- **Parameters**:
+  - `index (pd.DatetimeIndex)`: Index to format.
+  - `numDec (int)`: Number of decimal places.
+- **Returns**: An index of strings.
+- **Note**: Use them, or any function marked with `vectorizedIndexMap(func)`, in `config.INDEX_MAP_FUNC` so
+`writeDF2csv` formats the index at once instead of value by value.
+
+---
+
 #### **`boolean_format(value)`**
 - **Purpose**: Formats a boolean value as 'TRUE' or 'FALSE' for the Campbell Scientific logger.
 - **Parameters**:
@@ -187,7 +243,7 @@ groups data (daily or yearly).
 
 ---
 
-#### **`writeDF2csv(pathFile, dataframe, header=None, indexMapFunc=None, overwrite=False, log=None)`**
+#### **`writeDF2csv(pathFile, dataframe, header=None, indexMapFunc=None, overwrite=False, normalized=None, log=None)`**
 - **Purpose**: Writes a dataframe to a CSV file with a multi-line header and handles optional file renaming and
 overwriting.
 - **Parameters**:
@@ -196,7 +252,49 @@ overwriting.
   - `header (list)`: List of header lines.
   - `indexMapFunc (callable)`: Function to format the index.
   - `overwrite (bool)`: Whether to overwrite the existing file.
+  - `normalized`: The frequency of the data if it is already clean (fused with `fuseDataFrame` with that frequency).
   - `log (Log)`: Optional logging object.
+- **Notes**: With a header (a L1 file), the file is hashed once (`hashFile`) after it is written, and that hash is
+shared by the sidecar (`consts.L1_SIDECAR`, see `writeSidecar`), the QC sidecar with the completeness of the data
+written (`consts.QC_SIDECAR`, see `Completeness.writeQC`) and the catalog (`consts.CATALOG`, see `Catalog`). With the
+three off, the file is not read again to hash it, and the completeness is only computed with `consts.QC_SIDECAR`. The file is recorded in the
+catalog with `normalized` so it is not cleaned again when it is read (see `Catalog.getNormalized`).
+
+---
+
+#### **`getSidecarPath(pathFile)`**
+- **Purpose**: Returns the path of the sidecar of a L1 file: the same folders of `consts.PATH_CLOUD` in
+`consts.PATH_L1_SIDECAR`, and the name of the file with `.feather`. `None` if the file is not in `consts.PATH_CLOUD`.
+
+---
+
+#### **`writeSidecar(pathFile, dataframe, header, contentHash=None, log=None)`**
+- **Purpose**: Writes a Feather (Arrow IPC) copy of the data of a csv file written by `writeDF2csv`, as it is read back
+from the csv, tagged with the header lines and the size and hash (`hashFile`, `contentHash` if it is given) of the csv.
+Needs `pyarrow`. Frames with columns that are not numbers have no sidecar.
+- **Returns**: `True` if it was written.
+
+---
+
+#### **`readSidecar(pathFile, header=None, log=None)`**
+- **Purpose**: Returns the data of a L1 file from its sidecar, the same dataframe than
+`ReaderCambellsciData.readTOA5`, if the size and the hash of the csv file and the header are still the same. The hash
+is the one of the catalog (`Catalog.getContentHash`) if the file did not change since it was written, so the csv file
+is not read.
+- **Returns**: The dataframe, or `None` if there is no valid sidecar.
+
+---
+
+#### **`appendDF2csv(pathFile, dataframe, indexMapFunc=None, normalized=None, log=None)`**
+- **Purpose**: Appends the rows of a dataframe at the end of a csv file written by `writeDF2csv`, with the same format
+and without reading or rewriting the file. The sidecar of the file is no longer valid, until the next `writeDF2csv`.
+- **Parameters**:
+  - `pathFile (Path)`: Path to the csv file.
+  - `dataframe (pd.DataFrame)`: Rows to append.
+  - `indexMapFunc (function)`: Function to format the index.
+  - `normalized`: The frequency of the rows if they are already clean and they continue the file on that frequency.
+  - `log (Log)`: Optional logging object.
+- **Returns**: `False` if the file does not exist or its last line is not complete.
 
 ---
 
@@ -218,6 +316,16 @@ overwriting.
 
 ---
 
+#### **`hashFile(path, block_size=HASH_BLOCK_SIZE)`**
+- **Purpose**: Calculates the BLAKE2b hash of the content of a file, reading it by blocks. It is faster than MD5 and it is
+used to know if a file changed since it was uploaded (see `Catalog`).
+- **Parameters**:
+  - `path (str or Path)`: File path.
+  - `block_size (int)`: Bytes read on each step.
+- **Returns**: The hash in hexadecimal form, or `None` if the file could not be read.
+
+---
+
 #### **`zipFiles(localFolder)`**
 - **Purpose**: Zips all files in a given folder.
 - **Parameters**:
@@ -260,6 +368,7 @@ appends a timestamp to the filename.
 
 import glob
 import hashlib
+import json
 import os
 import re
 import shutil
@@ -271,9 +380,23 @@ import numpy as np
 from csv import QUOTE_NONNUMERIC
 
 import ConverterCambellsciData
+import ReaderCambellsciData
+import Catalog
+import Completeness
+import Journal
 import Log
 import consts
 import systemTools
+try:  # optional, for the sidecars of the L1 files
+    import pyarrow
+    import pyarrow.feather
+    import pyarrow.ipc
+except ImportError:
+    pyarrow = None
+
+
+SCAN_BLOCK_SIZE = 64 * 1024  # bytes read on each step of the backwards scan of getLastLine
+HASH_BLOCK_SIZE = 1024 * 1024  # bytes read on each step of the hash of the files (sidecars and uploads)
 
 
 def getStrippedHeaderLine(line):
@@ -281,10 +404,27 @@ def getStrippedHeaderLine(line):
     return [field.strip('"') for field in fields]
 
 
+def getLastLine(f, blockSize=SCAN_BLOCK_SIZE):
+    """ Return the last line, without the end of line, of the file f opened in binary mode. The file is read backwards
+     by blocks of blockSize bytes until the line is found, so only the end of the file is read """
+    position = f.seek(0, os.SEEK_END)
+    tail = b''
+    while position > 0:
+        step = min(blockSize, position)
+        position -= step
+        f.seek(position)
+        tail = f.read(step) + tail
+        line = tail.rstrip(b'\r\n')
+        if b'\n' in line:
+            return line[line.rindex(b'\n') + 1:]
+    return tail.rstrip(b'\r\n')
+
+
 def getHeaderFLlineFile(pathFileName, log=None):
     """ return a dict with the 'headers' that are the first lines
      'firstLineDT', the first line timestamp od data and the 'lastLine' timestamp of data """
-    meta = {'headers': [], 'firstLineDT': None, 'lastLineDT': None, 'headerNumCols': 0, 'lineNumCols': 0}
+    meta = {'headers': [], 'firstLineDT': None, 'lastLineDT': None, 'headerNumCols': 0, 'lineNumCols': 0,
+            'numberLines': None}
     _log = False
     if log is not None and isinstance(log, Log.Log):
         _log = True
@@ -297,10 +437,7 @@ def getHeaderFLlineFile(pathFileName, log=None):
             if 'TOA' in meta['headers'][0][:10]:
                 fLine = f.readline().decode('ascii')
                 meta['firstLineDT'] = getDTfromLine(fLine)
-                f.seek(-2, os.SEEK_END)
-                while f.read(1) != b'\n':
-                    f.seek(-2, os.SEEK_CUR)
-                lLine = f.readline().decode('ascii')
+                lLine = getLastLine(f).decode('ascii')
                 lastLine = getDTfromLine(lLine)
                 if lastLine is None:
                     meta['lastLineDT'] = meta['firstLineDT']
@@ -308,6 +445,8 @@ def getHeaderFLlineFile(pathFileName, log=None):
                     meta['lastLineDT'] = lastLine
                 meta['lineNumCols'] = len(fLine.split(','))
             elif 'TOB' in meta['headers'][0][:10]:
+                if consts.NATIVE_TOB_READER and ReaderCambellsciData.isSupported(meta['headers'][0]):
+                    return ReaderCambellsciData.getHeaderFLlineTOB(pathFileName, log)
                 msg = f'<LibDataTransfer> The file {pathFileName} is a TOB file and needs to be converted to TOA'
                 if _log:
                     log.error(msg)
@@ -328,7 +467,8 @@ def checkAndConvertFile(pathFile, rename=True, log=None):
      First, it is going to change the name of the curren file adding at the end the timestamp,
      Second, it will check the first 10 char in the first line of the file has the substring TOA or TOB.
         If TOB, it will convert the file to TOA using the method convertTOB2TOA in ConverterCambellsciData.py
-            it will get the current full path of the TOA converted file.
+            it will get the current full path of the TOA converted file. If the TOB file can be read directly by
+            ReaderCambellsciData (consts.NATIVE_TOB_READER), it is not converted and 'toaPath' is None.
         If TOA, it will continue with the next step.  """
     toReturn = {'path': None, 'toaPath': None, 'tobPath': None, 'err': None}
     _log = False
@@ -346,6 +486,9 @@ def checkAndConvertFile(pathFile, rename=True, log=None):
             with open(str(toReturn['path']), 'rb') as f:
                 firstLine = f.readline().decode('ascii')
                 if 'TOB' in firstLine[0:10]:  # is a binary (TOB) file
+                    if consts.NATIVE_TOB_READER and ReaderCambellsciData.isSupported(firstLine):
+                        toReturn['tobPath'] = toReturn['path']  # read directly, no need of TOA file
+                        return toReturn
                     toReturn['toaPath'] = ConverterCambellsciData.TOB2TOA(toReturn['path'], tempDir=True)
                     toReturn['tobPath'] = toReturn['path']
                     #toReturn['path'] = toReturn['toaPath']
@@ -394,6 +537,8 @@ def getCSFromLine(line):
 
 
 def custom_keep(group):
+    """ Return the row of the group with more non-NaN values. Reference of dropDuplicatedIndex, on a tie the row kept
+     depends on the quicksort of numpy (not stable) """
     if len(group) <= 1:
         return group
     group['score'] = group.notna().sum(axis=1).values
@@ -401,6 +546,55 @@ def custom_keep(group):
     return group.drop(columns='score').head(1)
 
 
+def dropDuplicatedIndex(df, keep='last'):
+    """ Return the dataframe without duplicated index. Of each set of rows with the same index, it keeps the row with
+     more non-NaN values, like groupby(index).apply(custom_keep), and on a tie the first or the last one (keep='first'
+     or 'last'). Vectorized, the df must be sorted by index """
+    index = df.index.values
+    groups = np.concatenate(([0], np.cumsum(index[1:] != index[:-1])))
+    score = df.notna().sum(axis=1).values
+    position = np.arange(len(df))
+    if keep == 'first':
+        position = -position
+    # sorted by group, score and position, so the last row of each group is the one to keep
+    order = np.lexsort((position, score, groups))
+    last = np.concatenate((groups[order][1:] != groups[order][:-1], [True]))
+    return df.iloc[np.sort(order[last])]
+
+
+def isSortedUnique(index):
+    """ Return True if the index is sorted and without duplicated values, without sorting it """
+    if not index.is_monotonic_increasing:
+        return False
+    values = index.values
+    return len(values) < 2 or not (values[1:] == values[:-1]).any()
+
+
+def mergeSorted(df1, df2, keep='last'):
+    """ Return the data of df1 and df2 sorted and without duplicated index, the same than sorting pd.concat([df1, df2])
+     (stable) and dropDuplicatedIndex. Both df must be sorted and without duplicated index (isSortedUnique).
+     If the time ranges do not overlap they are just concatenated, otherwise only the rows in the overlap of both time
+     ranges are sorted and checked for duplicates, so the cost of adding new data to a yearly file scales with the new
+     data and not with the year """
+    if len(df1) == 0 or len(df2) == 0:
+        return pd.concat([df1, df2])
+    index1, index2 = df1.index, df2.index
+    if index1[-1] < index2[0]:
+        return pd.concat([df1, df2])
+    if index2[-1] < index1[0]:
+        return pd.concat([df2, df1])
+    # overlap, the rows before and after it are only of one of the dataframes
+    low, high = max(index1[0], index2[0]), min(index1[-1], index2[-1])
+    start1, end1 = index1.searchsorted(low, 'left'), index1.searchsorted(high, 'right')
+    start2, end2 = index2.searchsorted(low, 'left'), index2.searchsorted(high, 'right')
+    window = pd.concat([df1.iloc[start1:end1], df2.iloc[start2:end2]]).sort_index(kind='stable')
+    if window.index.duplicated().any():
+        Log.pYellow('Going to remove duplicated data')
+        window = dropDuplicatedIndex(window, keep=keep)
+    parts = [df1.iloc[:start1], df2.iloc[:start2], window, df1.iloc[end1:], df2.iloc[end2:]]
+    return pd.concat([part for part in parts if len(part)])
+
+
 def fuseDataFrame(df1, df2=None, freq=None, group=None, log=None, keep='last', maxNumYears=1):
     """ Return a list of dataframes with the data of df1 and df2 sorted and without duplicated index and with the freq
      Also, it will group the data by the group. If group is 'D' it will group by day or 'Y' by year """
@@ -434,20 +628,24 @@ def fuseDataFrame(df1, df2=None, freq=None, group=None, log=None, keep='last', m
         df_2 = df2
 
     # concat the dataframes
-    if df2 is not None:
-        df_con = pd.concat([df_1, df_2])
+    if isSortedUnique(df_1.index) and (df_2 is None or isSortedUnique(df_2.index)):
+        # the usual case (clean L0 and L1 data), only the rows in the overlap of both are sorted
+        df_con = df_1.copy() if df_2 is None else mergeSorted(df_1, df_2, keep=keep)
     else:
-        df_con = df_1
-    df_con = df_con.sort_index()
-    if df_con.index.duplicated().any():  # if there are duplicated data, it will select what is the best to keep
-        Log.pYellow('Going to remove duplicated data')
-        df_con = df_con.groupby(df_con.index).apply(custom_keep)
-        df_con.index = df_con.index.droplevel(0)
+        if df2 is not None:
+            df_con = pd.concat([df_1, df_2])
+        else:
+            df_con = df_1
+        df_con = df_con.sort_index(kind='stable')  # stable, so the duplicated rows keep the order df1, df2
+        if df_con.index.duplicated().any():  # if there are duplicated data, it will select what is the best to keep
+            Log.pYellow('Going to remove duplicated data')
+            df_con = dropDuplicatedIndex(df_con, keep=keep)
 
     # check if the data is not old or if there are incorrect dates
     c_year = time.localtime().tm_year
     numBefore = len(df_con)
-    df_con = df_con[(df_con.index.year >= c_year-maxNumYears) & (df_con.index.year <= c_year+maxNumYears)]
+    if numBefore and not (c_year-maxNumYears <= df_con.index[0].year and df_con.index[-1].year <= c_year+maxNumYears):
+        df_con = df_con[(df_con.index.year >= c_year-maxNumYears) & (df_con.index.year <= c_year+maxNumYears)]
     numAfter = len(df_con)
     if numBefore != numAfter:
         msg = f'<LibDataTransfer> The data was filtered from {numBefore} to {numAfter} rows remaining {numBefore-numAfter}.'
@@ -507,6 +705,60 @@ def datetime_format(dt, numDec=1):
     return result_string
 
 
+def vectorizedIndexMap(func):
+    """ Mark func as an index map function that formats the whole index at once, so writeDF2csv calls func(index)
+    instead of index.map(func). Use it in config.INDEX_MAP_FUNC, e.g.:
+        vectorizedIndexMap(lambda index: LibDataTransfer.datetime_format_index(index, 3)) """
+    func.vectorized = True
+    return func
+
+
+def _datetime_parts_(index):
+    """ Return the 'Y-m-d H:M:' prefix (object array), the seconds and the microseconds of a DatetimeIndex. The prefix
+    is formatted once per minute """
+    ns = index.asi8
+    minutes = ns // 60_000_000_000
+    uniqueMinutes, inverse = np.unique(minutes, return_inverse=True)
+    prefixes = pd.to_datetime(uniqueMinutes * 60_000_000_000).strftime('%Y-%m-%d %H:%M:')
+    seconds = (ns - minutes * 60_000_000_000) // 1_000_000_000
+    microseconds = (ns % 1_000_000_000) // 1_000
+    return np.asarray(prefixes, dtype=object)[inverse.ravel()], seconds, microseconds
+
+
+_SECONDS_ = np.array([f'{second:02d}' for second in range(60)], dtype=object)
+
+
+@vectorizedIndexMap
+def datetime_format_HF_index(index):
+    """ Vectorized datetime_format_HF, return the same strings for a whole DatetimeIndex.
+    Call it by: df.index = datetime_format_HF_index(df.index) """
+    index = pd.DatetimeIndex(index)
+    if len(index) == 0 or index.hasnans:
+        return index.map(datetime_format_HF)
+    prefixes, seconds, microseconds = _datetime_parts_(index)
+    tenths = np.concatenate(([''], [f'.{tenth}' for tenth in range(1, 10)])).astype(object)
+    result = prefixes + _SECONDS_[seconds] + tenths[microseconds // 100_000]
+    # the values that are not multiple of a tenth of second are rounded by datetime_format_HF
+    other = microseconds % 100_000 != 0
+    if other.any():
+        result[other] = np.asarray(index[other].map(datetime_format_HF), dtype=object)
+    return pd.Index(result, dtype=object)
+
+
+def datetime_format_index(index, numDec=1):
+    """ Vectorized datetime_format, return the same strings for a whole DatetimeIndex.
+    Call it by: df.index = datetime_format_index(df.index, 3) """
+    index = pd.DatetimeIndex(index)
+    if len(index) == 0 or index.hasnans or not 0 <= numDec <= 6:
+        return index.map(lambda dt: datetime_format(dt, numDec))
+    prefixes, seconds, microseconds = _datetime_parts_(index)
+    # the decimals truncated to numDec digits and without the zeros at the end, formatted once per value
+    values, inverse = np.unique(microseconds // 10 ** (6 - numDec), return_inverse=True)
+    decimals = np.array([f'.{value:0{numDec}d}'.rstrip('0') if value else '' for value in values], dtype=object)
+    result = prefixes + _SECONDS_[seconds] + decimals[inverse.ravel()]
+    return pd.Index(result, dtype=object)
+
+
 def boolean_format(value):
     """ Return the boolean in the format of the CS logger """
     return 'TRUE' if value else 'FALSE'
@@ -529,11 +781,22 @@ def correct_format(df):
     #return df
 
 
-def writeDF2csv(pathFile, dataframe, header=None, indexMapFunc=None, overwrite=False, log=None):
-    """ Write a dataframe to a csv file with multiline header """
-    if indexMapFunc is not None:
+def _formatDF4csv_(dataframe, indexMapFunc=None):
+    """ Return a copy of the dataframe with the format of the csv files written by writeDF2csv. The index and the
+     RECORD column of the dataframe are updated """
+    if getattr(indexMapFunc, 'vectorized', False):
+        dataframe.index = indexMapFunc(dataframe.index)
+    elif indexMapFunc is not None:
         dataframe.index = dataframe.index.map(indexMapFunc)
     dataframe['RECORD'] = dataframe['RECORD'].fillna(consts.FLAG).astype(int)
+    dataframe_copy = dataframe.copy()
+    correct_format(dataframe_copy)
+    return dataframe_copy
+
+
+def writeDF2csv(pathFile, dataframe, header=None, indexMapFunc=None, overwrite=False, normalized=None, log=None):
+    """ Write a dataframe to a csv file with multiline header. normalized is the frequency of the data if it is already
+     clean, it is recorded in the catalog """
     if overwrite and pathFile.exists():
         # rename the file by adding the timestamp
         pathOldFile = renameAFileWithDate(pathFile, log)
@@ -546,8 +809,11 @@ def writeDF2csv(pathFile, dataframe, header=None, indexMapFunc=None, overwrite=F
     newPathFile = None
     if pathFile.exists():  # if the file exist, make a backup
         newPathFile = renameAFileWithDate(pathFile, log)
-    dataframe_copy = dataframe.copy()
-    correct_format(dataframe_copy)
+    firstDT, lastDT = (dataframe.index[0], dataframe.index[-1]) if len(dataframe) > 0 else (None, None)
+    report = None  # the completeness of the L1 data, before its index is formatted
+    if header is not None and consts.QC_SIDECAR and Completeness.getQCPath(pathFile) is not None:
+        report = Completeness.dailyCompleteness(dataframe.replace(consts.FLAG, np.nan))
+    dataframe_copy = _formatDF4csv_(dataframe, indexMapFunc)
     with open(pathFile, 'w') as f:
         if header is None:
             header_flag = True
@@ -559,6 +825,129 @@ def writeDF2csv(pathFile, dataframe, header=None, indexMapFunc=None, overwrite=F
                               quoting=QUOTE_NONNUMERIC)
     if newPathFile is not None:
         newPathFile.unlink()  # delete the backup file
+    if header is not None:
+        # the L1 file is hashed once, for the sidecar, the QC, the catalog and the upload, only if one of them is on
+        contentHash = None
+        if consts.L1_SIDECAR or report is not None or consts.CATALOG:
+            contentHash = hashFile(pathFile)
+        if consts.L1_SIDECAR:
+            writeSidecar(pathFile, dataframe_copy, header, contentHash=contentHash, log=log)
+        if report is not None:
+            Completeness.writeQC(pathFile, report, contentHash=contentHash, log=log)
+        Catalog.recordFile(pathFile, header, firstDT, lastDT, len(dataframe_copy), level=1, normalized=normalized,
+                           contentHash=contentHash, log=log)
+    Journal.markDirty(pathFile)
+
+
+def getSidecarPath(pathFile):
+    """ Return the path of the sidecar of a L1 csv file. The sidecars are in consts.PATH_L1_SIDECAR with the same
+     folders than in consts.PATH_CLOUD, because the files in consts.PATH_CLOUD are moved after the upload to
+     SharePoint. Return None if the file is not in consts.PATH_CLOUD """
+    try:
+        relative = Path(pathFile).relative_to(consts.PATH_CLOUD)
+    except ValueError:
+        return None
+    return consts.PATH_L1_SIDECAR.joinpath(relative.parent, f'{relative.name}.feather')
+
+
+def _frameAsReadFromCSV_(dataframe):
+    """ Return the dataframe formatted by _formatDF4csv_ as ReaderCambellsciData.readTOA5 reads it back from the csv
+     file: the flags as NaN, the integers with flags as float and the index parsed. Return None if there are columns
+     that are not integer or float, their type depends on the text """
+    for col in dataframe.columns:
+        kind = dataframe[col].dtype.kind
+        if kind not in 'iuf' or (kind == 'f' and dataframe[col].dtype.itemsize != 8):
+            return None
+    frame = dataframe.astype({col: np.int64 for col in dataframe.columns if dataframe[col].dtype.kind in 'iu'})
+    frame = frame.replace(consts.FLAG, np.nan)
+    index = frame.index if isinstance(frame.index, pd.DatetimeIndex) else np.asarray(frame.index, dtype=str)
+    frame.index = ReaderCambellsciData.parseTimestamps(index, name=frame.index.name)
+    return frame
+
+
+def writeSidecar(pathFile, dataframe, header, contentHash=None, log=None):
+    """ Write the sidecar of a L1 csv file written by writeDF2csv: a Feather (Arrow IPC) file with the data as it is
+     read from the csv, tagged with the header lines and the hash (hashFile) of the csv, computed if contentHash is
+     None. Return True if it was written """
+    pathSidecar = getSidecarPath(pathFile)
+    if pyarrow is None or pathSidecar is None:
+        return False
+    frame = _frameAsReadFromCSV_(dataframe)
+    if frame is None:
+        pathSidecar.unlink(missing_ok=True)
+        return False
+    try:
+        table = pyarrow.Table.from_pandas(frame)
+        metadata = dict(table.schema.metadata or {})
+        metadata[b'cs_headers'] = json.dumps(list(header)).encode()
+        metadata[b'csv_size'] = str(Path(pathFile).stat().st_size).encode()
+        metadata[b'csv_hash'] = (hashFile(pathFile) if contentHash is None else contentHash).encode()
+        pathSidecar.parent.mkdir(parents=True, exist_ok=True)
+        pathTemp = pathSidecar.with_name(f'{pathSidecar.name}.tmp')
+        pyarrow.feather.write_feather(table.replace_schema_metadata(metadata), pathTemp)
+        os.replace(pathTemp, pathSidecar)
+    except Exception as e:
+        msg = f'<LibDataTransfer> Error writing the sidecar of {pathFile}: {e}'
+        if log:
+            log.warn(msg)
+        else:
+            print(msg)
+        return False
+    return True
+
+
+def readSidecar(pathFile, header=None, log=None):
+    """ Return the data of a L1 csv file from its sidecar, the same than ReaderCambellsciData.readTOA5 returns.
+     Return None if there is no sidecar or if it is not of the current content of the csv file or of the header. The
+     hash of the csv file is the one of the catalog if the file did not change since it was written """
+    pathSidecar = getSidecarPath(pathFile)
+    if pyarrow is None or pathSidecar is None or not pathSidecar.is_file():
+        return None
+    try:
+        with pyarrow.memory_map(str(pathSidecar)) as source:
+            reader = pyarrow.ipc.open_file(source)
+            metadata = reader.schema.metadata or {}
+            if (metadata.get(b'csv_size') != str(Path(pathFile).stat().st_size).encode() or
+                    (header is not None and metadata.get(b'cs_headers') != json.dumps(list(header)).encode())):
+                return None
+            contentHash = Catalog.getContentHash(pathFile) or hashFile(pathFile)
+            if contentHash is None or metadata.get(b'csv_hash') != contentHash.encode():
+                return None
+            return reader.read_all().to_pandas()
+    except Exception as e:
+        msg = f'<LibDataTransfer> Error reading the sidecar of {pathFile}: {e}'
+        if log:
+            log.warn(msg)
+        else:
+            print(msg)
+    return None
+
+
+def appendDF2csv(pathFile, dataframe, indexMapFunc=None, normalized=None, log=None):
+    """ Append the rows of a dataframe at the end of a csv file written by writeDF2csv, without reading the file.
+     normalized is the frequency of the rows if they are clean and continue the file on it.
+     Return False if the file does not exist or its last line is not complete """
+    pathFile = Path(pathFile)
+    if not pathFile.is_file() or pathFile.stat().st_size == 0:
+        return False
+    with open(pathFile, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b'\n':
+            msg = f'<LibDataTransfer> The last line of {pathFile} is not complete, the data was not appended'
+            if log:
+                log.warn(msg)
+            else:
+                print(msg)
+            return False
+    sizeBefore = pathFile.stat().st_size
+    lastDT = dataframe.index[-1] if len(dataframe) > 0 else None
+    dataframe_copy = _formatDF4csv_(dataframe, indexMapFunc)
+    with open(pathFile, 'a') as f:
+        dataframe_copy.to_csv(f, header=False, index=True, na_rep=consts.FLAG, lineterminator='\n',
+                              quoting=QUOTE_NONNUMERIC)
+    Catalog.recordAppend(pathFile, lastDT, len(dataframe_copy), sizeBefore, normalized=normalized, log=log)
+    Journal.markDirty(pathFile)
+    return True
 
 
 def getFragmentation4DF(df):
@@ -667,6 +1056,19 @@ def md5_for_file(path, block_size=256 * 128, hr=False):
     return md5.digest()
 
 
+def hashFile(path, block_size=HASH_BLOCK_SIZE):
+    """ Return the BLAKE2b hash (hexadecimal) of the content of the file read by blocks, or None if it can not be
+     read """
+    blake = hashlib.blake2b(digest_size=32)
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(block_size), b''):
+                blake.update(chunk)
+    except OSError:
+        return None
+    return blake.hexdigest()
+
+
 def checkMD5onZipFile(tempFolder, logFolder, compressedFile):
     """ Check the MD5 and if one file is not correct, it will be erased and log the file that is not correct """
     i = 0
@@ -798,6 +1200,7 @@ def moveAfileWOOW(src, dst, log=None):
             print(msg)
         dst = dst_
     shutil.copy2(src, dst)
+    Journal.markDirty(dst)
     time.sleep(1)
     if dst.is_file():
         try:
@@ -856,6 +1259,7 @@ def renameAFileWithDate(pathFile, log=None):
                 else:
                     print(msg)
                 return False
+        Journal.markDirty(completeName)
         return completeName
     else:
         msg = f'Not a file {pathFile}'
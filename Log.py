@@ -61,10 +61,32 @@
 # The code also includes some helper methods (`_checkPath_` and `_checkName_`) that are used to validate the path and
 #   name of the log file and ensure they meet the requirements.
 #
+# `logMsg(msg, log=None, level='info')` sends a message to the log with the level if the log is a Log object, otherwise
+#   it prints it, for the functions of the other modules that have an optional log.
+#
+# The lines are not written one by one. All the Log objects of the process write through a buffered writer
+#   (`_BufferedWriter_`) that keeps up to `POOL_SIZE` log files open (the least recently used is closed) and keeps the
+#   lines in memory until there are `BUFFER_LINES` lines or `BUFFER_SECONDS` passed since the last flush. A timer
+#   thread, started with the first line kept in memory, writes the lines after `BUFFER_SECONDS` even if no other line is
+#   logged (e.g. a long stage after one line), so a killed process loses at most those seconds. The error and fatal
+#   lines, `flush()` and the exit of the script (atexit) write all the lines. With `BUFFERED = False` each line is
+#   written and flushed at once.
+#
+# With `setAsync(True)` the Log objects only put the lines in a queue with the time they were logged, and a writer
+#   thread (`_AsyncWriter_`) formats the timestamps, prints them and writes them in the files, by batches, so the
+#   callers do not wait for the console or the disk. The queue is thread safe, and a forked process starts its own
+#   writer thread. `flush()` waits until the lines queued before it are written.
+#
 
 
 # from os.path import splitext, basename
+import os
 from os import system, getcwd
+from collections import OrderedDict
+import atexit
+import queue
+import threading
+import time
 # from sys import argv
 from time import localtime
 from datetime import datetime, timedelta
@@ -74,6 +96,25 @@ from colorama import just_fix_windows_console
 just_fix_windows_console()
 
 TIMESTAMP_FORMAT = '%Y%m%d_%H%M%S'
+_journal_ = None  # function called with the path of the log files written, see setJournal
+BUFFERED = True  # keep the lines in memory and write them by blocks
+BUFFER_LINES = 500  # lines kept in memory before writing them
+BUFFER_SECONDS = 2.  # seconds since the last write after which the lines are written
+POOL_SIZE = 16  # log files kept open
+ASYNC_BATCH = 1000  # lines taken from the queue by the writer thread on each step
+
+
+def setJournal(func):
+    """Set the function called with the path of each log file written, e.g. Journal.markDirty to upload it."""
+    global _journal_
+    _journal_ = func
+
+
+def _strTime_(t, formato=TIMESTAMP_FORMAT):
+    """Return the time t (seconds since epoch) like getStrTime() would return it at that time."""
+    if localtime(t).tm_isdst:
+        return (datetime.fromtimestamp(t) - timedelta(hours=1)).strftime(formato)
+    return datetime.fromtimestamp(t).strftime(formato)
 
 
 def getStrTime(formato=None, utc=False, dst=False):
@@ -123,6 +164,177 @@ def pBlack(skk):
     print(f"\033[98m {skk}\033[00m")
 
 
+class _BufferedWriter_:
+    """Writes the lines of all the Log objects of the process: the lines of each file are kept in memory and written
+    by blocks, the files are kept open in a pool of POOL_SIZE files, the least recently used is closed."""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self._reset_()
+
+    def _reset_(self):
+        self.handles = OrderedDict()  # path -> open file, the last one is the most recently used
+        self.buffers = OrderedDict()  # path -> list of lines not written yet
+        self.lines = 0
+        self.lastFlush = time.monotonic()
+        self.timer = None  # writes the lines in memory after BUFFER_SECONDS, started with the first one
+
+    def _handle_(self, path, mode='a'):
+        """ Return the open file of the path, the least recently used file is closed if there are too many """
+        f = self.handles.pop(path, None)
+        if f is None or mode == 'w':
+            if f is not None:
+                f.close()
+            try:
+                f = path.open(mode)
+            except IOError:
+                system(f'sudo chown pi:pi {path}')
+                try:
+                    f = path.open(mode)
+                except IOError:
+                    system(f'sudo echo error writing in file {path.name} >> errLog.log')
+                    return None
+        self.handles[path] = f
+        while len(self.handles) > POOL_SIZE:
+            self.handles.popitem(last=False)[1].close()
+        return f
+
+    def write(self, path, text, ow=False, force=False):
+        """ Add the text to the buffer of the path, all the buffers are written if force or if the buffers are full or
+        old. With ow, the file is overwritten with the text """
+        with self.lock:
+            if ow:
+                self.buffers.pop(path, None)
+                f = self._handle_(path, 'w')
+                if f is not None:
+                    f.write(text)
+                    f.flush()
+                return
+            self.buffers.setdefault(path, []).append(text)
+            self.lines += 1
+            if force or not BUFFERED or self.lines >= BUFFER_LINES or \
+                    time.monotonic() - self.lastFlush >= BUFFER_SECONDS:
+                self.flush()
+            elif self.timer is None:
+                self.timer = threading.Timer(BUFFER_SECONDS, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def flush(self, close=False):
+        """ Write the lines in memory to their files, and close the files if close """
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()  # nothing to do if it is the timer
+                self.timer = None
+            for path, lines in self.buffers.items():
+                f = self._handle_(path)
+                if f is not None:
+                    f.write(''.join(lines))
+                    f.flush()
+            self.buffers.clear()
+            self.lines = 0
+            self.lastFlush = time.monotonic()
+            if close:
+                for f in self.handles.values():
+                    f.close()
+                self.handles.clear()
+
+
+def _emit_(path, fprint, sprint, timestamp, line, now, color=None, ow=False, force=False):
+    """Print the line and write it in the file of the log, now is the timestamp of the line."""
+    if timestamp:
+        msg = f'{now}, {line}'
+    else:
+        msg = line
+    if sprint:
+        if color:
+            color(msg)
+        else:
+            print(msg)
+    if fprint:
+        if line[-1] != '\n':
+            line += '\n'
+        if timestamp:
+            _writer_.write(path, f'{now},{line}', ow=ow, force=force)
+        else:
+            _writer_.write(path, line, ow=ow, force=force)
+        if _journal_ is not None:
+            _journal_(path)
+
+
+class _AsyncWriter_(threading.Thread):
+    """Thread that takes the lines of the queue, by batches of ASYNC_BATCH lines, and prints and writes them. When the
+    queue is empty for BUFFER_SECONDS, the lines in memory are written."""
+
+    def __init__(self):
+        super().__init__(name='LogWriter', daemon=True)
+        self.queue = queue.SimpleQueue()
+
+    def run(self):
+        while True:
+            try:
+                items = [self.queue.get(timeout=BUFFER_SECONDS)]
+            except queue.Empty:
+                _writer_.flush()
+                continue
+            while len(items) < ASYNC_BATCH:
+                try:
+                    items.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            for item in items:
+                try:
+                    if isinstance(item, threading.Event):  # flush(): all the lines before it are written
+                        _writer_.flush()
+                        item.set()
+                    else:
+                        path, fprint, sprint, timestamp, line, t, color, ow, force = item
+                        _emit_(path, fprint, sprint, timestamp, line, _strTime_(t), color, ow, force)
+                except Exception as e:  # the writer must not stop
+                    print(f'<Log> Error writing a line: {e}')
+
+
+_writer_ = _BufferedWriter_()
+_async_ = None  # the writer thread if the asynchronous mode is on
+
+
+def setAsync(enabled=True):
+    """Turn on or off the asynchronous mode: the lines are queued and written by a writer thread."""
+    global _async_
+    if enabled and _async_ is None:
+        _async_ = _AsyncWriter_()
+        _async_.start()
+    elif not enabled and _async_ is not None:
+        flush()
+        _async_ = None
+
+
+def flush(close=False):
+    """Write to the files the lines in memory of all the logs, e.g. before uploading the log files. In asynchronous
+    mode, it waits for the lines queued before. The files are closed if close."""
+    if _async_ is not None and _async_.is_alive():
+        done = threading.Event()
+        _async_.queue.put(done)
+        done.wait()
+    _writer_.flush(close=close)
+
+
+def _afterFork_():
+    """A forked process (e.g. a worker of a process pool) starts without the lines and files of its parent, and with
+    its own writer thread in asynchronous mode"""
+    global _async_
+    _writer_.lock = threading.RLock()
+    _writer_._reset_()
+    if _async_ is not None:
+        _async_ = None
+        setAsync(True)
+
+
+atexit.register(flush, close=True)  # no lines are lost when the script ends, also with an exception
+if hasattr(os, 'register_at_fork'):  # not on Windows, the workers are spawned there
+    os.register_at_fork(after_in_child=_afterFork_)
+
+
 class Log:
     """Log the line into the file.  V20230822
           line:      line to print
@@ -184,55 +396,23 @@ class Log:
     def getFullPath(self):
         return self.path
 
-    def w(self, line, ow=False, color=None):
-        """ write the line into the file """
-        if ow:
-            wo = 'w'
-        else:
-            wo = 'a'
+    def w(self, line, ow=False, color=None, force=False):
+        """ write the line into the file, by the buffered writer. With force, the lines in memory are written now """
         if type(line) != 'str':
             line = str(line)
         if len(line) > 0:
-            if self.fprint:
-                if not self.path.is_file():
-                    f = self.path.open('w')
-                else:
-                    try:
-                        f = self.path.open(wo)
-                    except IOError:
-                        system(f'sudo chown pi:pi {self.path}')
-                        try:
-                            f = self.path.open(wo)
-                        except IOError:
-                            system(f'sudo echo error writing {line} in file {self.path.name} >> errLog.log')
-                            return
-            now = getStrTime()
-            if self.fprint or self.sprint:
-                if self.timestamp:
-                    msg = f'{now}, {line}'
-                else:
-                    msg = line
-                if self.sprint:
-                    if color:
-                        color(msg)
-                    else:
-                        print(msg)
-            if self.fprint:
-                if line[-1] != '\n':
-                    line += '\n'
-                if self.timestamp:
-                    f.write(f'{now},{line}')
-                else:
-                    f.write(line)
-                f.flush()
-                f.close()
+            if _async_ is not None:  # the writer thread formats, prints and writes the line
+                _async_.queue.put((self.path, self.fprint, self.sprint, self.timestamp, line, time.time(), color, ow,
+                                   force))
+            else:
+                _emit_(self.path, self.fprint, self.sprint, self.timestamp, line, getStrTime(), color, ow, force)
 
     def ow(self, line):
         """ Overwrite the same file log """
         self.w(line, ow=True)
 
     def error(self, line):
-        self.w(f'[Error]: {line}', color=pRed)
+        self.w(f'[Error]: {line}', color=pRed, force=True)
 
     def warn(self, line):
         self.w(f'[Warning]: {line}', color=pYellow)
@@ -247,4 +427,12 @@ class Log:
         self.w(f'[Debug]: {line}', color=pCyan)
 
     def fatal(self, line):
-        self.w(f'[Fatal]: {line}', color=pPurple)
+        self.w(f'[Fatal]: {line}', color=pPurple, force=True)
+
+
+def logMsg(msg, log=None, level='info'):
+    """Log the message with the level (error, warn, info, live, debug or fatal) if log is a Log, otherwise print it."""
+    if log is not None and isinstance(log, Log):
+        getattr(log, level)(msg)
+    else:
+        print(msg)
@@ -0,0 +1,703 @@
+# -------------------------------------------------------------------------------
+# Name:        ReaderCambellsciData
+# Purpose:     Read the Campbell Scientific binary files (TOB1, TOB2, TOB3) directly into a pandas DataFrame, without
+#              converting them to TOA5 with the TOB32.exe, and the TOA5 files with a fast timestamp parser
+#
+# Author:      Gesuri
+#
+# Created:     October 17, 2026
+# Copyright:   (c) Gesuri 2026
+# Licence:     Apache 2.0
+# -------------------------------------------------------------------------------
+
+# This module decodes the binary CS files with numpy, so the pipeline does not need to run the tob32.exe, write a
+#   temporal TOA5 file and parse it again with pandas. It also works on Linux where no .exe can run.
+#
+# 1. TOB1 file layout:
+#   Five ASCII lines of header (see consts.CS_FILE_HEADER_LINE): HARDWARE, FIELDS, UNITS, PROC and TYPE, followed by
+#   the binary records. Every record has the same size and its layout is given by the TYPE line, so the body of the
+#   file is read as a numpy structured array with np.memmap.
+#   The timestamp is stored as seconds since 1990-01-01 (SECONDS, NANOSECONDS fields or a SecNano field).
+#
+# 2. TOB2/TOB3 file layout (card files of the CR6, CR1000X, ...):
+#   Six ASCII lines of header, the second one has the table name, the record interval, the frame size, the validation
+#   stamp and the frame time resolution. The rest of the file are frames of the same size:
+#       header: seconds since 1990, subseconds (in units of the frame time resolution) and for TOB3 the record number
+#           of the first record in the frame.
+#       records: the records of the frame, the timestamp of each record is the frame time plus the record interval.
+#       footer: 4 bytes, offset (bits 0-10), flags F (file mark), R (removal mark), E (empty frame), M (minor frame)
+#           and the validation stamp (bits 16-31). Frames where the stamp is not the validation stamp of the header, or
+#           its complement, are not valid (not written yet or old data).
+#   The file is mapped in memory and decoded by chunks of frames, so a multi-GB card file is read in one pass with
+#   bounded memory. A frame with the M flag is made of smaller minor frames that are read one by one.
+#
+# 3. TOA5 timestamps:
+#   The timestamps of the TOA5 and L1 files are always written as consts.TIMESTAMP_FORMAT_CS_LINE or
+#   consts.TIMESTAMP_FORMAT_CS_LINE_HF, with 0 to 9 digits of fractional seconds. Instead of date_format='mixed', that
+#   infers the format of each value, the column is read as text and the characters are converted to numbers at fixed
+#   positions with numpy. Only the values that do not follow the layout are parsed with the slow path.
+#
+# 4. Functions:
+#   'getTOBType(firstLine)': Return the type of the CS file (TOA5, TOB1, ...) from the first line of the file.
+#   'isSupported(firstLine)': True if the file can be read with this module.
+#   'getTOBDtype(names, types)': Build the numpy structured dtype of a record from the FIELDS and TYPE lines.
+#   'decodeFP2(values)': Decode the CS 2-bytes floating point values.
+#   'ieee4ToFloat64(values)': Convert IEEE4 values to float64 with the same digits written in a TOA5 file.
+#   'getInfoTOB(pathFile, log=None)': Return the header, dtype and number of records of a TOB file.
+#   'getHeaderFLlineTOB(pathFile, log=None)': Same dict than LibDataTransfer.getHeaderFLlineFile for a TOB file.
+#   'iterTOB(pathFile, staticTable=False, log=None, chunkSize=CHUNK_SIZE)': Yield the data by chunks as DataFrames.
+#   'readTOB(pathFile, staticTable=False, log=None)': Return the DataFrame with the same layout than InfoFile.df.
+#   'parseTimestamps(values, name='TIMESTAMP', log=None)': Return the DatetimeIndex of the CS timestamps.
+#   'readTOA5(pathFile, colNames, staticTable=False, chunkSize=None, log=None)': Read a TOA5 or L1 file, or an
+#       iterator of chunks, with the timestamps parsed by parseTimestamps.
+
+import re
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+import Log
+import consts
+
+CS_EPOCH = np.datetime64('1990-01-01T00:00:00', 'ns')  # origin of the seconds stored in the CS binary files
+IEEE4_DIGITS = 7  # significant digits of an IEEE4 value written in a TOA5 file
+SUPPORTED_TYPES = ['TOB1', 'TOB2', 'TOB3']  # binary types that can be read without the tob32.exe
+# number of ASCII lines before the binary data
+NUM_HEADER_LINES = {'TOB1': len(consts.CS_FILE_HEADER_LINE), 'TOB2': len(consts.CS_FILE_HEADER_LINE) + 1,
+                    'TOB3': len(consts.CS_FILE_HEADER_LINE) + 1}
+CHUNK_SIZE = 64 * 1024 * 1024  # bytes decoded at once by iterTOB
+
+# TOB2/TOB3 frames
+FRAME_HEADER_SIZE = {'TOB2': 8, 'TOB3': 12}  # seconds, subseconds and the record number for TOB3
+FRAME_FOOTER_SIZE = 4
+# position of the items in the second line of the TOB2/TOB3 header
+TABLE_LINE = {'tableName': 0, 'interval': 1, 'frameSize': 2, 'tableSize': 3, 'validation': 4, 'resolution': 5}
+FOOTER_OFFSET = 0x07FF  # bits of the offset or size of a minor frame
+FOOTER_FILE_MARK = 0x1000  # F flag
+FOOTER_REMOVE_MARK = 0x2000  # R flag
+FOOTER_EMPTY = 0x4000  # E flag, the frame has no records
+FOOTER_MINOR = 0x8000  # M flag, minor frame
+# nanoseconds of each unit of the frame subseconds
+FRAME_TIME_RESOLUTION = {
+    'SecNano': 1,
+    'SecUSec': 1_000,
+    'Sec10Usec': 10_000,
+    'Sec100Usec': 100_000,
+    'SecMsec': 1_000_000,
+}
+# nanoseconds of each unit of the record interval, e.g. '100 MSEC'
+INTERVAL_UNITS = {
+    'NSEC': 1,
+    'USEC': 1_000,
+    'MSEC': 1_000_000,
+    'SEC': 1_000_000_000,
+    'MIN': 60 * 1_000_000_000,
+    'HR': 60 * 60 * 1_000_000_000,
+    'HOUR': 60 * 60 * 1_000_000_000,
+    'DAY': 24 * 60 * 60 * 1_000_000_000,
+}
+
+# numpy type for each CS data type. FP2 is read as an unsigned int and decoded after by decodeFP2
+TOB_DATA_TYPES = {
+    'IEEE4': '<f4',
+    'IEEE4L': '<f4',
+    'IEEE4B': '>f4',
+    'IEEE8': '<f8',
+    'IEEE8L': '<f8',
+    'IEEE8B': '>f8',
+    'FP2': '>u2',
+    'ULONG': '<u4',
+    'LONG': '<i4',
+    'UINT2': '>u2',
+    'INT2': '>i2',
+    'UINT4': '>u4',
+    'INT4': '>i4',
+    'BOOL': 'u1',
+    'BOOL2': '>u2',
+    'BOOL4': '>u4',
+    'SecNano': [('sec', '<i4'), ('nano', '<i4')],
+    'NSec': [('sec', '>i4'), ('nano', '>i4')],
+}
+TIMESTAMP_TYPES = ['SecNano', 'NSec']
+
+# layout of the TOA5 timestamps, 'YYYY-MM-DD HH:MM:SS' and optional '.fffffffff'
+TS_LENGTH = 19  # characters without the fractional seconds
+TS_MAX_DECIMALS = 9  # nanoseconds
+TS_SEPARATORS = {4: '-', 7: '-', 10: ' ', 13: ':', 16: ':'}  # position: character
+TS_DECIMAL_POINT = '.'
+
+# FP2 special values
+FP2_POS_INF = 0x1FFF
+FP2_NEG_INF = 0x9FFF
+FP2_NAN = 0x9FFE
+
+
+def _quoteLine_(items):
+    """ Return a header line like the CS does, each item quoted and separated by commas """
+    return ','.join(f'"{item}"' for item in items)
+
+
+def _splitLine_(line):
+    """ Return the items of a header line without quotes """
+    return [item.strip('"') for item in re.split(r',(?=(?:[^\"]*\"[^\"]*\")*[^\"]*$)', line.strip())]
+
+
+def getTOBType(firstLine):
+    """ Return the type of the CS file (TOA5, TOB1, TOB2, TOB3) from its first line """
+    if isinstance(firstLine, bytes):
+        firstLine = firstLine.decode('ascii', errors='replace')
+    return _splitLine_(firstLine)[0]
+
+
+def isSupported(firstLine):
+    """ Return True if the file with this first line can be read directly with this module """
+    return getTOBType(firstLine) in SUPPORTED_TYPES
+
+
+def getTOBDtype(names, types):
+    """ Return the numpy structured dtype of a record.
+        names: list of the field names, FIELDS line
+        types: list of the CS data types, TYPE line. e.g.: ['ULONG', 'ULONG', 'ULONG', 'IEEE4', 'FP2', 'ASCII(16)'] """
+    fields = []
+    for name, cs_type in zip(names, types):
+        ascii_ = re.fullmatch(r'ASCII\((\d+)\)', cs_type)
+        if ascii_:
+            fields.append((name, f'S{ascii_.group(1)}'))
+        elif cs_type in TOB_DATA_TYPES:
+            fields.append((name, TOB_DATA_TYPES[cs_type]))
+        else:
+            raise ValueError(f'Unknown CS data type "{cs_type}" for field "{name}"')
+    return np.dtype(fields)
+
+
+def decodeFP2(values):
+    """ Decode the CS FP2 values (2 bytes, big endian) to float64.
+    bit 15 is the sign, bits 13-14 the negative decimal exponent and bits 0-12 the mantissa """
+    values = np.asarray(values).astype(np.uint16)
+    exponent = (values >> 13) & 0x3
+    mantissa = (values & 0x1FFF).astype(np.float64)
+    result = np.where(values & 0x8000, -mantissa, mantissa) / np.power(10.0, exponent)
+    result[values == FP2_POS_INF] = np.inf
+    result[values == FP2_NEG_INF] = -np.inf
+    result[values == FP2_NAN] = np.nan
+    return result
+
+
+def ieee4ToFloat64(values):
+    """ Return the IEEE4 values as float64 rounded to the digits used in a TOA5 file (IEEE4_DIGITS). In that way the
+     values are the same than reading the TOA5 file converted by the tob32.exe. e.g.: 0.1 and not 0.10000000149 """
+    values = np.asarray(values).astype(np.float64)
+    idx = np.isfinite(values) & (values != 0)
+    v = values[idx]
+    exponent = np.floor(np.log10(np.abs(v))).astype(int) - (IEEE4_DIGITS - 1)
+    small = exponent < 0
+    scale = np.power(10.0, np.abs(exponent))
+    v = np.where(small, np.round(v * scale) / scale, np.round(v / scale) * scale)
+    values[idx] = v
+    return values
+
+
+def _getTimestampFields_(names, types):
+    """ Return the fields with the timestamp (seconds, nanoseconds) of the record. It could be the fields SECONDS and
+     NANOSECONDS or a field with the type SecNano """
+    if len(names) > 1 and names[0].upper() == 'SECONDS' and names[1].upper() == 'NANOSECONDS':
+        return [names[0], names[1]]
+    for name, cs_type in zip(names, types):
+        if cs_type in TIMESTAMP_TYPES:
+            return [name]
+    return []
+
+
+def _parseInterval_(interval):
+    """ Return the nanoseconds of a record interval from the TOB2/TOB3 header, e.g.: '100 MSEC' or '30 MIN' """
+    match = re.fullmatch(r'\s*(\d+)\s*([A-Za-z]+)\s*', interval)
+    if not match or match.group(2).upper() not in INTERVAL_UNITS:
+        raise ValueError(f'Unknown record interval "{interval}"')
+    return int(match.group(1)) * INTERVAL_UNITS[match.group(2).upper()]
+
+
+def getTOA5Header(headers, names, units, procs, tsFields, tableName=None, addRecord=False):
+    """ Return the header lines as the tob32.exe write them on a TOA5 file. The timestamp fields are replaced by the
+     TIMESTAMP column and the type line is removed.
+        tableName: for TOB2/TOB3 the table name is not in the first line, so it is set here
+        addRecord: for TOB2/TOB3 the record number is in the frame, so the RECORD column is added """
+    hardware = _splitLine_(headers[consts.CS_FILE_HEADER_LINE['HARDWARE']])
+    hardware[consts.CS_FILE_METADATA['type']] = 'TOA5'
+    if tableName is not None:
+        hardware = hardware[:consts.CS_FILE_METADATA['tableName']] + [tableName]
+    names_, units_, procs_ = ['TIMESTAMP'], ['TS'], ['']
+    if addRecord:
+        names_.append('RECORD')
+        units_.append('RN')
+        procs_.append('')
+    for name, unit, proc in zip(names, units, procs):
+        if name in tsFields:
+            continue
+        names_.append(name)
+        units_.append(unit)
+        procs_.append(proc)
+    return [_quoteLine_(hardware), _quoteLine_(names_), _quoteLine_(units_), _quoteLine_(procs_)]
+
+
+def getInfoTOB(pathFile, log=None):
+    """ Return a dictionary with the information to decode a TOB file:
+        'type': type of the file, e.g.: TOB1
+        'headers': the ASCII header lines of the file
+        'toaHeaders': the header lines as they are in a TOA5 file
+        'names', 'types': fields and CS data types
+        'tsFields': fields with the timestamp (TOB1)
+        'dtype': numpy dtype of each record
+        'offset': bytes of the header, the data starts here
+        'numberRecords': number of complete records in the file, for TOB2/TOB3 the maximum (all frames full)
+     and only for TOB2/TOB3:
+        'tableName', 'interval' (ns), 'frameSize', 'validation', 'resolution' (ns), 'headerSize', 'recordsPerFrame'
+        and 'numberFrames'
+     Return None if the file can not be decoded. """
+    pathFile = Path(pathFile)
+    info = {'type': None, 'headers': [], 'toaHeaders': [], 'names': [], 'types': [], 'tsFields': [], 'dtype': None,
+            'offset': 0, 'numberRecords': 0}
+    try:
+        with pathFile.open('rb') as f:
+            firstLine = f.readline()
+            info['type'] = getTOBType(firstLine)
+            if info['type'] not in SUPPORTED_TYPES:
+                Log.logMsg(f'<ReaderCambellsciData> The file {pathFile.name} is {info["type"]} and it is not supported',
+                           log, 'error')
+                return None
+            info['headers'].append(firstLine.decode('ascii').strip())
+            for i in range(NUM_HEADER_LINES[info['type']] - 1):
+                info['headers'].append(f.readline().decode('ascii').strip())
+            info['offset'] = f.tell()
+    except (IOError, UnicodeDecodeError) as e:
+        Log.logMsg(f'<ReaderCambellsciData> Error reading the header of {pathFile}: {e}', log, 'error')
+        return None
+    frames = info['type'] in FRAME_HEADER_SIZE
+    shift = 1 if frames else 0  # TOB2/TOB3 have the table line after the first line
+    info['names'] = _splitLine_(info['headers'][consts.CS_FILE_HEADER_LINE['FIELDS'] + shift])
+    units = _splitLine_(info['headers'][consts.CS_FILE_HEADER_LINE['UNITS'] + shift])
+    procs = _splitLine_(info['headers'][consts.CS_FILE_HEADER_LINE['PROC'] + shift])
+    info['types'] = _splitLine_(info['headers'][consts.CS_FILE_HEADER_LINE['TYPE'] + shift])
+    try:
+        info['dtype'] = getTOBDtype(info['names'], info['types'])
+    except ValueError as e:
+        Log.logMsg(f'<ReaderCambellsciData> {pathFile.name}: {e}', log, 'error')
+        return None
+    sizeData = pathFile.stat().st_size - info['offset']
+
+    if not frames:
+        info['tsFields'] = _getTimestampFields_(info['names'], info['types'])
+        if not info['tsFields']:
+            Log.logMsg(f'<ReaderCambellsciData> {pathFile.name} does not have timestamp fields', log, 'error')
+            return None
+        info['toaHeaders'] = getTOA5Header(info['headers'], info['names'], units, procs, info['tsFields'])
+        info['numberRecords'] = sizeData // info['dtype'].itemsize
+        if sizeData % info['dtype'].itemsize:
+            Log.logMsg(f'<ReaderCambellsciData> {pathFile.name} has an incomplete last record, '
+                       f'{sizeData % info["dtype"].itemsize} bytes are ignored', log, 'warn')
+        return info
+
+    table = _splitLine_(info['headers'][1])
+    try:
+        info['tableName'] = table[TABLE_LINE['tableName']]
+        info['interval'] = _parseInterval_(table[TABLE_LINE['interval']])
+        info['frameSize'] = int(table[TABLE_LINE['frameSize']])
+        info['validation'] = int(table[TABLE_LINE['validation']])
+        info['resolution'] = FRAME_TIME_RESOLUTION[table[TABLE_LINE['resolution']]]
+    except (IndexError, ValueError, KeyError) as e:
+        Log.logMsg(f'<ReaderCambellsciData> {pathFile.name} has an unknown table line "{info["headers"][1]}": {e}',
+                   log, 'error')
+        return None
+    info['headerSize'] = FRAME_HEADER_SIZE[info['type']]
+    info['recordsPerFrame'] = (info['frameSize'] - info['headerSize'] - FRAME_FOOTER_SIZE) // info['dtype'].itemsize
+    if info['recordsPerFrame'] < 1:
+        Log.logMsg(f'<ReaderCambellsciData> {pathFile.name} has frames of {info["frameSize"]} bytes that can not hold '
+                   f'a record of {info["dtype"].itemsize} bytes', log, 'error')
+        return None
+    info['numberFrames'] = sizeData // info['frameSize']
+    info['numberRecords'] = info['numberFrames'] * info['recordsPerFrame']
+    info['toaHeaders'] = getTOA5Header(info['headers'], info['names'], units, procs, [], tableName=info['tableName'],
+                                       addRecord=True)
+    return info
+
+
+def _mapRecords_(pathFile, info, start=0, stop=None):
+    """ Return the records from start to stop of the file as a read-only numpy structured array (memory map) """
+    if stop is None or stop > info['numberRecords']:
+        stop = info['numberRecords']
+    if stop <= start:
+        return np.empty(0, dtype=info['dtype'])
+    return np.memmap(pathFile, dtype=info['dtype'], mode='r', offset=info['offset'] + start * info['dtype'].itemsize,
+                     shape=(stop - start,))
+
+
+def _mapFrames_(pathFile, info):
+    """ Return all the frames of a TOB2/TOB3 file as a read-only 2D array of bytes (memory map), a frame per row """
+    if info['numberFrames'] == 0:
+        return np.empty((0, info['frameSize']), dtype=np.uint8)
+    return np.memmap(pathFile, dtype=np.uint8, mode='r', offset=info['offset'],
+                     shape=(info['numberFrames'], info['frameSize']))
+
+
+def _validStamp_(stamp, info):
+    """ True where the validation stamp of the footer is the one of the header or its complement """
+    return (stamp == info['validation']) | (stamp == (~info['validation'] & 0xFFFF))
+
+
+def _frameFields_(frames, info):
+    """ Return the fields of the headers and footers of the frames (2D array of bytes):
+     the time of each frame in ns since CS_EPOCH, the record number (None for TOB2), the footer, and the flags valid,
+     empty and minor """
+    header = np.ascontiguousarray(frames[:, :info['headerSize']]).view('<u4')
+    footer = np.ascontiguousarray(frames[:, -FRAME_FOOTER_SIZE:]).view('<u4')[:, 0]
+    ns = header[:, 0].astype(np.int64) * 1_000_000_000 + header[:, 1].astype(np.int64) * info['resolution']
+    recNum = header[:, 2].astype(np.int64) if info['headerSize'] > 8 else None
+    valid = _validStamp_(footer >> 16, info)
+    empty = (footer & FOOTER_EMPTY) != 0
+    minor = (footer & FOOTER_MINOR) != 0
+    return ns, recNum, footer, valid, empty, minor
+
+
+def _minorFrames_(frame, info):
+    """ Return the minor frames inside a major frame (1D array of bytes) in the order they were written.
+     Each item is (start byte, number of records, time in ns, record number). The minor frames are walked from the
+     end of the major frame, the offset of each footer is the size of its minor frame """
+    minors = []
+    end = len(frame)
+    minSize = info['headerSize'] + FRAME_FOOTER_SIZE
+    while end >= minSize:
+        footer = int(frame[end - FRAME_FOOTER_SIZE:end].view('<u4')[0])
+        if not _validStamp_(footer >> 16, info):
+            break
+        size = footer & FOOTER_OFFSET if footer & FOOTER_MINOR else end
+        if size < minSize or size > end:
+            break
+        start = end - size
+        if not footer & FOOTER_EMPTY:
+            header = frame[start:start + info['headerSize']].view('<u4')
+            ns = int(header[0]) * 1_000_000_000 + int(header[1]) * info['resolution']
+            recNum = int(header[2]) if info['headerSize'] > 8 else None
+            minors.append((start, (size - minSize) // info['dtype'].itemsize, ns, recNum))
+        end = start
+    return minors[::-1]
+
+
+def _decodeFrames_(frames, info):
+    """ Decode a chunk of frames (2D array of bytes). The records of all the normal frames are copied at once and viewed
+     as the record dtype, only the minor frames are decoded one by one.
+     Return the records, the timestamps in ns since CS_EPOCH, the record numbers (None for TOB2) and the number of not
+     valid frames """
+    ns, recNum, footer, valid, empty, minor = _frameFields_(frames, info)
+    nRec = info['recordsPerFrame']
+    recSize = info['dtype'].itemsize
+    hSize = info['headerSize']
+    offsets = np.arange(nRec, dtype=np.int64)
+
+    idx = np.flatnonzero(valid & ~empty & ~minor)
+    records = frames[idx, hSize:hSize + nRec * recSize].reshape(-1).view(info['dtype'])
+    times = (ns[idx, None] + offsets * info['interval']).ravel()
+    numbers = (recNum[idx, None] + offsets).ravel() if recNum is not None else None
+
+    idxMinor = np.flatnonzero(valid & minor)
+    if len(idxMinor) > 0:
+        allRecords, allTimes, allNumbers, keys = [records], [times], [numbers], [np.repeat(idx, nRec)]
+        for i in idxMinor:
+            frame = np.asarray(frames[i])
+            for start, n, t, r in _minorFrames_(frame, info):
+                allRecords.append(frame[start + hSize:start + hSize + n * recSize].copy().view(info['dtype']))
+                allTimes.append(t + offsets[:n] * info['interval'])
+                allNumbers.append(r + offsets[:n] if r is not None else None)
+                keys.append(np.full(n, i))
+        order = np.argsort(np.concatenate(keys), kind='stable')  # keep the order of the frames in the file
+        records = np.concatenate(allRecords)[order]
+        times = np.concatenate(allTimes)[order]
+        numbers = np.concatenate(allNumbers)[order] if recNum is not None else None
+    return records, times, numbers, int((~valid).sum())
+
+
+def getTimestamps(records, tsFields):
+    """ Return a DatetimeIndex from the timestamp fields of the records """
+    if len(tsFields) == 2:
+        sec = records[tsFields[0]]
+        nano = records[tsFields[1]]
+    else:
+        sec = records[tsFields[0]]['sec']
+        nano = records[tsFields[0]]['nano']
+    ns = sec.astype(np.int64) * 1_000_000_000 + nano.astype(np.int64)
+    return _ns2Index_(ns)
+
+
+def _ns2Index_(ns):
+    """ Return the DatetimeIndex of the nanoseconds since CS_EPOCH """
+    return pd.DatetimeIndex(CS_EPOCH + np.asarray(ns, dtype=np.int64).astype('timedelta64[ns]'), name='TIMESTAMP')
+
+
+def getHeaderFLlineTOB(pathFile, log=None):
+    """ Return the same dict than LibDataTransfer.getHeaderFLlineFile but from a TOB file. For TOB1 only the first and
+     last records are read to get the first and last timestamps, for TOB2/TOB3 only the headers and footers of the
+     frames (and the minor frames) are read """
+    meta = {'headers': [], 'firstLineDT': None, 'lastLineDT': None, 'headerNumCols': 0, 'lineNumCols': 0,
+            'numberLines': None}
+    info = getInfoTOB(pathFile, log)
+    if info is None:
+        return meta
+    meta['headers'] = info['toaHeaders']
+    meta['headerNumCols'] = len(_splitLine_(info['toaHeaders'][consts.CS_FILE_HEADER_LINE['FIELDS']]))
+    meta['lineNumCols'] = meta['headerNumCols']
+    if info['type'] not in FRAME_HEADER_SIZE:
+        meta['numberLines'] = info['numberRecords']
+        if info['numberRecords'] > 0:
+            first = getTimestamps(_mapRecords_(pathFile, info, 0, 1), info['tsFields'])
+            last = getTimestamps(_mapRecords_(pathFile, info, info['numberRecords'] - 1), info['tsFields'])
+            meta['firstLineDT'] = first[0].to_pydatetime()
+            meta['lastLineDT'] = last[0].to_pydatetime()
+        return meta
+
+    frames = _mapFrames_(pathFile, info)
+    step = max(1, CHUNK_SIZE // info['frameSize'])
+    number, first, last = 0, None, None
+    for i in range(0, info['numberFrames'], step):
+        chunk = frames[i:i + step]
+        ns, recNum, footer, valid, empty, minor = _frameFields_(chunk, info)
+        major = valid & ~empty & ~minor
+        starts = [ns[major]]
+        ends = [ns[major] + (info['recordsPerFrame'] - 1) * info['interval']]
+        number += int(major.sum()) * info['recordsPerFrame']
+        for j in np.flatnonzero(valid & minor):
+            for start, n, t, r in _minorFrames_(np.asarray(chunk[j]), info):
+                if n > 0:
+                    starts.append(np.array([t]))
+                    ends.append(np.array([t + (n - 1) * info['interval']]))
+                    number += n
+        starts = np.concatenate(starts)
+        ends = np.concatenate(ends)
+        if len(starts) > 0:
+            first = starts.min() if first is None else min(first, starts.min())
+            last = ends.max() if last is None else max(last, ends.max())
+    meta['numberLines'] = number
+    if first is not None:
+        meta['firstLineDT'] = _ns2Index_([first])[0].to_pydatetime()
+        meta['lastLineDT'] = _ns2Index_([last])[0].to_pydatetime()
+    return meta
+
+
+def records2DataFrame(records, info, staticTable=False, index=None, recordNumbers=None):
+    """ Return the DataFrame of the records with the same layout than pd.read_csv of the TOA5 file in InfoFile:
+     TIMESTAMP as index, the other fields as columns. If it is not a static table, the flag values (consts.FLAG) are
+     replaced by NaN like na_values does in read_csv.
+        index: the DatetimeIndex of the records if the timestamp is not in the records (TOB2/TOB3)
+        recordNumbers: values of the RECORD column if it is not in the records (TOB2/TOB3) """
+    columns = {}
+    if recordNumbers is not None:
+        columns['RECORD'] = np.asarray(recordNumbers, dtype=np.int64)
+    for name, cs_type in zip(info['names'], info['types']):
+        if name in info['tsFields']:
+            continue
+        values = records[name]
+        if cs_type == 'FP2':
+            values = decodeFP2(values)
+        elif cs_type in ['IEEE4', 'IEEE4L', 'IEEE4B']:
+            values = ieee4ToFloat64(values)
+        elif cs_type.startswith('ASCII'):
+            values = np.char.decode(values, 'ascii', errors='replace').astype(object)
+        elif cs_type.startswith('BOOL'):
+            values = np.where(values != 0, -1, 0).astype(np.int64)  # CRBasic true is -1
+        elif values.dtype.kind in 'iu':
+            values = values.astype(np.int64)
+        else:
+            values = values.astype(np.float64)
+        if not staticTable and values.dtype.kind in 'if':
+            flagged = values == consts.FLAG
+            if flagged.any():
+                values = values.astype(np.float64)
+                values[flagged] = np.nan
+        columns[name] = values
+    if index is None:
+        index = getTimestamps(records, info['tsFields'])
+    return pd.DataFrame(columns, index=index)
+
+
+def iterTOB(pathFile, staticTable=False, log=None, chunkSize=CHUNK_SIZE, info=None):
+    """ Yield the data of a TOB file by chunks of about chunkSize bytes, each one as a DataFrame with the same layout
+     than InfoFile.df. The file is mapped in memory, so only one chunk is decoded at the same time.
+     For TOB2 files, that have not record number, the RECORD column is the position of the record in the file """
+    if info is None:
+        info = getInfoTOB(pathFile, log)
+    if info is None:
+        return
+    if info['type'] not in FRAME_HEADER_SIZE:
+        step = max(1, chunkSize // info['dtype'].itemsize)
+        for i in range(0, info['numberRecords'], step):
+            yield records2DataFrame(_mapRecords_(pathFile, info, i, i + step), info, staticTable)
+        return
+
+    frames = _mapFrames_(pathFile, info)
+    step = max(1, chunkSize // info['frameSize'])
+    nInvalid = 0
+    nRecords = 0
+    for i in range(0, info['numberFrames'], step):
+        records, times, numbers, invalid = _decodeFrames_(frames[i:i + step], info)
+        nInvalid += invalid
+        if len(records) == 0:
+            continue
+        if numbers is None:
+            numbers = np.arange(nRecords, nRecords + len(records), dtype=np.int64)
+        nRecords += len(records)
+        yield records2DataFrame(records, info, staticTable, index=_ns2Index_(times), recordNumbers=numbers)
+    if nInvalid > 0:
+        Log.logMsg(f'<ReaderCambellsciData> {Path(pathFile).name}: {nInvalid} of {info["numberFrames"]} frames are not '
+                   f'valid and were skipped', log, 'warn')
+
+
+def readTOB(pathFile, staticTable=False, log=None):
+    """ Read a TOB file and return the DataFrame with the same layout than InfoFile.df. None if it is not possible """
+    info = getInfoTOB(pathFile, log)
+    if info is None:
+        return None
+    dfs = list(iterTOB(pathFile, staticTable=staticTable, log=log, info=info))
+    if len(dfs) == 0:
+        numbers = np.empty(0, dtype=np.int64) if info['type'] in FRAME_HEADER_SIZE else None
+        return records2DataFrame(np.empty(0, dtype=info['dtype']), info, staticTable, index=_ns2Index_([]),
+                                 recordNumbers=numbers)
+    if len(dfs) == 1:
+        return dfs[0]
+    return pd.concat(dfs)
+
+
+def _fastTimestamps_(values):
+    """ Parse the CS timestamps. Return the datetime64[ns] values and the mask of the values that follow the layout.
+     values: numpy array of bytes, the shorter values end with 0 """
+    n = len(values)
+    width = values.dtype.itemsize
+    result = np.full(n, np.datetime64('NaT'), dtype='datetime64[ns]')
+    if n == 0 or width < TS_LENGTH:
+        return result, np.zeros(n, dtype=bool)
+    chars = values.view(np.uint8).reshape(n, width)
+
+    # the separators of 'YYYY-MM-DD HH:MM:SS' and only digits after the decimal point, so numpy does not accept other
+    # ISO 8601 layouts (e.g. with time zone). The digits and the ranges of the fields are checked by numpy
+    ok = np.ones(n, dtype=bool)
+    for pos, char in TS_SEPARATORS.items():
+        ok &= chars[:, pos] == ord(char)
+    if width > TS_LENGTH:
+        point = chars[:, TS_LENGTH]
+        ok &= (point == 0) | (point == ord(TS_DECIMAL_POINT))
+        decimals = chars[:, TS_LENGTH + 1:]
+        ok &= ((decimals - np.uint8(ord('0')) <= 9) | (decimals == 0)).all(axis=1)
+        if width > TS_LENGTH + 1 + TS_MAX_DECIMALS:
+            ok &= chars[:, TS_LENGTH + 1 + TS_MAX_DECIMALS] == 0
+
+    try:
+        if ok.all():
+            result = values.astype('datetime64[ns]')
+        else:
+            result[ok] = values[ok].astype('datetime64[ns]')
+    except ValueError:  # at least one value is not a valid date, all of them go to the slow path
+        ok[:] = False
+    return result, ok
+
+
+def parseTimestamps(values, name='TIMESTAMP', log=None):
+    """ Return the DatetimeIndex of the timestamps of a TOA5 or L1 file, the values read as text.
+     The values with the layout of consts.TIMESTAMP_FORMAT_CS_LINE or consts.TIMESTAMP_FORMAT_CS_LINE_HF are parsed in
+     vectorized form, the others with pd.to_datetime(format='mixed'). If any of them can not be parsed, the values are
+     returned as they are, like read_csv does with parse_dates """
+    original = pd.Index(values, name=name)
+    if isinstance(original, pd.DatetimeIndex):
+        return original
+    try:  # one byte more than the longest timestamp, so the longer values do not follow the layout
+        text = np.asarray(original, dtype=object).astype(f'S{TS_LENGTH + 2 + TS_MAX_DECIMALS}')
+        index, ok = _fastTimestamps_(text)
+    except UnicodeEncodeError:
+        index, ok = np.full(len(original), np.datetime64('NaT'), dtype='datetime64[ns]'), np.zeros(len(original), bool)
+    bad = np.flatnonzero(~ok)
+    if len(bad) > 0:
+        try:
+            slow = pd.to_datetime(original[bad], format='mixed')
+        except (ValueError, TypeError, OverflowError) as e:
+            Log.logMsg(f'<ReaderCambellsciData> The timestamps could not be parsed, {e}', log, 'warn')
+            return original
+        index[bad] = slow.values.astype('datetime64[ns]')
+    return pd.DatetimeIndex(index, name=name)
+
+
+def _readTOA5kwargs_(colNames, staticTable):
+    """ Return the arguments of pd.read_csv for a TOA5 or L1 file, the timestamps are read as text """
+    kwargs = {'header': None, 'skiprows': len(consts.CS_FILE_HEADER_LINE) - 1, 'index_col': 0, 'names': colNames,
+              'dtype': {colNames[0]: str}}
+    if staticTable:
+        kwargs['keep_default_na'] = False
+    else:
+        kwargs['na_values'] = [consts.FLAG, "NAN"]
+    return kwargs
+
+
+def _setTimestamps_(df, log=None):
+    """ Replace the index of the DataFrame, read as text, by the parsed timestamps """
+    df.index = parseTimestamps(df.index, name=df.index.name, log=log)
+    return df
+
+
+def _iterTOA5_(reader, log=None):
+    """ Yield the chunks of a pd.read_csv reader with the timestamps parsed """
+    with reader:
+        for chunk in reader:
+            yield _setTimestamps_(chunk, log)
+
+
+def readTOA5(pathFile, colNames, staticTable=False, chunkSize=None, log=None):
+    """ Read a TOA5 or L1 file with the same result than pd.read_csv(parse_dates=True, date_format='mixed') in InfoFile,
+     but parsing the timestamps with parseTimestamps.
+        colNames: names of the columns, the first one is the index (TIMESTAMP)
+        staticTable: if True, the flag values are kept
+        chunkSize: if not None, return an iterator of DataFrames of chunkSize rows """
+    kwargs = _readTOA5kwargs_(colNames, staticTable)
+    if chunkSize is not None:
+        return _iterTOA5_(pd.read_csv(pathFile, chunksize=chunkSize, **kwargs), log)
+    return _setTimestamps_(pd.read_csv(pathFile, **kwargs), log)
+
+
+if __name__ == '__main__':
+    # benchmark of readTOA5 against pd.read_csv(parse_dates=True, date_format='mixed') on a synthetic 10 Hz day
+    import tempfile
+    import time
+
+    numRows = 24 * 60 * 60 * 10
+    names = ['TIMESTAMP', 'RECORD', 'Ux', 'Uy', 'Uz', 'Ts']
+    stamps = pd.date_range('2024-06-01', periods=numRows, freq=consts.FREQ_10HZ)
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({'RECORD': np.arange(numRows)}, index=stamps)
+    for column in names[2:]:
+        data[column] = rng.normal(size=numRows).round(4)
+    # the CS writes the whole seconds without decimals
+    text = pd.Series(stamps.strftime(consts.TIMESTAMP_FORMAT_CS_LINE_HF).str[:-5]).str.replace('.0', '', regex=False)
+    text = text.where(stamps.microsecond != 0, pd.Series(stamps.strftime(consts.TIMESTAMP_FORMAT_CS_LINE)))
+    with tempfile.TemporaryDirectory() as folder:
+        path = Path(folder).joinpath('benchmark_ts_data.dat')
+        with open(path, 'w', newline='') as f:
+            f.write('"TOA5","Site","CR3000","1","CR3000.Std.32","CPU:ts.CR3","1","ts_data"\r\n')
+            f.write(_quoteLine_(names) + '\r\n')
+            f.write(_quoteLine_(['TS', 'RN', 'm/s', 'm/s', 'm/s', 'C']) + '\r\n')
+            f.write(_quoteLine_(['', '', 'Smp', 'Smp', 'Smp', 'Smp']) + '\r\n')
+            data.insert(0, 'TIMESTAMP', ('"' + text + '"').values)
+            data.to_csv(f, header=False, index=False, lineterminator='\r\n', quoting=3)
+
+        start = time.time()
+        mixed = pd.read_csv(path, header=None, skiprows=len(consts.CS_FILE_HEADER_LINE) - 1, index_col=0,
+                            na_values=[consts.FLAG, "NAN"], names=names, parse_dates=True, date_format='mixed')
+        timeMixed = time.time() - start
+        start = time.time()
+        fast = readTOA5(path, names)
+        timeFast = time.time() - start
+        start = time.time()
+        pd.to_datetime(text, format='mixed')
+        timeParseMixed = time.time() - start
+        start = time.time()
+        parseTimestamps(text)
+        timeParseFast = time.time() - start
+
+    pd.testing.assert_frame_equal(mixed, fast)
+    print(f'{numRows} rows of 10 Hz data')
+    print(f'read_csv with date_format="mixed": {timeMixed:.2f} s, readTOA5: {timeFast:.2f} s '
+          f'({timeMixed / timeFast:.1f}x)')
+    print(f'timestamps only, to_datetime(format="mixed"): {timeParseMixed:.2f} s, parseTimestamps: '
+          f'{timeParseFast:.2f} s ({timeParseMixed / timeParseFast:.1f}x)')
@@ -45,6 +45,7 @@ import pandas as pd
 
 import consts
 import LibDataTransfer
+import ReaderCambellsciData
 
 
 class ResampleData:
@@ -123,9 +124,7 @@ class ResampleData:
         Returns:
             pd.DataFrame: The loaded DataFrame with the data.
         """
-        self.df = pd.read_csv(self.inPathFile, header=None, skiprows=len(consts.CS_FILE_HEADER_LINE) - 1, index_col=0,
-                              na_values=[consts.FLAG, "NAN"], names=self.colNames, parse_dates=True,
-                              date_format='mixed')
+        self.df = ReaderCambellsciData.readTOA5(self.inPathFile, self.colNames)
         return self.df
 
     def resampleData(self):
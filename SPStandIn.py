@@ -0,0 +1,467 @@
+# -------------------------------------------------------------------------------
+# Name:        SPStandIn
+# Purpose:     Local stand-in of SharePoint: an HTTP server that keeps the files in a local folder and its client with
+#              the methods of office365_api.SharePoint, with configurable latency, bandwidth, throttling and failures,
+#              to test and tune the concurrent transfers and the retries without network
+#
+# Author:      Gesuri
+#
+# Created:     October 17, 2026
+# Copyright:   (c) Gesuri 2026
+# Licence:     Apache 2.0
+# -------------------------------------------------------------------------------
+
+# The transfers with SharePoint (SPTransfer) spend most of their time waiting for the answers, and their behaviour
+#   depends on the throttling of SharePoint. The stand-in answers like SharePoint would, slowed down as configured:
+#
+# 1. Server: 'StandInServer(pathRoot, ...)' serves the files of pathRoot. The requests (paths relative to pathRoot):
+#       GET  /properties/<path>               JSON with file_name, file_size and time_last_modified (seconds), 404
+#       GET  /files/<path>                    the content of the file, 404
+#       PUT  /files/<path>                    write the file with the body
+#       POST /rename                          JSON body with src and dst, 404 if src does not exist
+#       POST /sessions/<uploadId>?action=start|continue|finish&target=<path>&offset=<int>
+#                                             the upload sessions, answer JSON with the offset. continue and finish
+#                                             with an offset different of the bytes received answer 409. finish with
+#                                             offset 0 and without session writes the body as the file
+#   The sessions are in pathRoot/.sessions. It is a ThreadingHTTPServer, one thread per connection.
+#
+# 2. Conditions (arguments of StandInServer):
+#   latency: seconds waited before answering each request.
+#   bandwidth: bytes per second of the link, shared by all the requests (the uploads and the downloads). None: no limit.
+#   throttle: fraction of the requests answered 429 with the header Retry-After: retryAfter.
+#   maxRequests: requests at the same time, the ones above it are answered 503 with Retry-After: retryAfter.
+#   failures: fraction of the requests answered 500, without Retry-After.
+#   'stats()' returns the number of requests, throttled and failed, and the bytes received and sent.
+#
+# 3. Client: 'StandInClient(url)' has the methods used by the transfers (see Storage) and the ones of the upload
+#   sessions (see SPTransfer.uploadResumable). It keeps one connection, so it must not be shared between threads (each
+#   thread of SPTransfer.TransferPool creates its client). The errors raise StandInError with the response, so
+#   SPTransfer.getRetryAfter knows the throttled requests.
+#
+# 4. With consts.STORAGE_BACKEND = 'standin' the transfers of ECS_Process_L0 use the server of consts.STORAGE_URL.
+#
+# Usage:
+#   python SPStandIn.py -f C:/StandIn -p 8765 -l 0.1 -b 2 -t 0.05
+#   with SPStandIn.StandInServer(folder, latency=0.1, throttle=0.05) as server:
+#       sp = SPStandIn.StandInClient(server.url)
+
+import getopt
+import http.client
+import json
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+import Log
+
+BLOCK_SIZE = 64 * 1024  # bytes read and written at once
+SESSIONS = '.sessions'  # folder of the upload sessions in the root folder
+DEFAULT_PORT = 8765
+
+
+def _urlPath_(path):
+    """ Return the path relative to the SharePoint folder quoted for a URL, with / as separator """
+    return quote(str(path).replace('\\', '/').strip('/'))
+
+
+class _Link_:
+    """ Link with a bandwidth shared by all the requests: each block waits until the link sent the previous ones """
+
+    def __init__(self, bandwidth=None):
+        self.bandwidth = bandwidth
+        self._lock_ = threading.Lock()
+        self._free_ = 0.  # time.monotonic() when the link finishes sending the blocks reserved
+
+    def send(self, size):
+        """ Wait the time of sending size bytes """
+        if not self.bandwidth:
+            return
+        with self._lock_:
+            now = time.monotonic()
+            self._free_ = max(self._free_, now) + size / self.bandwidth
+            wait = self._free_ - now
+        time.sleep(wait)
+
+
+class _Handler_(BaseHTTPRequestHandler):
+    """ Requests of the stand-in, the server is a StandInServer """
+    protocol_version = 'HTTP/1.1'  # keep the connection of each client
+
+    def log_message(self, format, *args):
+        pass  # the requests are counted in the stats, not printed
+
+    def _path_(self, relPath):
+        """ Return the path in the root folder of the relative path, None if it is outside it """
+        root = self.server.pathRoot.resolve()
+        path = root.joinpath(unquote(relPath).strip('/')).resolve()
+        return path if path == root or root in path.parents else None
+
+    def _send_(self, status, body=b'', headers=None):
+        """ Answer the request """
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self._write_(body)
+
+    def _sendJson_(self, data, status=200):
+        self._send_(status, json.dumps(data).encode(), {'Content-Type': 'application/json'})
+
+    def _write_(self, data):
+        """ Send data through the link """
+        for i in range(0, len(data), BLOCK_SIZE):
+            self.server.link.send(len(data[i:i + BLOCK_SIZE]))
+            self.wfile.write(data[i:i + BLOCK_SIZE])
+        self.server.count('bytesOut', len(data))
+
+    def _read_(self):
+        """ Return the body of the request, received through the link """
+        size = int(self.headers.get('Content-Length') or 0)
+        blocks = []
+        while size > 0:
+            block = self.rfile.read(min(BLOCK_SIZE, size))
+            if not block:
+                break
+            self.server.link.send(len(block))
+            blocks.append(block)
+            size -= len(block)
+        data = b''.join(blocks)
+        self.server.count('bytesIn', len(data))
+        return data
+
+    def _handle_(self, method):
+        """ Answer the request with the conditions of the server """
+        server = self.server
+        server.count('requests')
+        with server.lock:
+            server.active += 1
+            active = server.active
+        try:
+            body = self._read_() if method in ('PUT', 'POST') else b''
+            time.sleep(server.latency)
+            if server.maxRequests and active > server.maxRequests:
+                server.count('throttled')
+                return self._send_(503, headers={'Retry-After': str(server.retryAfter)})
+            if server.throttle and server.random() < server.throttle:
+                server.count('throttled')
+                return self._send_(429, headers={'Retry-After': str(server.retryAfter)})
+            if server.failures and server.random() < server.failures:
+                server.count('failed')
+                return self._send_(500)
+            url = urlsplit(self.path)
+            kind, _, relPath = url.path.lstrip('/').partition('/')
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            func = {('GET', 'properties'): self._properties_, ('GET', 'files'): self._download_,
+                    ('PUT', 'files'): self._upload_, ('POST', 'rename'): self._rename_,
+                    ('POST', 'sessions'): self._session_}.get((method, kind))
+            if func is None:
+                return self._send_(404)
+            func(relPath, query, body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def do_GET(self):
+        self._handle_('GET')
+
+    def do_PUT(self):
+        self._handle_('PUT')
+
+    def do_POST(self):
+        self._handle_('POST')
+
+    def _properties_(self, relPath, query, body):
+        path = self._path_(relPath)
+        if path is None or not path.is_file():
+            return self._send_(404)
+        stat = path.stat()
+        self._sendJson_({'file_name': path.name, 'file_size': stat.st_size, 'time_last_modified': stat.st_mtime})
+
+    def _download_(self, relPath, query, body):
+        path = self._path_(relPath)
+        if path is None or not path.is_file():
+            return self._send_(404)
+        self._send_(200, path.read_bytes(), {'Content-Type': 'application/octet-stream'})
+
+    def _upload_(self, relPath, query, body):
+        path = self._path_(relPath)
+        if path is None:
+            return self._send_(403)
+        self._writeFile_(path, body)
+        self._sendJson_({'file_size': len(body)})
+
+    def _rename_(self, relPath, query, body):
+        names = json.loads(body or b'{}')
+        src = self._path_(names.get('src', ''))
+        dst = self._path_(names.get('dst', ''))
+        if src is None or dst is None:
+            return self._send_(403)
+        if not src.is_file():
+            return self._send_(404)
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        src.replace(dst)
+        self._sendJson_({'file_name': dst.name})
+
+    def _session_(self, uploadId, query, body):
+        target = self._path_(query.get('target', ''))
+        pathSession = self._path_(f'{SESSIONS}/{uploadId}')
+        if target is None or pathSession is None or not uploadId:
+            return self._send_(403)
+        action = query.get('action')
+        offset = int(query.get('offset', 0))
+        if action == 'start':
+            pathSession.parent.mkdir(parents=True, exist_ok=True)
+            pathSession.write_bytes(body)
+            return self._sendJson_({'offset': len(body)})
+        if action == 'finish' and offset == 0 and not pathSession.is_file():  # the whole file in one chunk
+            self._writeFile_(target, body)
+            return self._sendJson_({'offset': len(body)})
+        if action not in ('continue', 'finish') or not pathSession.is_file():
+            return self._send_(404)
+        if pathSession.stat().st_size != offset:
+            return self._send_(409)
+        with open(pathSession, 'ab') as f:
+            f.write(body)
+        offset += len(body)
+        if action == 'finish':
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(pathSession, target)
+        self._sendJson_({'offset': offset})
+
+    @staticmethod
+    def _writeFile_(path, data):
+        """ Write the file at once, the readers never see it half written """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pathTemp = path.with_name(f'.{path.name}.{threading.get_ident()}.tmp')
+        pathTemp.write_bytes(data)
+        os.replace(pathTemp, path)
+
+
+class StandInServer(ThreadingHTTPServer):
+    """ HTTP stand-in of SharePoint with the files in pathRoot.
+        pathRoot: folder of the files, it is the SharePoint folder
+        host, port: address of the server, port 0 takes a free port (see url)
+        latency: seconds waited before answering each request
+        bandwidth: bytes per second shared by all the requests, None without limit
+        throttle: fraction of the requests answered 429
+        maxRequests: requests at the same time, the ones above it are answered 503. None without limit
+        retryAfter: seconds of the Retry-After header of the throttled requests
+        failures: fraction of the requests answered 500
+        seed: seed of the random throttling and failures
+    """
+    daemon_threads = True
+
+    def __init__(self, pathRoot, host='127.0.0.1', port=DEFAULT_PORT, latency=0., bandwidth=None, throttle=0.,
+                 maxRequests=None, retryAfter=1, failures=0., seed=None):
+        super().__init__((host, port), _Handler_)
+        self.pathRoot = Path(pathRoot)
+        self.pathRoot.mkdir(parents=True, exist_ok=True)
+        self.latency = latency
+        self.link = _Link_(bandwidth)
+        self.throttle = throttle
+        self.maxRequests = maxRequests
+        self.retryAfter = retryAfter
+        self.failures = failures
+        self.lock = threading.Lock()
+        self.active = 0  # requests being answered
+        self._random_ = random.Random(seed)
+        self._stats_ = dict.fromkeys(['requests', 'throttled', 'failed', 'bytesIn', 'bytesOut'], 0)
+        self._thread_ = None
+
+    @property
+    def url(self):
+        """ URL of the server, for StandInClient """
+        return f'http://{self.server_address[0]}:{self.server_address[1]}'
+
+    def random(self):
+        with self.lock:
+            return self._random_.random()
+
+    def count(self, key, value=1):
+        with self.lock:
+            self._stats_[key] += value
+
+    def stats(self):
+        """ Return the number of requests, throttled and failed, and the bytes received and sent """
+        with self.lock:
+            return dict(self._stats_)
+
+    def start(self):
+        """ Serve the requests in a thread, until stop() """
+        self._thread_ = threading.Thread(target=self.serve_forever, name='SPStandIn', daemon=True)
+        self._thread_.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread_ is not None:
+            self._thread_.join()
+            self._thread_ = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+class StandInError(Exception):
+    """ Error answered by the stand-in, response has the status and the headers (e.g. Retry-After) """
+
+    def __init__(self, msg, response=None):
+        super().__init__(msg)
+        self.response = response
+
+
+class StandInClient:
+    """ Client of a StandInServer with the methods of office365_api.SharePoint used by the transfers.
+        url: URL of the server, e.g. http://127.0.0.1:8765
+        timeout: seconds to wait for each answer
+    """
+
+    def __init__(self, url, log=None, timeout=60):
+        url = urlsplit(url)
+        self.host = url.hostname
+        self.port = url.port or DEFAULT_PORT
+        self.timeout = timeout
+        self.log = log
+        self._connection_ = None
+
+    def _request_(self, method, path, body=None, missing=False):
+        """ Send the request and return the response read, or None if it is 404 and missing. Raise StandInError if the
+         server answers an error """
+        if self._connection_ is None:
+            self._connection_ = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            self._connection_.request(method, path, body=body)
+            response = self._connection_.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException):
+            self.close()  # the next request opens a new connection
+            raise
+        if missing and response.status == 404:
+            return None
+        if response.status >= 400:
+            raise StandInError(f'<SPStandIn> {method} {unquote(path)} answered {response.status} {response.reason}',
+                               response)
+        return data
+
+    def close(self):
+        if self._connection_ is not None:
+            self._connection_.close()
+            self._connection_ = None
+
+    def get_file_properties(self, file_name, folder_name):
+        """ Return the properties of the file (file_name, file_size and time_last_modified as datetime), None if it
+         does not exist """
+        data = self._request_('GET', f'/properties/{_urlPath_(f"{folder_name}/{file_name}")}', missing=True)
+        if data is None:
+            return None
+        properties = json.loads(data)
+        properties['time_last_modified'] = datetime.fromtimestamp(properties['time_last_modified'])
+        return properties
+
+    def download_large_file(self, file_name, folder_name, local_file_path):
+        """ Download the file to local_file_path, return False if it does not exist """
+        data = self._request_('GET', f'/files/{_urlPath_(f"{folder_name}/{file_name}")}', missing=True)
+        if data is None:
+            Log.logMsg(f'<SPStandIn> The file {file_name} does not exist in {folder_name}', self.log, 'warn')
+            return False
+        pathTemp = Path(f'{local_file_path}.part')
+        pathTemp.parent.mkdir(parents=True, exist_ok=True)
+        pathTemp.write_bytes(data)
+        os.replace(pathTemp, local_file_path)
+        return True
+
+    def upload_large_file(self, local_file_path, target_file_url):
+        """ Upload the local file to target_file_url """
+        with open(local_file_path, 'rb') as f:
+            self._request_('PUT', f'/files/{_urlPath_(target_file_url)}', body=f.read())
+        return True
+
+    def rename_file(self, src, dst):
+        """ Rename the file src to dst, return False if src does not exist """
+        body = json.dumps({'src': str(src).replace('\\', '/'), 'dst': str(dst).replace('\\', '/')}).encode()
+        return self._request_('POST', '/rename', body=body, missing=True) is not None
+
+    def _session_(self, action, target, uploadId, offset, data):
+        path = f'/sessions/{quote(uploadId)}?action={action}&target={_urlPath_(target)}&offset={offset}'
+        return json.loads(self._request_('POST', path, body=data))['offset']
+
+    def start_upload(self, target, uploadId, data):
+        return self._session_('start', target, uploadId, 0, data)
+
+    def continue_upload(self, target, uploadId, offset, data):
+        return self._session_('continue', target, uploadId, offset, data)
+
+    def finish_upload(self, target, uploadId, offset, data):
+        self._session_('finish', target, uploadId, offset, data)
+        return True
+
+
+def cmd_help():
+    """ Display the help of the script """
+    print('Help:')
+    print('   SPStandIn.py')
+    print('   Serves a local folder as a stand-in of SharePoint, see consts.STORAGE_BACKEND.')
+    print('   -f, --folder=       Folder of the files. Required')
+    print(f'   -p, --port=         Port of the server. Default: {DEFAULT_PORT}')
+    print('   -l, --latency=      Seconds before answering each request. Default: 0')
+    print('   -b, --bandwidth=    MB per second shared by all the requests. Default: no limit')
+    print('   -t, --throttle=     Fraction of the requests answered 429. Default: 0')
+    print('   -m, --max-requests= Requests at the same time, the ones above are answered 503. Default: no limit')
+    print('   -a, --retry-after=  Seconds of the Retry-After of the throttled requests. Default: 1')
+    print('   -e, --failures=     Fraction of the requests answered 500. Default: 0')
+
+
+def main(argv):
+    """ Serve the folder with the command line arguments until Ctrl+C, return the exit code """
+    try:
+        opts, args = getopt.getopt(argv, 'hf:p:l:b:t:m:a:e:', ['help', 'folder=', 'port=', 'latency=', 'bandwidth=',
+                                                              'throttle=', 'max-requests=', 'retry-after=',
+                                                              'failures='])
+    except getopt.GetoptError:
+        cmd_help()
+        return 2
+    params = {}
+    names = {'-f': 'pathRoot', '-p': 'port', '-l': 'latency', '-b': 'bandwidth', '-t': 'throttle', '-m': 'maxRequests',
+             '-a': 'retryAfter', '-e': 'failures', '--folder': 'pathRoot', '--port': 'port', '--latency': 'latency',
+             '--bandwidth': 'bandwidth', '--throttle': 'throttle', '--max-requests': 'maxRequests',
+             '--retry-after': 'retryAfter', '--failures': 'failures'}
+    for opt, arg in opts:
+        if opt in ('-h', '--help'):
+            cmd_help()
+            return 0
+        name = names[opt]
+        if name == 'pathRoot':
+            params[name] = Path(arg)
+        elif name in ('port', 'maxRequests'):
+            params[name] = int(arg)
+        elif name == 'bandwidth':
+            params[name] = float(arg) * 1024 * 1024
+        else:
+            params[name] = float(arg)
+    if 'pathRoot' not in params:
+        cmd_help()
+        return 2
+    with StandInServer(**params) as server:
+        print(f'Serving {params["pathRoot"]} at {server.url}, Ctrl+C to stop')
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        print(f'Stats: {server.stats()}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
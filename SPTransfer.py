@@ -0,0 +1,280 @@
+# -------------------------------------------------------------------------------
+# Name:        SPTransfer
+# Purpose:     Run the uploads and downloads of files with SharePoint in a bounded pool of threads, retrying each file
+#              with exponential backoff and waiting the time asked by SharePoint when it throttles the requests
+#
+# Author:      Gesuri
+#
+# Created:     October 17, 2026
+# Copyright:   (c) Gesuri 2026
+# Licence:     Apache 2.0
+# -------------------------------------------------------------------------------
+
+# After a long outage there are hundreds of L0 files to upload. One file after the other, most of the time is spent
+#   waiting for the answers of SharePoint, not sending data. The pool transfers consts.SP_WORKERS files at the same
+#   time.
+#
+# 1. Clients: each thread of the pool creates its client (e.g. office365_api.SharePoint) with the factory the first
+#   time it is used, so it authenticates once and reuses the same session for all its files. The clients are not
+#   shared between threads, the office365 client context is not thread safe.
+#
+# 2. Retries: 'call(func)' runs func(client). If it raises an exception (or returns False, if retryFalse) it is run
+#   again up to consts.SP_RETRIES times, waiting consts.SP_BACKOFF * 2 ** attempt seconds plus a random jitter, up to
+#   consts.SP_MAX_BACKOFF. If the exception has a response with status 429 or 503 (throttled), the time of its
+#   Retry-After header is used instead, and all the threads wait that time before their next request.
+#
+# 3. Prefetcher: starts the jobs of a list of paths (e.g. the downloads of the L1 files) in the pool without waiting,
+#   and 'wait(path)' waits only for the job of that path, so the files are downloaded while other work is done.
+#
+# 4. Resumable uploads: 'uploadResumable(client, pathFile, target)' uploads the file by chunks of consts.SP_CHUNK_SIZE
+#   with an upload session (the StartUpload/ContinueUpload/FinishUpload of SharePoint), saving the session and the
+#   offset uploaded after each chunk in consts.PATH_UPLOAD_SESSIONS. If the upload is interrupted (an error or a
+#   restart of the script) the next upload of the same file, with the same content hash, continues from that offset.
+#   The clients must have the methods:
+#       start_upload(target, uploadId, data) -> offset
+#       continue_upload(target, uploadId, offset, data) -> offset
+#       finish_upload(target, uploadId, offset, data) -> True (offset 0 without start_upload for one chunk files)
+#   The clients without them (e.g. office365_api.SharePoint) upload the whole file with upload_large_file.
+#
+# 5. The factory is any callable returning an object with the methods used by the jobs (see Storage.newClient), so the
+#   pool can be tested with a client of the local HTTP stand-in of SharePoint (see SPStandIn).
+#
+# Example:
+#   with SPTransfer.TransferPool(lambda: office365_api.SharePoint(log=log), log=log) as pool:
+#       results = pool.map(lambda pf: pool.call(lambda sp: sp.upload_large_file(pf, pf.name)), files)
+
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import LibDataTransfer
+import Log
+import consts
+
+THROTTLE_STATUS = (429, 503)  # status codes of the throttled requests, they come with a Retry-After header
+SESSION_METHODS = ('start_upload', 'continue_upload', 'finish_upload')  # methods of the clients with upload sessions
+
+
+def getRetryAfter(error):
+    """ Return the seconds to wait if the exception comes from a throttled request (status 429 or 503), from its
+     Retry-After header (seconds or an HTTP date), 0 if it does not have one. Return None if it was not throttled """
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', getattr(response, 'status', None))
+    if status not in THROTTLE_STATUS:
+        return None
+    value = (getattr(response, 'headers', None) or {}).get('Retry-After')
+    if value is None:
+        return 0.
+    try:
+        return max(0., float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0., (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return 0.
+
+
+def _sessionPath_(target):
+    """ Return the path of the file with the state of the upload session of the target """
+    return consts.PATH_UPLOAD_SESSIONS.joinpath(f'{hashlib.md5(str(target).encode()).hexdigest()}.json')
+
+
+def _saveSession_(pathSession, session):
+    """ Save the state of the upload session, replacing the previous one at once """
+    pathSession.parent.mkdir(parents=True, exist_ok=True)
+    pathTemp = pathSession.with_suffix('.tmp')
+    with open(pathTemp, 'w') as f:
+        json.dump(session, f)
+    os.replace(pathTemp, pathSession)
+
+
+def uploadResumable(client, pathFile, target, contentHash=None, chunkSize=None, log=None):
+    """ Upload the file pathFile to target (relative to the SharePoint folder) by chunks with an upload session of the
+     client, continuing the session saved by a previous upload of the same content if there is one.
+        contentHash: LibDataTransfer.hashFile of the file, it is computed if None
+        chunkSize: bytes of each chunk (consts.SP_CHUNK_SIZE)
+     Return True if the file was uploaded. The errors of the client are raised, so TransferPool.call retries them """
+    if not all(hasattr(client, method) for method in SESSION_METHODS):
+        return client.upload_large_file(local_file_path=pathFile, target_file_url=target)
+    chunkSize = consts.SP_CHUNK_SIZE if chunkSize is None else chunkSize
+    size = os.path.getsize(pathFile)
+    contentHash = LibDataTransfer.hashFile(pathFile) if contentHash is None else contentHash
+    pathSession = _sessionPath_(target)
+    session = None
+    if pathSession.is_file():
+        try:
+            with open(pathSession, 'r') as f:
+                session = json.load(f)
+        except (OSError, ValueError):
+            session = None
+    if session is None or session.get('hash') != contentHash or session.get('size') != size or \
+            session.get('target') != str(target):
+        session = {'target': str(target), 'uploadId': str(uuid.uuid4()), 'hash': contentHash, 'size': size,
+                   'offset': None}
+    resumedAt = session['offset']  # the offset of the saved session, None if it starts now
+    if resumedAt is not None:
+        Log.logMsg(f'<SPTransfer> Continuing the upload of {target} from byte {session["offset"]} of {size}', log)
+    with open(pathFile, 'rb') as f:
+        offset = session['offset'] or 0
+        f.seek(offset)
+        try:
+            while True:
+                data = f.read(chunkSize)
+                last = offset + len(data) >= size
+                if session['offset'] is None:
+                    if last:  # the whole file in one chunk
+                        client.finish_upload(target, session['uploadId'], 0, data)
+                        break
+                    offset = client.start_upload(target, session['uploadId'], data)
+                elif last:
+                    client.finish_upload(target, session['uploadId'], offset, data)
+                    break
+                else:
+                    offset = client.continue_upload(target, session['uploadId'], offset, data)
+                session['offset'] = offset
+                _saveSession_(pathSession, session)
+        except Exception as e:
+            # the saved session does not work (e.g. it expired in SharePoint): the first call after resuming it failed
+            # and it was not throttled, the next attempt starts over
+            if resumedAt is not None and offset == resumedAt and getRetryAfter(e) is None:
+                pathSession.unlink(missing_ok=True)
+            raise
+    pathSession.unlink(missing_ok=True)
+    return True
+
+
+class TransferPool:
+    """ Pool of threads for the transfers with SharePoint.
+        factory: callable returning a new client, called once by each thread
+        workers: number of threads (consts.SP_WORKERS)
+        retries: number of retries of each call (consts.SP_RETRIES)
+        backoff: seconds of the first wait, doubled on each retry (consts.SP_BACKOFF)
+        maxBackoff: maximum seconds of a wait (consts.SP_MAX_BACKOFF)
+    """
+
+    def __init__(self, factory, workers=None, retries=None, backoff=None, maxBackoff=None, log=None):
+        self.factory = factory
+        self.workers = max(1, consts.SP_WORKERS if workers is None else workers)
+        self.retries = consts.SP_RETRIES if retries is None else retries
+        self.backoff = consts.SP_BACKOFF if backoff is None else backoff
+        self.maxBackoff = consts.SP_MAX_BACKOFF if maxBackoff is None else maxBackoff
+        self.log = log
+        self._local_ = threading.local()
+        self._lock_ = threading.Lock()
+        self._pauseUntil_ = 0.  # time.monotonic() until all the threads wait, set by the throttled requests
+        self._executor_ = None
+
+    def __enter__(self):
+        self._executor_ = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='SPTransfer')
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._executor_.shutdown(wait=True)
+        self._executor_ = None
+
+    def client(self):
+        """ Return the client of the current thread, it is created the first time """
+        if getattr(self._local_, 'client', None) is None:
+            self._local_.client = self.factory()
+        return self._local_.client
+
+    def _wait_(self, seconds):
+        """ Wait the seconds and the pause set by a throttled request """
+        time.sleep(seconds)
+        with self._lock_:
+            pause = self._pauseUntil_ - time.monotonic()
+        if pause > 0:
+            time.sleep(pause)
+
+    def _throttle_(self, seconds):
+        """ Make all the threads wait the seconds before their next request """
+        with self._lock_:
+            self._pauseUntil_ = max(self._pauseUntil_, time.monotonic() + seconds)
+
+    def call(self, func, name='', retryFalse=True):
+        """ Return func(client) retrying it when it raises an exception, or when it returns False and retryFalse.
+         Return False if all the attempts failed """
+        for attempt in range(self.retries + 1):
+            self._wait_(0)
+            delay = min(self.maxBackoff, self.backoff * 2 ** attempt) + random.uniform(0, self.backoff)
+            retryAfter = None
+            try:
+                result = func(self.client())
+                if result is not False or not retryFalse:
+                    return result
+                msg = f'<SPTransfer> {name} failed'
+            except Exception as e:
+                retryAfter = getRetryAfter(e)
+                if retryAfter is not None:  # the wait is the pause of all the threads
+                    delay = min(self.maxBackoff, max(retryAfter, delay))
+                    self._throttle_(delay)
+                    msg = f'<SPTransfer> {name} was throttled by SharePoint'
+                else:
+                    msg = f'<SPTransfer> {name} failed: {e}'
+                    self._local_.client = None  # the session could be broken, start a new one
+            if attempt < self.retries:
+                Log.logMsg(f'{msg}, retrying in {delay:.1f} seconds ({attempt + 1}/{self.retries})', self.log, 'warn')
+                self._wait_(0 if retryAfter is not None else delay)
+            else:
+                Log.logMsg(f'{msg}, no more attempts', self.log, 'error')
+        return False
+
+    def submit(self, func, *args):
+        """ Run func(*args) in a thread of the pool, return its future """
+        return self._executor_.submit(func, *args)
+
+    def map(self, func, items, name=str):
+        """ Run func(item) for each item in the threads of the pool and return a dict with the result of each item.
+         The progress is logged with name(item) """
+        results = {}
+        futures = {self._executor_.submit(func, item): item for item in items}
+        for i, future in enumerate(as_completed(futures), start=1):
+            item = futures[future]
+            try:
+                results[item] = future.result()
+            except Exception as e:
+                Log.logMsg(f'<SPTransfer> Error with {name(item)}: {e}', self.log, 'error')
+                results[item] = False
+            Log.logMsg(f'File: {name(item)}, ({i}/{len(futures)})', self.log, 'live')
+        return results
+
+
+class Prefetcher:
+    """ Gets files in the background with the threads of a TransferPool, each path once.
+        pool: the TransferPool, it must be open (inside its with block)
+        job: function called with each path, e.g. to download the file. Its result is returned by wait()
+    """
+
+    def __init__(self, pool, job):
+        self.pool = pool
+        self.job = job
+        self._futures_ = {}
+
+    def prefetch(self, paths):
+        """ Start getting the paths that were not requested before, without waiting for them """
+        for path in paths:
+            if path not in self._futures_:
+                self._futures_[path] = self.pool.submit(self.job, path)
+
+    def wait(self, path):
+        """ Wait only for the path, it is requested now if it was not prefetched. Return the result of the job, or False
+         if it failed """
+        self.prefetch([path])
+        try:
+            return self._futures_[path].result()
+        except Exception as e:
+            Log.logMsg(f'<SPTransfer> Error getting {path}: {e}', self.pool.log, 'error')
+            return False
+
+    def waitAll(self):
+        """ Wait for all the paths requested """
+        for path in list(self._futures_):
+            self.wait(path)
@@ -0,0 +1,77 @@
+# -------------------------------------------------------------------------------
+# Name:        Storage
+# Purpose:     Create the clients of the permanent storage (SharePoint) used by the transfers, from the backend chosen in
+#              consts.STORAGE_BACKEND, so the transfers can use a local stand-in of SharePoint (see SPStandIn)
+#
+# Author:      Gesuri
+#
+# Created:     October 17, 2026
+# Copyright:   (c) Gesuri 2026
+# Licence:     Apache 2.0
+# -------------------------------------------------------------------------------
+
+# download_SP_files, upload_SP_files and check_and_upload_SP_files_v2 of ECS_Process_L0 get their clients from
+#   'newClient(log)' instead of creating office365_api.SharePoint, so they can be tested and measured without network.
+#
+# 1. Clients: any object with the methods of office365_api.SharePoint used by the transfers (METHODS):
+#       get_file_properties(file_name, folder_name) -> {'file_size': int, 'time_last_modified': datetime} or None
+#       download_large_file(file_name, folder_name, local_file_path) -> bool
+#       upload_large_file(local_file_path, target_file_url) -> bool
+#       rename_file(src, dst) -> bool
+#   The paths are relative to the SharePoint folder (consts.PATH_CLOUD locally). The clients can also have the methods
+#   of the upload sessions (see SPTransfer.uploadResumable). office365_api.SharePoint does not have them, so the uploads
+#   to SharePoint are not resumable, only the ones to the stand-in.
+#
+# 2. Backends: 'register(name, factory)' adds a backend, factory(log) returns a new client. The backends are:
+#   'sharepoint': office365_api.SharePoint of the MSSP_file_driver repository, imported the first time it is used.
+#   'standin': SPStandIn.StandInClient, the client of the local HTTP stand-in of SharePoint in consts.STORAGE_URL.
+#
+# Example:
+#   sp = Storage.newClient(log=log)
+#   properties = sp.get_file_properties('file.dat', 'Bahada/ECS/L1/Flux')
+
+import os
+import sys
+
+import consts
+
+METHODS = ('get_file_properties', 'download_large_file', 'upload_large_file', 'rename_file')
+
+_backends_ = {}
+
+
+def register(name, factory):
+    """ Add the backend name, factory(log) returns a new client """
+    _backends_[name] = factory
+
+
+def newClient(log=None, backend=None):
+    """ Return a new client of the backend (consts.STORAGE_BACKEND). Each thread of the transfers creates its own """
+    backend = consts.STORAGE_BACKEND if backend is None else backend
+    if backend not in _backends_:
+        raise ValueError(f'<Storage> Unknown backend {backend}, the backends are: {", ".join(_backends_)}')
+    client = _backends_[backend](log)
+    missing = [method for method in METHODS if not hasattr(client, method)]
+    if missing:
+        raise TypeError(f'<Storage> The client of the backend {backend} does not have: {", ".join(missing)}')
+    return client
+
+
+def _sharePoint_(log):
+    """ Return a new client of SharePoint """
+    # the path to the MSSP_file_driver folder, this a different repository
+    pathDriver = os.path.join(os.path.dirname(__file__), 'MSSP_file_driver')
+    if pathDriver not in sys.path:
+        sys.path.insert(0, pathDriver)
+    import office365_api
+    return office365_api.SharePoint(log=log)
+
+
+def _standIn_(log):
+    """ Return a new client of the local stand-in of SharePoint """
+    import SPStandIn
+    return SPStandIn.StandInClient(consts.STORAGE_URL, log=log)
+
+
+register('sharepoint', _sharePoint_)
+register('standin', _standIn_)
@@ -0,0 +1,171 @@
+# -------------------------------------------------------------------------------
+# Name:        Timing
+# Purpose:     Measure the time of each stage of the processing (named spans tagged with the site, table, rows and
+#              bytes) and write a report of the run, so the stages and tables that take the time of each night are known
+#
+# Author:      Gesuri
+#
+# Created:     October 17, 2026
+# Copyright:   (c) Gesuri 2026
+# Licence:     Apache 2.0
+# -------------------------------------------------------------------------------
+
+# The times of the processing are in lines of the logs ("created in X seconds", ElapsedTime), mixed with the rest of
+#   the lines. The spans keep the time of each stage in memory, and the report of the run aggregates them by stage,
+#   site and table.
+#
+# 1. Spans: 'span(name, **tags)' is a context manager that measures the time of its block. It yields the dict of the
+#   tags, so the block can add the ones known at the end (e.g. the rows read). 'timed(name)' is the same as a decorator.
+#   The names used are the stages of ECS_Process_L0: rename, header-scan, read_csv, clean, fuse, download, write-L1,
+#   resample and upload. The usual tags are site, table, rows and bytes.
+#
+# 2. Context: 'context(**tags)' adds the tags to all the spans of its block, also the ones of other threads (e.g. the
+#   downloads of the transfer pool). The tags of the span have priority.
+#
+# 3. Processes: each process keeps its spans. The workers of a process pool return them with 'takeSpans()' and the
+#   main process adds them with 'addSpans(spans)'. A forked process starts without the spans of its parent.
+#
+# 4. Report: 'writeReport(pathFolder)' writes run_<timestamp>.json (the total by stage, by stage, site and table, and
+#   all the spans) and run_<timestamp>.csv (the rows by stage, site and table) in consts.PATH_RUN_REPORTS.
+#
+# With consts.TIMING = False the spans are not recorded.
+#
+# Example:
+#   with Timing.span('read_csv', site='Bahada', table='Flux', bytes=size) as span:
+#       df = pd.read_csv(path)
+#       span['rows'] = len(df)
+
+import csv
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import Log
+import consts
+
+GROUP_BY = ('stage', 'site', 'table')  # keys of the rows of the report
+SUM_TAGS = ('rows', 'bytes')  # tags added in the report
+
+_spans_ = []  # finished spans of this process
+_context_ = {}  # tags of all the spans, see context()
+_lock_ = threading.Lock()
+_start_ = time.time()  # start of the run
+if hasattr(os, 'register_at_fork'):  # a forked worker starts without the spans of its parent
+    os.register_at_fork(after_in_child=_spans_.clear)
+
+
+@contextmanager
+def span(name, **tags):
+    """ Measure the time of the block as the stage name. Yields the tags, the block can add more """
+    if not consts.TIMING:
+        yield tags
+        return
+    start = time.time()
+    counter = time.perf_counter()
+    try:
+        yield tags
+    finally:
+        record(name, time.perf_counter() - counter, start, **tags)
+
+
+def timed(name, **tags):
+    """ Decorator that measures each call of the function as the stage name """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name, **tags):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def context(**tags):
+    """ Add the tags to the spans of the block, in all the threads """
+    global _context_
+    previous = _context_
+    _context_ = {**previous, **tags}
+    try:
+        yield
+    finally:
+        _context_ = previous
+
+
+def record(name, seconds, start=None, **tags):
+    """ Add a finished span of the stage name that took seconds, started at start (seconds since epoch), with the tags
+     of the context """
+    if not consts.TIMING:
+        return
+    item = {'stage': name, 'seconds': seconds, 'start': time.time() - seconds if start is None else start,
+            'pid': os.getpid(), **_context_, **tags}
+    with _lock_:
+        _spans_.append(item)
+
+
+def takeSpans():
+    """ Return the spans of this process and remove them, e.g. to return them from a worker of a process pool """
+    with _lock_:
+        spans = list(_spans_)
+        _spans_.clear()
+    return spans
+
+
+def addSpans(spans):
+    """ Add the spans of another process """
+    with _lock_:
+        _spans_.extend(spans)
+
+
+def summary(spans=None, by=GROUP_BY):
+    """ Return the spans (all the ones of this process if None) aggregated by the keys, a dict per group with the keys,
+     count, seconds, rows and bytes, sorted by seconds (the slowest first) """
+    if spans is None:
+        with _lock_:
+            spans = list(_spans_)
+    groups = {}
+    for item in spans:
+        key = tuple(item.get(k) for k in by)
+        group = groups.setdefault(key, {**dict(zip(by, key)), 'count': 0, 'seconds': 0., **{k: 0 for k in SUM_TAGS}})
+        group['count'] += 1
+        group['seconds'] += item['seconds']
+        for k in SUM_TAGS:
+            group[k] += int(item.get(k) or 0)
+    return sorted(groups.values(), key=lambda group: group['seconds'], reverse=True)
+
+
+def writeReport(pathFolder=None, log=None, **info):
+    """ Write the report of the run (json and csv) in pathFolder (consts.PATH_RUN_REPORTS), info is added to the json
+     file (e.g. the arguments of the run). Return the paths of the files, or None if it was not possible """
+    if not consts.TIMING:
+        return None
+    pathFolder = consts.PATH_RUN_REPORTS if pathFolder is None else pathFolder
+    with _lock_:
+        spans = list(_spans_)
+    end = time.time()
+    name = f'run_{datetime.fromtimestamp(_start_).strftime(consts.TIMESTAMP_FORMAT_FILES)}'
+    pathJson = pathFolder.joinpath(f'{name}.json')
+    pathCsv = pathFolder.joinpath(f'{name}.csv')
+    rows = summary(spans)
+    report = {'start': datetime.fromtimestamp(_start_).isoformat(), 'end': datetime.fromtimestamp(end).isoformat(),
+              'seconds': end - _start_, **info, 'stages': summary(spans, by=('stage',)), 'tables': rows,
+              'spans': spans}
+    try:
+        pathFolder.mkdir(parents=True, exist_ok=True)
+        with open(pathJson, 'w') as f:
+            json.dump(report, f, indent=1, default=str)
+        with open(pathCsv, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=[*GROUP_BY, 'count', 'seconds', *SUM_TAGS])
+            writer.writeheader()
+            writer.writerows(rows)
+    except OSError as e:
+        msg = f'<Timing> Not possible to write the report of the run in {pathFolder}: {e}'
+        if log is not None and isinstance(log, Log.Log):
+            log.error(msg)
+        else:
+            print(msg)
+        return None
+    return pathJson, pathCsv
@@ -53,7 +53,8 @@ dataloggers and tables, defining their attributes such as file names, folders, f
   - **Example**: `'nanValue'`.
 
 - **`INDEX_MAP_FUNC (function)`**:
-  - **Purpose**: Key to define a function used to map and format the index (typically timestamps).
+  - **Purpose**: Key to define a function used to map and format the index (typically timestamps). Functions marked
+    with `LibDataTransfer.vectorizedIndexMap` (e.g. `LibDataTransfer.datetime_format_HF_index`) get the whole index.
   - **Example**: `'indexMapFunc'`.
 
 - **`COLS_2_PLOT (list)`**:
@@ -72,6 +73,11 @@ dataloggers and tables, defining their attributes such as file names, folders, f
   - **Purpose**: Key to define if the table data should be resampled to a specific frequency (e.g., '1T' for 1 minute).
   - **Example**: `'resampled'`.
 
+- **`COLUMN_STORE (str or bool)`**:
+  - **Purpose**: Key to define if the L1 data of each day is also written as a column store of numpy arrays (see
+    `ColumnStore`), and the dtype of the values (e.g. `'float32'`). Used for the 10 Hz tables.
+  - **Example**: `'columnStore'`.
+
 ---
 
 ### Tables Configuration:
@@ -95,6 +101,7 @@ or define its own custom configuration.
 - **`COLS_2_PLOT`**: List of columns to plot (default: empty).
 - **`TIME_2_PLOT`**: Default plotting period (e.g., 30 days).
 - **`RESAMPLE`**: Default resampling setting (default: False).
+- **`COLUMN_STORE`**: Column store of the L1 data (default: False).
 
 ---
 
@@ -134,6 +141,7 @@ COLS_2_PLOT = 'cols2Plot'
 TIME_2_PLOT = 'time2Plot'
 PROJECT = 'project'
 RESAMPLE = 'resampled'
+COLUMN_STORE = 'columnStore'
 
 
 # Here is the definition of the tables. If you don't know what tables are of if there is a new table, the system will
@@ -159,7 +167,9 @@ TABLES = {
         ARCHIVE_AFTER: consts.DEFAULT_ARCHIVE_AFTER,
         # what will be the NaN value, the dafault here is -9999
         NAN_VALUE: consts.DEFAULT_NAN_VALUE,
-        # function to map the index of the table, eg. LibDataTransfer.datetime_format_HF for hourly frequency
+        # function to map the index of the table, eg. LibDataTransfer.datetime_format_HF for hourly frequency. The
+        # functions marked with LibDataTransfer.vectorizedIndexMap format the whole index at once, eg.
+        # LibDataTransfer.datetime_format_HF_index
         INDEX_MAP_FUNC: None,
         # column names to plot, eg. ["panel_temp_Avg", "batt_volt_Avg"]
         COLS_2_PLOT: [],
@@ -170,6 +180,9 @@ TABLES = {
         # additional table resampled. False|'1T' for 1 minute|'1H' for 1 hour|
         #   'D' for days|'S' for seconds|'L' for milliseconds
         RESAMPLE: False,
+        # the L1 data of each day is also written as a column store of numpy arrays (see ColumnStore). False or the
+        #   dtype of the values, e.g. 'float32'
+        COLUMN_STORE: False,
     },
     # Bahada
     'ts_data': {
@@ -182,8 +195,9 @@ TABLES = {
         #'saveL0TOB': DEFAULT_SAVE_L0_TOB,
         #'archiveAfter': DEFAULT_ARCHIVE_AFTER,
         #'nanValue': DEFAULT_NAN_VALUE,
-        INDEX_MAP_FUNC: LibDataTransfer.datetime_format_HF,
+        INDEX_MAP_FUNC: LibDataTransfer.datetime_format_HF_index,
         COLS_2_PLOT: ["CO2", "H2O", "t_hmp"],
+        COLUMN_STORE: False,  # 'float32' to keep the L1 data of each day also as a column store
     },
     'flux': {
         L1_FOLDER_NAME: 'Flux',
@@ -227,9 +241,10 @@ TABLES = {
         #'class': consts.CLASS_DYNAMIC,
         #'saveL0TOB': consts.DEFAULT_SAVE_L0_TOB,
         #'archiveAfter': consts.DEFAULT_ARCHIVE_AFTER,
-        INDEX_MAP_FUNC: LibDataTransfer.datetime_format_HF,
+        INDEX_MAP_FUNC: LibDataTransfer.datetime_format_HF_index,
         COLS_2_PLOT: ["CO2", "H2O", "t_hmp"],
         RESAMPLE: '1T',
+        COLUMN_STORE: False,  # 'float32' to keep the L1 data of each day also as a column store
     },
     # Pecan5R
     'Config_Setting_Notes': {  ## TO REMOVE
@@ -245,7 +260,7 @@ TABLES = {
         CLASS: consts.CLASS_STATIC,
         #'saveL0TOB': consts.DEFAULT_SAVE_L0_TOB,
         #'archiveAfter': consts.DEFAULT_ARCHIVE_AFTER,
-        INDEX_MAP_FUNC: lambda x: LibDataTransfer.datetime_format(x, 3),
+        INDEX_MAP_FUNC: LibDataTransfer.vectorizedIndexMap(lambda x: LibDataTransfer.datetime_format_index(x, 3)),
     },
     'CPIStatus': {
         #'l1FolderName': 'CPIStatus',
@@ -256,7 +271,7 @@ TABLES = {
         CLASS: consts.CLASS_STATIC,
         #'saveL0TOB': consts.DEFAULT_SAVE_L0_TOB,
         #'archiveAfter': consts.DEFAULT_ARCHIVE_AFTER,
-        INDEX_MAP_FUNC: lambda x: LibDataTransfer.datetime_format(x, 3),
+        INDEX_MAP_FUNC: LibDataTransfer.vectorizedIndexMap(lambda x: LibDataTransfer.datetime_format_index(x, 3)),
         #'cols2Plot': [],
     },
     'Diagnostic': {
@@ -284,7 +299,7 @@ TABLES = {
         FREQUENCY: consts.FREQ_10HZ,
         L1_NAME_POSTFIX: consts.TIMESTAMP_FORMAT_DAILY,
         L1_FILE_FREQUENCY: consts.FREQ_DAILY,
-        INDEX_MAP_FUNC: LibDataTransfer.datetime_format_HF,
+        INDEX_MAP_FUNC: LibDataTransfer.datetime_format_HF_index,
     },
     'System_Operatn_Notes': {  ## TO REMOVE
         FREQUENCY: consts.FREQ_STATIC,
@@ -304,7 +319,7 @@ TABLES = {
         L1_NAME_POSTFIX: consts.TIMESTAMP_FORMAT_DAILY,
         FREQUENCY: consts.FREQ_2HZ,
         L1_FILE_FREQUENCY: consts.FREQ_DAILY,
-        INDEX_MAP_FUNC: LibDataTransfer.datetime_format_HF,
+        INDEX_MAP_FUNC: LibDataTransfer.datetime_format_HF_index,
     },
     'SiteAvg': {
         'l1NamePostfix': consts.TIMESTAMP_FORMAT_YEARLY,
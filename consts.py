@@ -80,6 +80,44 @@ from Campbell Scientific dataloggers.
   - **Purpose**: Directory where files that failed to upload are stored.
   - **Default**: `PATH_HARVESTED_DATA.joinpath('NotUploaded')`.
 
+- **`PATH_L1_SIDECAR (Path)`**:
+  - **Purpose**: Directory where the sidecars of the L1 files are stored (see `L1_SIDECAR`), with the same folders than
+    in `PATH_CLOUD`. They are only local, they are not uploaded to SharePoint.
+  - **Default**: `PATH_HARVESTED_DATA.joinpath('L1Sidecar')`.
+
+- **`PATH_CATALOG (Path)`**:
+  - **Purpose**: SQLite database with the catalog of the L0 and L1 files (see `CATALOG` and the `Catalog` module).
+  - **Default**: `PATH_HARVESTED_DATA.joinpath('Catalog', 'files.sqlite')`.
+
+- **`PATH_UPLOAD_JOURNAL (Path)`**:
+  - **Purpose**: Folder with the journals of the files written in `PATH_CLOUD` (see `UPLOAD_JOURNAL` and the `Journal`
+    module).
+  - **Default**: `PATH_HARVESTED_DATA.joinpath('Journal')`.
+
+- **`PATH_UPLOAD_SESSIONS (Path)`**:
+  - **Purpose**: Folder with the state (upload id, content hash and offset) of the uploads by chunks that did not
+    finish, so they continue where they stopped (see `SPTransfer.uploadResumable` and `SP_CHUNK_SIZE`).
+  - **Default**: `PATH_HARVESTED_DATA.joinpath('UploadSessions')`.
+
+- **`PATH_RUN_REPORTS (Path)`**:
+  - **Purpose**: Folder with the reports of the runs of `ECS_Process_L0` (see `TIMING` and the `Timing` module).
+  - **Default**: `PATH_GENERAL_LOGS.joinpath('RunReports')`.
+
+- **`PATH_QC (Path)`**:
+  - **Purpose**: Directory with the QC sidecars of the L0 and L1 files (see `QC_SIDECAR` and the `Completeness`
+    module), with the same folders than in `PATH_CLOUD`. They are only local, they are not uploaded to SharePoint.
+  - **Default**: `PATH_HARVESTED_DATA.joinpath('QC')`.
+
+- **`PATH_L1_STORE (Path)`**:
+  - **Purpose**: Directory with the column stores of the L1 data of the 10 Hz tables (see `config.COLUMN_STORE` and the
+    `ColumnStore` module), with the same folders than the L1 files in `PATH_CLOUD`. They are only local, they are not
+    uploaded to SharePoint.
+  - **Default**: `PATH_HARVESTED_DATA.joinpath('L1Store')`.
+
+- **`NATIVE_TOB_READER (bool)`**:
+  - **Purpose**: Read the TOB files with `ReaderCambellsciData` instead of converting them with `tob32.exe`.
+  - **Default**: `False`.
+
 ---
 
 ### File Structure and Metadata:
@@ -200,6 +238,106 @@ from Campbell Scientific dataloggers.
   - **Purpose**: Default time after which files are archived.
   - **Default**: `2 years`.
 
+- **`STREAMING_MIN_FILE_SIZE (int)`**:
+  - **Purpose**: L0 files of daily stored tables bigger than this size (bytes) are read by chunks, one day at a time.
+  - **Default**: `512 MiB`.
+
+- **`STREAMING_CHUNK_ROWS (int)`**:
+  - **Purpose**: Number of rows read on each chunk in streaming mode.
+  - **Default**: `864000` (one day of 10 Hz data).
+
+- **`L1_INCREMENTAL_WRITE (bool)`**:
+  - **Purpose**: Append the new L0 data at the end of the L1 file, without reading and rewriting it, when the headers
+    are the same and all the data is after the last line of the L1 file. Otherwise the files are fused and rewritten.
+  - **Default**: `False`.
+
+- **`L1_SIDECAR (bool)`**:
+  - **Purpose**: When a L1 file is written, a columnar copy of its data (Feather file, needs `pyarrow`) is written in
+    `PATH_L1_SIDECAR`, tagged with the header lines and the hash of the csv file. When the L1 file is read again, e.g.
+    to fuse new data, the sidecar is read instead of the csv file if the hash is still the same.
+  - **Default**: `False`. Without `pyarrow` there are no sidecars.
+
+- **`CATALOG (bool)`**:
+  - **Purpose**: Keep a local SQLite catalog (`PATH_CATALOG`) of the files read by `InfoFile` and written by
+    `LibDataTransfer.writeDF2csv`: header, first and last timestamps, rows, size and what was uploaded to SharePoint.
+    It is used to check the L1 files without reading them and to skip the uploads and the SharePoint queries of the
+    files that did not change.
+  - **Default**: `False`.
+
+- **`CATALOG_TIMESTAMP_FORMAT (str)`**:
+  - **Purpose**: Format of the timestamps in the catalog, text that sorts like the timestamps.
+  - **Default**: `'%Y-%m-%d %H:%M:%S.%f'`.
+
+- **`L1_BATCH_MAX_SIZE (int)`**:
+  - **Purpose**: When there are several L0 files of the same table (e.g. after a network outage), their data is fused
+    and each L1 file is read and written once for all of them. This is the maximum size in bytes of the L0 files of a
+    batch, to limit the memory.
+  - **Default**: `512 * 1024 * 1024` (512 MB).
+
+- **`PROCESS_WORKERS (int)`**:
+  - **Purpose**: Number of processes used by `ECS_Process_L0.run()`. The files of the same site, datalogger and table
+    are processed in order by the same worker, each worker with its own log file. Can be changed with `-w`.
+  - **Default**: `1` (one file after the other).
+
+- **`UPLOAD_JOURNAL (bool)`**:
+  - **Purpose**: `upload_SP_files` uploads only the files written in `PATH_CLOUD` since the last upload, from the
+    journal written by `LibDataTransfer` and `Log`, instead of walking `PATH_CLOUD`. The walk of the
+    files modified in the last 7 days is done with `-r` (reconcile) or when this is `False`.
+  - **Default**: `False`.
+
+- **`L1_PREFETCH (bool)`**:
+  - **Purpose**: Download the L1 files from SharePoint in the background (`SPTransfer.Prefetcher`) as soon as
+    `InfoFile` knows them from the timestamps of the header scan, while the L0 files are parsed. Each L1 file is waited
+    for only before it is written, and it is downloaded once for all the batches of the table.
+  - **Default**: `True`. The L1 files downloaded, written and uploaded are the same as without it, only earlier.
+
+- **`SP_WORKERS (int)`**:
+  - **Purpose**: Number of files uploaded or downloaded at the same time by `upload_SP_files` and `download_SP_files`
+    (see `SPTransfer`). Each thread authenticates once and reuses its session.
+  - **Default**: `8`.
+
+- **`SP_RETRIES (int)`**, **`SP_BACKOFF (float)`**, **`SP_MAX_BACKOFF (float)`**:
+  - **Purpose**: Retries of each SharePoint request and the seconds of the first wait, doubled on each retry up to
+    `SP_MAX_BACKOFF`. The throttled requests (429/503) wait the time of their `Retry-After` header.
+  - **Default**: `4`, `2.` and `120.`.
+
+- **`SP_CHUNK_SIZE (int)`**:
+  - **Purpose**: Bytes of each chunk of the uploads with upload sessions (`SPTransfer.uploadResumable`). The offset is
+    saved in `PATH_UPLOAD_SESSIONS` after each chunk, so an interrupted upload loses at most one chunk.
+  - **Default**: `10 * 1024 * 1024` (10 MB).
+
+- **`STORAGE_BACKEND (str)`**, **`STORAGE_URL (str)`**:
+  - **Purpose**: Backend of the clients of the transfers with SharePoint (see `Storage`). `'sharepoint'` uses
+    `office365_api.SharePoint`, `'standin'` uses the local HTTP stand-in of SharePoint (see `SPStandIn`) running in
+    `STORAGE_URL`, to test and tune the transfers without network.
+  - **Default**: `'sharepoint'` and `'http://127.0.0.1:8765'`.
+
+- **`LOG_ASYNC (bool)`**:
+  - **Purpose**: The lines of the logs are queued and a writer thread prints them and writes them in the log files
+    (`Log.setAsync`), so the processing does not wait for the console or the disk. `Log.flush()` waits for the queued
+    lines.
+  - **Default**: `False`.
+
+- **`TIMING (bool)`**:
+  - **Purpose**: Measure the time of each stage of `ECS_Process_L0` (rename, header-scan, read_csv, clean, fuse,
+    download, write-L1, resample and upload), tagged with the site, table, rows and bytes, and write the report of the
+    run (json and csv) in `PATH_RUN_REPORTS` at the end of the script.
+  - **Default**: `False`.
+
+- **`L1_NORMALIZED (bool)`**:
+  - **Purpose**: The L1 files written by `ECS_Process_L0` are recorded in the catalog as normalized with their frequency
+    (sorted, without duplicated timestamps, on the frequency and with the flags as missing values). When `InfoFile`
+    reads one that did not change, the cleaning (`setFragmentation`, `cleanDataFrame` and its `fuseDataFrame`) is
+    skipped, so merging new data into a L1 file fuses the data once. Needs `CATALOG`.
+  - **Default**: `False`.
+
+- **`QC_SIDECAR (bool)`**:
+  - **Purpose**: Save the completeness of the data of each file (missing percentage by day and column and the longest
+    gap of each column, see `Completeness`) as a QC sidecar in `PATH_QC`, instead of logging a line per day: of the L0
+    files when `InfoFile.checkData` reads them and of the L1 files when `LibDataTransfer.writeDF2csv` writes them. The
+    report of a L1 file that did not change since it was written is read from its sidecar.
+  - **Default**: `False`.
+
 ---
 
 ### Usage:
@@ -245,7 +383,16 @@ PATH_GENERAL_LOGS = PATH_CLOUD.joinpath('Logs')  # Where the logs are saved
 # Where the files that are not processed for some reason are saved
 PATH_CHECK_FILES = PATH_HARVESTED_DATA.joinpath('CheckFiles')
 PATH_FILES_NOT_UPLOADED = PATH_HARVESTED_DATA.joinpath('NotUploaded')  # Where the files that are not uploaded are saved
+PATH_L1_SIDECAR = PATH_HARVESTED_DATA.joinpath('L1Sidecar')  # Where the sidecars of the L1 files are saved
+PATH_CATALOG = PATH_HARVESTED_DATA.joinpath('Catalog', 'files.sqlite')  # SQLite catalog of the L0 and L1 files
+PATH_UPLOAD_JOURNAL = PATH_HARVESTED_DATA.joinpath('Journal')  # journals of the files written in PATH_CLOUD
+PATH_UPLOAD_SESSIONS = PATH_HARVESTED_DATA.joinpath('UploadSessions')  # state of the interrupted uploads
+PATH_RUN_REPORTS = PATH_GENERAL_LOGS.joinpath('RunReports')  # time of each stage of the runs, json and csv files
+PATH_QC = PATH_HARVESTED_DATA.joinpath('QC')  # Where the QC sidecars (completeness of the data) of the files are saved
+PATH_L1_STORE = PATH_HARVESTED_DATA.joinpath('L1Store')  # Where the column stores of the 10 Hz L1 data are saved
 TOB2PROG = Path(__file__).parent.resolve().joinpath('Programs')
+# read the TOB files with ReaderCambellsciData instead of converting them to TOA with the tob32.exe
+NATIVE_TOB_READER = False
 
 # Campbell Scientific files, Meta data info
 # header metadata first line info position
@@ -362,3 +509,43 @@ FREQ_STATIC = -1  # default frequency for static tables
 DEFAULT_SAVE_L0_TOB = True  # default value for saveL0TOB
 DEFAULT_ARCHIVE_AFTER = datetime.timedelta(days=2*365)  # default value for archiveAfter
 DEFAULT_NAN_VALUE = FLAG  # default value for nanValue
+
+# streaming ingestion, files of tables stored in daily L1 files are read by chunks if they are bigger than this size
+STREAMING_MIN_FILE_SIZE = 512 * 1024 * 1024  # bytes
+STREAMING_CHUNK_ROWS = 864000  # rows read on each chunk, one day of 10 Hz data
+# append the new data at the end of the L1 file, without reading and rewriting it, when it is after its last line
+L1_INCREMENTAL_WRITE = False
+# write a columnar copy (Feather, needs pyarrow) of each L1 file in PATH_L1_SIDECAR, read instead of the csv file
+L1_SIDECAR = False
+# keep the catalog of the L0 and L1 files (header, time range, rows, size, upload) in PATH_CATALOG
+CATALOG = False
+CATALOG_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S.%f'  # timestamps in the catalog, as text that can be compared
+# maximum size of the L0 files fused together before writing the L1 files
+L1_BATCH_MAX_SIZE = 512 * 1024 * 1024  # bytes
+# number of processes of ECS_Process_L0.run(), the files of different sites and tables are processed at the same time.
+# 1 to process the files one after the other
+PROCESS_WORKERS = 1
+
+# upload only the files written in PATH_CLOUD since the last upload (Journal), instead of walking PATH_CLOUD
+UPLOAD_JOURNAL = False
+# download the L1 files in the background while the L0 files are read, each L1 file is waited for before writing it
+L1_PREFETCH = True
+# transfers with SharePoint: files at the same time, retries of each request and the seconds of the first wait of the
+# exponential backoff, and the maximum wait
+SP_WORKERS = 8
+SP_RETRIES = 4
+SP_BACKOFF = 2.
+SP_MAX_BACKOFF = 120.
+SP_CHUNK_SIZE = 10 * 1024 * 1024  # bytes of each chunk of the resumable uploads
+# storage of the transfers (see Storage): 'sharepoint', or 'standin' for the local stand-in of SharePoint in STORAGE_URL
+STORAGE_BACKEND = 'sharepoint'
+STORAGE_URL = 'http://127.0.0.1:8765'
+# the lines of the logs are written by a writer thread, the callers only queue them
+LOG_ASYNC = False
+# time of each stage of the processing by site and table, written in PATH_RUN_REPORTS at the end of the run
+TIMING = False
+# the L1 files written by the pipeline (already clean, see Catalog.getNormalized) are not cleaned again when they are read
+L1_NORMALIZED = False
+# save the completeness of the data of each file read (InfoFile.checkData) in PATH_QC, and read it instead of computing
+# it again for the L1 files that did not change
+QC_SIDECAR = False
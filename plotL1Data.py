@@ -25,10 +25,14 @@ def plotL1Data(infoFile):
     # check if there are fields to plot
     if len(infoFile.metaTable[config.COLS_2_PLOT]) == 0:
         raise ValueError('There are no fields to plot')
-    lastData = infoFile.df.loc[fromTime:toTime]
+    # the tables with column store read only the window to plot from the disk, without loading the whole days
+    lastData = infoFile.readStore(fromTime, toTime, infoFile.metaTable[config.COLS_2_PLOT])
+    data = infoFile.df if lastData is None else lastData
+    if lastData is None:
+        lastData = infoFile.df.loc[fromTime:toTime]
     #lastData[infoFile.metaTable[config.COLS_2_PLOT]].plot()
     for item in infoFile.metaTable[config.COLS_2_PLOT]:
-        infoFile.df[item].plot()
+        data[item].plot()
         plt.savefig(f'{infoFile.f_site_r}_{infoFile.f_project}_{infoFile.st_tableName}.jpg')
         plt.show()
 
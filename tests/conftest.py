@@ -0,0 +1,31 @@
+# -------------------------------------------------------------------------------
+# Name:        conftest
+# Purpose:     Fixtures of the tests: the modules of the processing in the path and a sandbox of the consts.PATH_*
+#
+# Author:      Gesuri
+#
+# Created:     October 17, 2026
+# Copyright:   (c) Gesuri 2026
+# Licence:     Apache 2.0
+# -------------------------------------------------------------------------------
+
+# Run from the folder of the repository: python -m pytest -q tests
+#   The tests that write files use the 'sandbox' fixture (Benchmark/Harness.Sandbox), so the consts.PATH_* point to a
+#   temporal folder and the real data is not touched.
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # the modules of the processing
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.joinpath('Benchmark')))
+
+import Harness
+
+
+@pytest.fixture
+def sandbox():
+    """ Yield an open Harness.Sandbox, removed at the end of the test """
+    with Harness.Sandbox(quiet=True) as box:
+        yield box
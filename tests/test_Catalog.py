@@ -0,0 +1,55 @@
+# -------------------------------------------------------------------------------
+# Name:        test_Catalog
+# Purpose:     Tests of the catalog of the L0 and L1 files
+#
+# Author:      Gesuri
+#
+# Created:     October 17, 2026
+# Copyright:   (c) Gesuri 2026
+# Licence:     Apache 2.0
+# -------------------------------------------------------------------------------
+
+import os
+
+import pandas as pd
+import pytest
+
+import Catalog
+import LibDataTransfer
+import consts
+
+
+@pytest.fixture
+def pathFile(sandbox, monkeypatch):
+    """ A L1 file written normalized and uploaded """
+    monkeypatch.setattr(consts, 'CATALOG', True)
+    pathFile = consts.PATH_CLOUD.joinpath('Bahada', 'CR3000', 'L1', 'Flux', 'Bahada_CR3000_flux_L1_2026.csv')
+    pathFile.parent.mkdir(parents=True)
+    pathFile.write_text('"TOA5"\n"2026-03-01 00:00:00",0,1.5\n')
+    contentHash = LibDataTransfer.hashFile(pathFile)
+    Catalog.recordFile(pathFile, ['"TOA5"'], pd.Timestamp('2026-03-01'), pd.Timestamp('2026-03-01'), 1,
+                       normalized=pd.Timedelta('30min'), contentHash=contentHash)
+    Catalog.recordUpload(pathFile, contentHash)
+    return pathFile
+
+
+def _download_(pathFile, text):
+    """ Write text as the file downloaded, with a newer mtime """
+    stat = pathFile.stat()
+    pathFile.write_text(text)
+    os.utime(pathFile, (stat.st_atime, stat.st_mtime + 60))
+    return Catalog.recordDownload(pathFile, LibDataTransfer.hashFile(pathFile))
+
+
+def test_download_of_the_same_content(pathFile):
+    assert _download_(pathFile, pathFile.read_text())
+    assert Catalog.getContentHash(pathFile) == LibDataTransfer.hashFile(pathFile)
+    assert Catalog.getNormalized(pathFile) == pd.Timedelta('30min')
+
+
+def test_download_changed_with_the_same_size(pathFile):
+    text = pathFile.read_text()
+    assert not _download_(pathFile, text.replace('1.5', '2.5'))  # changed in SharePoint, the same size
+    assert Catalog.getContentHash(pathFile) is None
+    assert Catalog.getNormalized(pathFile) is None
+    assert not Catalog.isUploaded(pathFile, LibDataTransfer.hashFile(pathFile))
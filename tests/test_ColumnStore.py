@@ -0,0 +1,46 @@
+# -------------------------------------------------------------------------------
+# Name:        test_ColumnStore
+# Purpose:     Tests of the column store of the 10 Hz L1 data
+#
+# Author:      Gesuri
+#
+# Created:     October 17, 2026
+# Copyright:   (c) Gesuri 2026
+# Licence:     Apache 2.0
+# -------------------------------------------------------------------------------
+
+import numpy as np
+import pandas as pd
+
+import ColumnStore
+import InfoFile
+import Journal
+import SyntheticData
+import config
+import consts
+
+
+def test_write_and_read_day(sandbox, monkeypatch):
+    monkeypatch.setattr(consts, 'UPLOAD_JOURNAL', True)
+    index = pd.date_range('2026-03-01', periods=100, freq='100ms')
+    df = pd.DataFrame({'Ux': np.arange(100, dtype=float), 'Uy': np.full(100, consts.FLAG)}, index=index)
+    pathStore = consts.PATH_L1_STORE.joinpath('day')
+    assert ColumnStore.writeDay(pathStore, df, ['header'])
+    window = ColumnStore.readDay(pathStore, index[10], index[19])
+    assert window.index.equals(index[10:20])
+    assert window['Ux'].tolist() == list(range(10, 20))
+    assert window['Uy'].isna().all()
+    assert Journal.takeDirty() == []  # the stores are not uploaded
+
+
+def test_store_is_kept_after_upload(sandbox, monkeypatch):
+    monkeypatch.setitem(config.TABLES['ts_data'], config.COLUMN_STORE, 'float32')
+    SyntheticData.makeFiles(consts.PATH_HARVESTED_DATA, days=1, hours=1, tables=['ts_data'])
+    with sandbox.process() as ECS_Process_L0:
+        ECS_Process_L0.run()
+    assert not [item for item in sandbox.pathSharePoint.rglob('*') if 'header.json' in item.name]
+    assert list(consts.PATH_L1_STORE.rglob(ColumnStore.HEADER_FILE))
+    pathL1 = next(consts.PATH_TEMP_BACKUP.rglob('*_ts_L1_*.csv'))
+    start = pd.Timestamp(SyntheticData.START)
+    df = InfoFile.InfoFile(pathL1).readStore(start, start + pd.Timedelta(days=1))
+    assert len(df) == 36000
@@ -0,0 +1,62 @@
+# -------------------------------------------------------------------------------
+# Name:        test_Completeness
+# Purpose:     Tests of the daily completeness and of the QC sidecars of the L1 files
+#
+# Author:      Gesuri
+#
+# Created:     October 17, 2026
+# Copyright:   (c) Gesuri 2026
+# Licence:     Apache 2.0
+# -------------------------------------------------------------------------------
+
+import os
+
+import numpy as np
+import pandas as pd
+
+import Catalog
+import Completeness
+import LibDataTransfer
+import consts
+
+HEADER = ['"TOA5","Bahada","CR3000","1234","CR3000.Std.32","CPU:flux.CR3","5678","flux"',
+          '"TIMESTAMP","RECORD","a","b"', '"TS","RN","",""', '"","","Avg","Avg"']
+
+
+def _frame_():
+    index = pd.date_range('2026-03-01 12:00', periods=96, freq='30min')
+    df = pd.DataFrame({'RECORD': np.arange(96), 'a': np.arange(96, dtype=float), 'b': np.arange(96, dtype=float)},
+                      index=index)
+    df.iloc[:10, 1] = np.nan
+    df.iloc[50:, 2] = consts.FLAG
+    return df
+
+
+def test_daily_completeness():
+    report = Completeness.dailyCompleteness(_frame_().replace(consts.FLAG, np.nan))
+    assert report.loc[Completeness.RECORDS, '2026-03-01'] == 24
+    assert report.loc['a', '2026-03-01'] == 10 / 24 * 100
+    assert report.loc['b', 'longestGap'] == 46
+    assert report.loc['b', 'longestGapStart'] == pd.Timestamp('2026-03-02 13:00')
+
+
+def test_l1_qc_written_with_the_file(sandbox, monkeypatch):
+    monkeypatch.setattr(consts, 'CATALOG', True)
+    monkeypatch.setattr(consts, 'QC_SIDECAR', True)
+    pathFile = consts.PATH_CLOUD.joinpath('Bahada', 'CR3000', 'L1', 'Flux', 'Bahada_CR3000_flux_L1_2026.csv')
+    df = _frame_()
+    expected = Completeness.dailyCompleteness(df.replace(consts.FLAG, np.nan))
+    LibDataTransfer.writeDF2csv(pathFile, df, HEADER, indexMapFunc=LibDataTransfer.datetime_format)
+    assert Catalog.getContentHash(pathFile) == LibDataTransfer.hashFile(pathFile)
+    report = Completeness.readQC(pathFile)
+    pd.testing.assert_frame_equal(report, expected, check_dtype=False)
+    # uploaded and downloaded again: other mtime, the same content recorded in the catalog
+    Catalog.recordUpload(pathFile, Catalog.getContentHash(pathFile))
+    stat = pathFile.stat()
+    os.utime(pathFile, (stat.st_atime, stat.st_mtime + 60))
+    Catalog.recordDownload(pathFile, LibDataTransfer.hashFile(pathFile))
+    assert Completeness.readQC(pathFile) is not None
+    # changed
+    with open(pathFile, 'a') as f:
+        f.write('"2026-03-03 12:00:00",96,1,2\n')
+    assert Completeness.readQC(pathFile) is None
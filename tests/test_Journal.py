@@ -0,0 +1,29 @@
+# -------------------------------------------------------------------------------
+# Name:        test_Journal
+# Purpose:     Tests of the journal of the files written in PATH_CLOUD
+#
+# Author:      Gesuri
+#
+# Created:     October 17, 2026
+# Copyright:   (c) Gesuri 2026
+# Licence:     Apache 2.0
+# -------------------------------------------------------------------------------
+
+import os
+
+import Journal
+import consts
+
+
+def test_taken_journal_of_an_interrupted_upload_is_kept(sandbox, monkeypatch):
+    monkeypatch.setattr(consts, 'UPLOAD_JOURNAL', True)
+    first, second = consts.PATH_CLOUD.joinpath('first.csv'), consts.PATH_CLOUD.joinpath('second.csv')
+    first.write_text('1')
+    second.write_text('2')
+    Journal.markDirty(first)
+    assert Journal.takeDirty() == [first]  # the upload is interrupted, doneDirty is not called
+    Journal.markDirty(second)  # the same pid, e.g. used again by a new process
+    assert sorted(Journal.takeDirty()) == [first, second]
+    assert len(list(consts.PATH_UPLOAD_JOURNAL.glob(f'dirty_{os.getpid()}_*.taken'))) == 2
+    Journal.doneDirty()
+    assert Journal.takeDirty() == []
@@ -0,0 +1,122 @@
+# -------------------------------------------------------------------------------
+# Name:        test_LibDataTransfer
+# Purpose:     Tests of the vectorized functions of LibDataTransfer against the functions they replace
+#
+# Author:      Gesuri
+#
+# Created:     October 17, 2026
+# Copyright:   (c) Gesuri 2026
+# Licence:     Apache 2.0
+# -------------------------------------------------------------------------------
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import LibDataTransfer
+import consts
+
+
+def _duplicated_(seed):
+    """ Return a sorted dataframe with duplicated timestamps and missing values, so several rows of a timestamp have
+     the same number of values """
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2026-03-01', periods=200, freq='100ms')
+    index = index[np.sort(rng.integers(0, len(index), 500))]
+    values = rng.normal(size=(len(index), 4))
+    values[rng.random(values.shape) < 0.3] = np.nan
+    df = pd.DataFrame(values, index=index, columns=['Ux', 'Uy', 'Uz', 'Ts'])
+    df['RECORD'] = np.arange(len(df))  # to know which row was kept
+    return df
+
+
+def _customKeep_(df):
+    """ The duplicated index resolution of fuseDataFrame before dropDuplicatedIndex """
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        result = df.groupby(df.index).apply(LibDataTransfer.custom_keep)
+    result.index = result.index.droplevel(0)
+    return result
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_dropDuplicatedIndex_as_custom_keep(seed):
+    df = _duplicated_(seed)
+    assert df.index.duplicated().any()
+    expected = _customKeep_(df)
+    result = LibDataTransfer.dropDuplicatedIndex(df)
+    assert result.index.equals(expected.index)
+    # the same row where only one has the most values, on a tie custom_keep keeps any of them (see custom_keep)
+    score = df.notna().sum(axis=1)
+    best = score.groupby(level=0).max()
+    unique = (score == best.reindex(score.index)).groupby(level=0).sum() == 1
+    pd.testing.assert_frame_equal(result[unique.values], expected[unique.values])
+    assert (result.notna().sum(axis=1) == best).all()
+    assert (expected.notna().sum(axis=1) == best).all()
+
+
+def test_dropDuplicatedIndex_ties():
+    index = pd.DatetimeIndex(['2026-03-01 00:00', '2026-03-01 00:00', '2026-03-01 00:00', '2026-03-01 00:00',
+                              '2026-03-01 00:01'])
+    df = pd.DataFrame({'a': [1., np.nan, 3., 4.], 'b': [1., 2., 3., np.nan], 'RECORD': [0, 1, 2, 3]}, index=index[:4])
+    df = pd.concat([df, pd.DataFrame({'a': [5.], 'b': [np.nan], 'RECORD': [4]}, index=index[4:])])
+    assert LibDataTransfer.dropDuplicatedIndex(df, keep='last')['RECORD'].tolist() == [2, 4]
+    assert LibDataTransfer.dropDuplicatedIndex(df, keep='first')['RECORD'].tolist() == [0, 4]
+
+
+INDEXES = {
+    '10Hz': pd.date_range('2026-03-01 23:59:58', periods=50, freq='100ms'),
+    'milliseconds': pd.date_range('2026-03-01 10:54:38.219', periods=50, freq='1ms'),
+    'microseconds': pd.DatetimeIndex(['2026-03-01 00:00:02.95', '2026-03-01 00:00:02.99999', '2026-03-01 00:00:59.96',
+                                      '2026-12-31 23:59:59.999999', '2026-03-01 00:00:00.000001']),
+    'seconds': pd.date_range('2026-12-31 23:58:00', periods=200, freq='1s'),
+    'trailingZeros': pd.DatetimeIndex(['2026-07-19 10:59:38.24', '2026-07-19 10:59:38.2', '2026-07-19 10:59:38.200',
+                                       '2026-07-19 10:59:38.010', '2026-07-19 10:59:38.100000']),
+    'before1970': pd.date_range('1969-12-31 23:59:59', periods=30, freq='100ms').append(
+        pd.DatetimeIndex(['1960-02-29 12:00:00.123', '1901-01-01 00:00:00.5'])),
+}
+
+
+@pytest.mark.parametrize('name', INDEXES)
+def test_datetime_format_HF_index(name):
+    index = INDEXES[name]
+    expected = index.map(LibDataTransfer.datetime_format_HF)
+    assert LibDataTransfer.datetime_format_HF_index(index).tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize('name', INDEXES)
+def test_datetime_format_index(name):
+    index = INDEXES[name]
+    for numDec in [1, 3, 6]:
+        expected = index.map(lambda x: LibDataTransfer.datetime_format(x, numDec))
+        assert LibDataTransfer.datetime_format_index(index, numDec).tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize('vectorized, rows', [
+    (LibDataTransfer.datetime_format_HF_index, LibDataTransfer.datetime_format_HF),
+    (LibDataTransfer.vectorizedIndexMap(lambda x: LibDataTransfer.datetime_format_index(x, 3)),
+     lambda x: LibDataTransfer.datetime_format(x, 3))])
+def test_writeDF2csv_vectorized_index(tmp_path, vectorized, rows):
+    index = INDEXES['10Hz'].append(INDEXES['milliseconds'])
+    df = pd.DataFrame({'RECORD': np.arange(len(index)), 'Ux': np.linspace(-1, 1, len(index))}, index=index)
+    LibDataTransfer.writeDF2csv(tmp_path.joinpath('vectorized.csv'), df.copy(), indexMapFunc=vectorized)
+    LibDataTransfer.writeDF2csv(tmp_path.joinpath('rows.csv'), df.copy(), indexMapFunc=rows)
+    assert tmp_path.joinpath('vectorized.csv').read_bytes() == tmp_path.joinpath('rows.csv').read_bytes()
+
+
+@pytest.mark.parametrize('flag, hashes', [(None, 0), ('CATALOG', 1), ('L1_SIDECAR', 1), ('QC_SIDECAR', 1)])
+def test_writeDF2csv_hashes_only_for_its_consumers(sandbox, monkeypatch, flag, hashes):
+    for name in ['CATALOG', 'L1_SIDECAR', 'QC_SIDECAR']:
+        monkeypatch.setattr(consts, name, name == flag)
+    calls = []
+    hashFile = LibDataTransfer.hashFile
+    monkeypatch.setattr(LibDataTransfer, 'hashFile', lambda pathFile: calls.append(pathFile) or hashFile(pathFile))
+    pathFile = consts.PATH_CLOUD.joinpath('Bahada', 'CR3000', 'L1', 'ts_data', '2026',
+                                          'Bahada_CR3000_ts_data_L1_20260301_0000.csv')
+    index = INDEXES['10Hz']
+    df = pd.DataFrame({'RECORD': np.arange(len(index)), 'Ux': np.linspace(-1, 1, len(index))}, index=index)
+    LibDataTransfer.writeDF2csv(pathFile, df, ['"TOA5"', '"TIMESTAMP","RECORD","Ux"'],
+                                indexMapFunc=LibDataTransfer.datetime_format_HF_index)
+    assert len(calls) == hashes
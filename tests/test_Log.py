@@ -0,0 +1,30 @@
+# -------------------------------------------------------------------------------
+# Name:        test_Log
+# Purpose:     Tests of the buffered writer of the logs
+#
+# Author:      Gesuri
+#
+# Created:     October 17, 2026
+# Copyright:   (c) Gesuri 2026
+# Licence:     Apache 2.0
+# -------------------------------------------------------------------------------
+
+import time
+
+import Log
+
+
+def test_lone_line_is_written_after_buffer_seconds(tmp_path, monkeypatch):
+    monkeypatch.setattr(Log, 'BUFFER_SECONDS', 0.2)
+    monkeypatch.setattr(Log, 'BUFFERED', True)
+    Log.setAsync(False)
+    Log.flush()
+    pathLog = tmp_path.joinpath('lone.log')
+    log = Log.Log(path=pathLog, sprint=False)
+    log.info('only line')  # nothing else is logged, e.g. a long stage follows
+    assert not pathLog.exists() or 'only line' not in pathLog.read_text()
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline and not (pathLog.exists() and 'only line' in pathLog.read_text()):
+        time.sleep(0.05)
+    assert 'only line' in pathLog.read_text()
+    assert Log._writer_.timer is None
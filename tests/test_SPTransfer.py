@@ -0,0 +1,135 @@
+# -------------------------------------------------------------------------------
+# Name:        test_SPTransfer
+# Purpose:     Tests of the resumable uploads of SPTransfer and of the uploads of ECS_Process_L0
+#
+# Author:      Gesuri
+#
+# Created:     October 17, 2026
+# Copyright:   (c) Gesuri 2026
+# Licence:     Apache 2.0
+# -------------------------------------------------------------------------------
+
+import json
+
+import pytest
+
+import LibDataTransfer
+import SPTransfer
+import consts
+
+
+class Response:
+    """ Response of an error of SessionClient """
+
+    def __init__(self, status, headers=None):
+        self.status = status
+        self.headers = headers or {}
+
+
+class SessionError(Exception):
+    """ Error of SessionClient, with its response """
+
+    def __init__(self, msg, response):
+        super().__init__(msg)
+        self.response = response
+
+
+class SessionClient:
+    """ Client with upload sessions kept in memory, the sessions not started by it are expired (404), or throttled
+     (429) if throttle """
+
+    def __init__(self, throttle=False):
+        self.throttle = throttle
+        self.sessions = {}
+        self.files = {}
+        self.calls = []
+
+    def _check_(self, uploadId, offset):
+        if uploadId not in self.sessions:
+            raise SessionError('expired', Response(429, {'Retry-After': '0'}) if self.throttle else Response(404))
+        assert len(self.sessions[uploadId]) == offset
+
+    def upload_large_file(self, local_file_path, target_file_url):
+        raise AssertionError('the uploads must use the sessions')
+
+    def start_upload(self, target, uploadId, data):
+        self.calls.append('start')
+        self.sessions[uploadId] = bytearray(data)
+        return len(data)
+
+    def continue_upload(self, target, uploadId, offset, data):
+        self.calls.append('continue')
+        self._check_(uploadId, offset)
+        self.sessions[uploadId] += data
+        return offset + len(data)
+
+    def finish_upload(self, target, uploadId, offset, data):
+        self.calls.append('finish')
+        if offset:
+            self._check_(uploadId, offset)
+        self.files[target] = bytes(self.sessions.pop(uploadId, b'')) + data
+        return True
+
+
+def _savedSession_(pathFile, target, offset):
+    """ Save a session of an upload of pathFile stopped at offset, unknown by the clients """
+    session = {'target': target, 'uploadId': 'expired', 'hash': LibDataTransfer.hashFile(pathFile),
+               'size': pathFile.stat().st_size, 'offset': offset}
+    SPTransfer._saveSession_(SPTransfer._sessionPath_(target), session)
+
+
+@pytest.fixture
+def pathFile(sandbox):
+    pathFile = consts.PATH_CLOUD.joinpath('file.dat')
+    pathFile.write_bytes(bytes(range(256)) * 10)
+    return pathFile
+
+
+def test_upload_by_chunks(pathFile):
+    client = SessionClient()
+    assert SPTransfer.uploadResumable(client, pathFile, 'Site/file.dat', chunkSize=1000)
+    assert client.files['Site/file.dat'] == pathFile.read_bytes()
+    assert client.calls == ['start', 'continue', 'finish']
+    assert not SPTransfer._sessionPath_('Site/file.dat').exists()
+
+
+def test_resume_from_saved_offset(pathFile):
+    client = SessionClient()
+    client.sessions['expired'] = bytearray(pathFile.read_bytes()[:1000])  # the session is still alive
+    _savedSession_(pathFile, 'Site/file.dat', 1000)
+    assert SPTransfer.uploadResumable(client, pathFile, 'Site/file.dat', chunkSize=1000)
+    assert client.files['Site/file.dat'] == pathFile.read_bytes()
+    assert client.calls == ['continue', 'finish']
+
+
+@pytest.mark.parametrize('offset', [1000, 2000])  # rejected on a middle chunk and on the final chunk
+def test_expired_session_starts_over(pathFile, offset):
+    client = SessionClient()
+    _savedSession_(pathFile, 'Site/file.dat', offset)
+    with pytest.raises(SessionError):
+        SPTransfer.uploadResumable(client, pathFile, 'Site/file.dat', chunkSize=1000)
+    assert not SPTransfer._sessionPath_('Site/file.dat').exists()
+    assert SPTransfer.uploadResumable(client, pathFile, 'Site/file.dat', chunkSize=1000)
+    assert client.files['Site/file.dat'] == pathFile.read_bytes()
+
+
+def test_throttled_session_is_kept(pathFile):
+    client = SessionClient(throttle=True)
+    _savedSession_(pathFile, 'Site/file.dat', 2000)
+    with pytest.raises(SessionError):
+        SPTransfer.uploadResumable(client, pathFile, 'Site/file.dat', chunkSize=1000)
+    with open(SPTransfer._sessionPath_('Site/file.dat')) as f:
+        assert json.load(f)['offset'] == 2000
+
+
+@pytest.mark.parametrize('catalog, hashes', [(False, 0), (True, 1)])
+def test_upload_hashes_only_for_the_catalog(sandbox, pathFile, monkeypatch, catalog, hashes):
+    monkeypatch.setattr(consts, 'CATALOG', catalog)
+    calls = []
+    hashFile = LibDataTransfer.hashFile
+    monkeypatch.setattr(LibDataTransfer, 'hashFile', lambda item: calls.append(item) or hashFile(item))
+    data = pathFile.read_bytes()
+    with sandbox.process() as ECS_Process_L0:
+        ECS_Process_L0.uploadAfile(sandbox.client(), pathFile, pathFile.relative_to(consts.PATH_CLOUD))
+    assert sandbox.pathSharePoint.joinpath('file.dat').read_bytes() == data  # the local copy is removed
+    assert len(calls) == hashes